@@ -0,0 +1,91 @@
+"""Запуск замеров и проверка регрессий: python -m benchmarks run|compare"""
+
+import argparse
+import sys
+
+from benchmarks import results
+from benchmarks.measure import run_benchmarks
+from drivers.resolver import SOURCES
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks against the local dist/ build")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Measure and store the results as JSON")
+    run.add_argument("--engine", choices=("browser", "dom"), default="browser", help="Real browser or the jsdom engine")
+    run.add_argument("--browser", default="chrome", help="Browser to measure (chrome or firefox)")
+    run.add_argument("--no-headless", dest="headless", action="store_false", help="Show the browser window")
+    run.add_argument("--driver-source", choices=SOURCES, default="manager", help="How to resolve the driver binary")
+    run.add_argument("--repeat", type=int, default=5, help="Samples per measurement")
+    run.add_argument(
+        "--workers", type=int, nargs="+", default=[1], help="Worker counts for the full-suite wall-clock, e.g. 1 4"
+    )
+    run.add_argument("--skip-suite", action="store_true", help="Do not time the full test suite")
+    run.add_argument("--output", default=None, help="Result file (default: benchmarks/results/<time>-<revision>.json)")
+
+    compare = commands.add_parser("compare", help="Fail when the current results regress against a baseline")
+    compare.add_argument("baseline", help="Baseline result file")
+    compare.add_argument("current", help="Current result file")
+    compare.add_argument(
+        "--metric", action="append", default=None, help="Metric to gate on; repeatable (default: all shared metrics)"
+    )
+    compare.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown as a fraction (0.1 = 10%%)")
+    compare.add_argument(
+        "--statistic", choices=("median", "mean", "min", "p95"), default="median", help="Statistic to compare"
+    )
+    return parser.parse_args(argv)
+
+
+def run(args):
+    try:
+        metrics = run_benchmarks(
+            engine=args.engine,
+            browser_name=args.browser,
+            headless=args.headless,
+            driver_source=args.driver_source,
+            repeat=args.repeat,
+            workers=args.workers,
+            suite=not args.skip_suite,
+        )
+    except RuntimeError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+    settings = {
+        "engine": args.engine,
+        "browser": args.browser,
+        "headless": args.headless,
+        "repeat": args.repeat,
+        "workers": args.workers,
+    }
+    path = results.save(results.build_document(metrics, settings), args.output)
+    for name, summary in metrics.items():
+        print(f"{summary['median']:9.4f}s  {name}")
+    print(f"results written to {path}")
+    return 0
+
+
+def compare(args):
+    try:
+        rows, regressions = results.compare(
+            results.load(args.baseline), results.load(args.current), args.metric, args.threshold, args.statistic
+        )
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+    for name, before, after, change in rows:
+        flag = "REGRESSION" if name in regressions else ""
+        print(f"{before:9.4f}s -> {after:9.4f}s  {change:+7.1%}  {name}  {flag}".rstrip())
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    return run(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Замеры запуска драйвера, открытия страницы, действий TransferPage и прогона набора"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from drivers.dom.driver import DomDriver
+from drivers.factory import create_driver
+from drivers.resolver import DriverResolver
+from page_objects.transfer_page import TransferPage
+from server.static import StaticServer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CARD_NUMBER = "1212 2323 5666 5555"
+
+# Коды выхода pytest, при которых время прогона набора ничего не измеряет
+INVALID_SUITE_EXIT_CODES = {
+    2: "interrupted",
+    3: "internal error",
+    4: "usage error",
+    5: "no tests collected",
+}
+
+# Сколько последних строк вывода pytest показывать, если прогон не состоялся
+OUTPUT_TAIL_LINES = 20
+
+
+def summarize(samples):
+    """Статистика по выборке времён в секундах"""
+    ordered = sorted(samples)
+    return {
+        "unit": "s",
+        "samples": len(ordered),
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "p95": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+    }
+
+
+def timed(action):
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+class DriverFactory:
+    """Создание драйвера выбранного движка; бинарник драйвера разрешается при первом запуске"""
+
+    def __init__(self, engine, browser_name, headless, driver_source="manager"):
+        self.engine = engine
+        self.browser_name = browser_name
+        self.headless = headless
+        self.driver_source = driver_source
+        self._driver_path = None
+
+    def __call__(self):
+        if self.engine == "dom":
+            return DomDriver(ROOT / "dist")
+        if self._driver_path is None:
+            self._driver_path = DriverResolver(source=self.driver_source).resolve(self.browser_name)
+        return create_driver(self.browser_name, self.headless, self._driver_path)
+
+
+def measure_startup(factory, repeat):
+    """Холодный запуск (с разрешением драйвера) и тёплые запуски"""
+    metrics = {}
+    started = time.perf_counter()
+    driver = factory()
+    metrics["driver_startup_cold"] = summarize([time.perf_counter() - started])
+    driver.quit()
+    warm = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        driver = factory()
+        warm.append(time.perf_counter() - started)
+        driver.quit()
+    metrics["driver_startup_warm"] = summarize(warm)
+    return metrics
+
+
+def page_actions(page):
+    """Действия и запросы TransferPage: имя -> (подготовка, замеряемое действие)"""
+    opened = lambda: page.open_page(balance=30000, reserved=20000)
+    with_card = lambda: page.open_prefilled(balance=30000, reserved=20000, card=CARD_NUMBER)
+    with_amount = lambda: page.open_prefilled(balance=30000, reserved=20000, card=CARD_NUMBER, amount=1000)
+    return {
+        "open_page": (None, opened),
+        "open_prefilled": (None, with_amount),
+        "click_rubles_block": (opened, page.click_rubles_block),
+        "enter_card_number": (
+            lambda: (opened(), page.click_rubles_block()),
+            lambda: page.enter_card_number(CARD_NUMBER, keystrokes=True),
+        ),
+        "enter_transfer_amount": (with_card, lambda: page.enter_transfer_amount(1000, keystrokes=True)),
+        "enter_card_number_fast": (
+            lambda: (opened(), page.click_rubles_block()),
+            lambda: page.enter_card_number(CARD_NUMBER, keystrokes=False),
+        ),
+        "enter_transfer_amount_fast": (with_card, lambda: page.enter_transfer_amount(1000, keystrokes=False)),
+        "is_card_number_field_visible": (opened, page.is_card_number_field_visible),
+        "is_transfer_amount_field_visible": (with_card, page.is_transfer_amount_field_visible),
+        "is_transfer_button_visible": (with_amount, page.is_transfer_button_visible),
+        "is_transfer_button_enabled": (with_amount, page.is_transfer_button_enabled),
+        "is_insufficient_funds_message_visible": (with_amount, page.is_insufficient_funds_message_visible),
+        "get_commission_text": (with_amount, page.get_commission_text),
+        "get_balance_text": (opened, page.get_balance_text),
+        "get_card_number_field_value": (with_card, page.get_card_number_field_value),
+        "snapshot": (with_amount, page.snapshot),
+        "evaluate_transfers_100": (with_card, lambda: page.evaluate_transfers([(CARD_NUMBER, amount) for amount in range(100)])),
+    }
+
+
+def measure_page(factory, base_url, repeat):
+    """Задержка каждого действия страницы; подготовка в замер не входит"""
+    driver = factory()
+    try:
+        page = TransferPage(driver, base_url)
+        metrics = {}
+        for name, (prepare, action) in page_actions(page).items():
+            samples = []
+            for _ in range(repeat):
+                if prepare is not None:
+                    prepare()
+                samples.append(timed(action))
+            metrics[f"page.{name}"] = summarize(samples)
+        return metrics
+    finally:
+        driver.quit()
+
+
+def measure_suite(args, workers):
+    """Время полного прогона tests/ для каждого числа воркеров.
+
+    Упавшие тесты замер не портят; прогон, который прервался или ничего
+    не собрал, - не замер: RuntimeError с концом вывода pytest.
+    """
+    metrics = {}
+    for count in workers:
+        command = [sys.executable, "-m", "pytest", "tests/", "-q", "-p", "no:cacheprovider", "--maxfail=0", *args]
+        if count > 1:
+            command.append(f"--parallel={count}")
+        started = time.perf_counter()
+        result = subprocess.run(
+            command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=os.environ.copy()
+        )
+        elapsed = time.perf_counter() - started
+        if result.returncode in INVALID_SUITE_EXIT_CODES:
+            tail = "\n".join(result.stdout.strip().splitlines()[-OUTPUT_TAIL_LINES:])
+            raise RuntimeError(
+                f"Suite run with {count} worker(s) exited with code {result.returncode} "
+                f"({INVALID_SUITE_EXIT_CODES[result.returncode]}), its wall clock is not a measurement:\n{tail}"
+            )
+        metrics[f"suite_wall_clock_{count}w"] = {**summarize([elapsed]), "exit_code": result.returncode}
+    return metrics
+
+
+def run_benchmarks(engine="browser", browser_name="chrome", headless=True, driver_source="manager",
+                   repeat=5, workers=(1,), suite=True):
+    """Все замеры на локальной сборке dist/"""
+    factory = DriverFactory(engine, browser_name, headless, driver_source)
+    metrics = measure_startup(factory, repeat)
+    if engine == "dom":
+        metrics.update(measure_page(factory, TransferPage.DEFAULT_BASE_URL, repeat))
+    else:
+        with StaticServer(ROOT / "dist") as server:
+            metrics.update(measure_page(factory, server.url, repeat))
+    if suite:
+        suite_args = [f"--engine={engine}", f"--browser={browser_name}", f"--driver-source={driver_source}"]
+        if headless:
+            suite_args.append("--headless")
+        metrics.update(measure_suite(suite_args, workers))
+    return metrics
@@ -0,0 +1,89 @@
+"""Хранение результатов замеров в версионированном JSON и их сравнение"""
+
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.measure import INVALID_SUITE_EXIT_CODES, ROOT
+
+# Версия формата файла; меняется при несовместимых изменениях структуры
+SCHEMA_VERSION = 1
+
+DEFAULT_RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_document(metrics, settings):
+    """Документ с замерами, настройками прогона и окружением"""
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "settings": settings,
+        "metrics": metrics,
+    }
+
+
+def default_path(document):
+    stamp = datetime.fromisoformat(document["created_at"]).strftime("%Y%m%dT%H%M%SZ")
+    return DEFAULT_RESULTS_DIR / f"{stamp}-{document['revision']}.json"
+
+
+def save(document, path=None):
+    path = Path(path) if path else default_path(document)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def load(path):
+    document = json.loads(Path(path).read_text(encoding="utf-8"))
+    version = document.get("schema_version")
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported schema version {version}, expected {SCHEMA_VERSION}")
+    return document
+
+
+def compare(baseline, current, metrics=None, threshold=0.1, statistic="median"):
+    """Сравнение двух прогонов.
+
+    Возвращает список (метрика, было, стало, изменение) и список регрессий -
+    метрик, выросших больше чем на threshold (доля). Без metrics сравниваются
+    все общие метрики; метрика прогона набора, который не состоялся
+    (exit_code из INVALID_SUITE_EXIT_CODES), даёт ValueError.
+    """
+    names = metrics or sorted(set(baseline["metrics"]) & set(current["metrics"]))
+    rows = []
+    regressions = []
+    for name in names:
+        if name not in baseline["metrics"] or name not in current["metrics"]:
+            raise ValueError(f"Metric {name} is missing from one of the results")
+        for document in (baseline, current):
+            # Прогон набора, который не состоялся, сравнивать не с чем
+            exit_code = document["metrics"][name].get("exit_code")
+            if exit_code in INVALID_SUITE_EXIT_CODES:
+                raise ValueError(
+                    f"Metric {name} of revision {document.get('revision')} comes from a suite run "
+                    f"that exited with code {exit_code} ({INVALID_SUITE_EXIT_CODES[exit_code]})"
+                )
+        before = baseline["metrics"][name][statistic]
+        after = current["metrics"][name][statistic]
+        change = (after - before) / before if before else 0.0
+        rows.append((name, before, after, change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
@@ -0,0 +1,301 @@
+"""Компиляция тест-кейсов из документов в типизированные сценарии.
+
+Текст шагов и ожидаемых результатов сопоставляется со словарём фраз.
+Кейс с фразой вне словаря не угадывается, а помечается неподдерживаемым
+с этой фразой в причине; известные опечатки документов исправляются
+по явному списку ERRATA. Скомпилированный индекс кешируется в JSON
+и пересобирается, когда меняется хеш документов или версия компилятора.
+"""
+
+import hashlib
+import itertools
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from catalog.parser import parse_document
+from oracle.transfer_rules import commission, expected_state
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SOURCES = (ROOT / "test_cases.md", ROOT / "SECOND.md")
+
+# Меняется вместе со словарём: индекс, собранный старым компилятором, пересобирается
+COMPILER_VERSION = 2
+
+CURRENCIES = {"Рубли": "rub", "Доллары": "usd", "Евро": "euro"}
+
+# Описания неверных номеров карты - те же значения, что в test_card_data_incorrect
+CARD_VARIANTS = {
+    "ввод < 16 цифр": "123",
+    "ввод > 16 цифр": "12345678901234567",
+    "ввод от 1 до 15 цифр": "123456789012345",
+    "ввод букв": "abcd efgh ijkl mnop",
+    "ввод спец символов": "!@#$ %^&* ()_+ ={}|",
+}
+
+# Описания сумм перевода: при доступных 10000 (30000 - 20000) первая не проходит
+# только вместе с комиссией, вторая - сама по себе, третья укладывается в остаток;
+# буквы и спецсимволы - те же, что в test_transfer_amount_validation
+AMOUNT_VARIANTS = {
+    "ввод < 10 цифр": "9500",
+    "ввод > 10 цифр": "12345678901",
+    "ввод от 1 до 9 цифр": "1",
+    "ввод букв": "abc",
+    "ввод спец символов": "!@#",
+    "ввод отрицательного числа": "-100",
+}
+
+# Опечатки документов: (документ, заголовок кейса, номер шага) -> действие шага на самом деле.
+# В test_cases.md сумма перевода вводится шагом 'Заполнить поле "Номер карты"',
+# в SECOND.md у перевода в евро пропущено название блока
+ERRATA = {
+    ("test_cases.md", 'Валидация поля "Сумма перевода"', 4): 'Заполнить поле "Сумма перевода"',
+    ("test_cases.md", "Рублевый перевод. Достаточно средств на счету", 4): 'Заполнить поле "Сумма перевода"',
+    ("test_cases.md", "Рублевый перевод. НЕ достаточно средств на счету", 4): 'Заполнить поле "Сумма перевода"',
+    ("test_cases.md", "Рублевый перевод. Отрицательная сумма перевода", 4): 'Заполнить поле "Сумма перевода"',
+    ("test_cases.md", "Рублевый перевод. Нулевая сумма перевода", 4): 'Заполнить поле "Сумма перевода"',
+    ("SECOND.md", "Не должен работать перевод в евро", 5): 'Нажать на блок "Евро"',
+}
+
+_URL = re.compile(r"balance=(-?\d+)&reserved=(-?\d+)")
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    """Действие шага и проверки его ожидаемого результата.
+
+    action и проверки - кортежи (вид, аргументы...); текст шага
+    в сравнении не участвует, поэтому одинаковые шаги разных кейсов совпадают.
+    """
+
+    action: tuple | None
+    checks: tuple
+    text: str = field(default="", compare=False)
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    """Один вариант тест-кейса"""
+
+    id: str
+    title: str
+    source: str
+    steps: tuple
+    unsupported: str | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        steps = tuple(
+            Step(_tuple(step["action"]), tuple(map(tuple, step["checks"])), step["text"]) for step in data["steps"]
+        )
+        return cls(data["id"], data["title"], data["source"], steps, data["unsupported"])
+
+
+class Unsupported(Exception):
+    """Фраза документа вне словаря компилятора"""
+
+
+class _State:
+    # Состояние формы по ходу компиляции: нужно правилам, зависящим от предыдущих шагов
+    def __init__(self):
+        self.balance = None
+        self.reserved = None
+        self.card = None
+        self.amount = None
+        self.filled = None
+
+
+def _open(state, value):
+    match = _URL.search(value or "")
+    if match is None:
+        raise Unsupported(f"no balance/reserved in test data: {value!r}")
+    state.balance, state.reserved = int(match.group(1)), int(match.group(2))
+    state.card = state.amount = None
+    return ("open", state.balance, state.reserved)
+
+
+def _select(state, value, label):
+    if label not in CURRENCIES:
+        raise Unsupported(f"unknown account block: {label!r}")
+    return ("select", CURRENCIES[label])
+
+
+def _card(state, value):
+    value = CARD_VARIANTS.get(value, value)
+    if value is None:
+        raise Unsupported("card number step without test data")
+    state.card, state.amount, state.filled = value, None, "card"
+    return ("card", value)
+
+
+def _amount(state, value):
+    if value in AMOUNT_VARIANTS:
+        value = AMOUNT_VARIANTS[value]
+    elif value is None or not re.fullmatch(r"-?\d+", value):
+        raise Unsupported(f"unknown transfer amount: {value!r}")
+    state.amount, state.filled = value, "amount"
+    return ("amount", value)
+
+
+def _filled(state):
+    # Значение поля после маски приложения
+    if state.filled == "card":
+        digits = re.sub(r"\D", "", state.card)[:17]
+        return ("card_value", " ".join(digits[i:i + 4] for i in range(0, len(digits), 4)))
+    if state.filled == "amount":
+        return ("amount_value", state.amount)
+    raise Unsupported("field value check before any input")
+
+
+# Действия: шаблон начала текста шага -> построение действия
+ACTIONS = (
+    (r"Перейти на начальную страницу|Изменить URL", lambda state, value, match: _open(state, value)),
+    (r'Нажать "Enter"|Убедиться', lambda state, value, match: None),
+    (r'Нажать на блок "([^"]*)"', lambda state, value, match: _select(state, value, match.group(1))),
+    (r'(?:Заполнить|Изменить) поле "Номер карты"', lambda state, value, match: _card(state, value)),
+    (r'Заполнить поле "Сумма перевода"', lambda state, value, match: _amount(state, value)),
+    (r'Нажать кнопку "Перевести"', lambda state, value, match: ("transfer",)),
+)
+
+def _transfer_rules(state):
+    # Правила суммы из документа, применённые к введённой сумме эталонной моделью
+    expected = expected_state(state.balance, state.reserved, state.card, state.amount)
+    if expected.transfer_allowed:
+        return [("commission", expected.commission), ("button_enabled",)]
+    if expected.insufficient_funds:
+        return [("insufficient_funds",), ("button_unavailable",)]
+    return [("button_unavailable",)]
+
+
+# Ожидаемые результаты: фраза -> проверка или список проверок (None - проверять нечего).
+# Фразы разбираются по порядку, и разобранный текст следующим фразам не достаётся
+EXPECTATIONS = (
+    (r'Отображается ошибка "Недостаточно средств" при сумме > чем на счету[;,.\s]*'
+     r'Отображается ошибка "Недостаточно средств" при сумме \("Сумма перевода \+ комиссия"\) > чем на счету[;,.\s]*'
+     r"Ввести можно только положительные числа",
+     lambda state, match: _transfer_rules(state)),
+    (r"Открыта начальная страница перевода|URL заполнен в соответствии с тестовыми данными|Страница обновлена",
+     lambda state, match: None),
+    (r'Отображается блок "Перевод на карту"', lambda state, match: ("card_field_visible",)),
+    (r'Фокус установлен на поле "Номер карты"', lambda state, match: ("card_field_focused",)),
+    (r'Отображается блок "Сумма перевода"', lambda state, match: ("amount_field_visible",)),
+    (r'Блок "Сумма перевода" НЕ отображается|Поле "Сумма перевода" отсутствует',
+     lambda state, match: ("amount_field_absent",)),
+    (r'Поле "Номер карты" не заполнено', lambda state, match: ("card_value", "")),
+    (r'Поле "(?:Номер карты|Сумма перевода)" заполнено в соответствии с тестовыми данными',
+     lambda state, match: _filled(state)),
+    (r'В поле ввода (?:отображается сумма[^"\d]*)?"?(\d+)"?', lambda state, match: ("amount_value", match.group(1))),
+    (r"Комиссия равна 10% от введенной суммы", lambda state, match: ("commission", commission(int(state.amount)))),
+    (r"Комиссия = (\d+)", lambda state, match: ("commission", int(match.group(1)))),
+    (r'Кнопка "Перевести" доступна и кликабельна|Должна быть доступна кнопка "Перевести"'
+     r'|активна кнопка "Перевести"|отображается кнопка "Перевести"',
+     lambda state, match: ("button_enabled",)),
+    (r'Кнопка "Перевести" НЕ доступна', lambda state, match: ("button_unavailable",)),
+    (r'Кнопка "Перевести" отсутствует', lambda state, match: ("button_absent",)),
+    (r'Нотификация "Недостаточно средств" отображается|отображается ошибка "Недостаточно средств[^"]*"',
+     lambda state, match: ("insufficient_funds",)),
+    (r'(?:Открыто|Отображается) окно "Подтвердите действи[ея]"', lambda state, match: ("prompt_shown",)),
+    (r"Появилось поле об ошибке, что .*", lambda state, match: ("error_shown",)),
+    (r'Блок "Рубли" отображаются в соответствии с тестовыми данными',
+     lambda state, match: ("balance_shown", state.balance, state.reserved)),
+)
+
+_ACTIONS = tuple((re.compile(pattern), build) for pattern, build in ACTIONS)
+_EXPECTATIONS = tuple((re.compile(pattern, re.I), build) for pattern, build in EXPECTATIONS)
+
+
+def compile_scenario(scenario, number):
+    """Кейсы сценария: по одному на каждое сочетание вариантов тестовых данных"""
+    variants = list(itertools.product(*(step.data or (None,) for step in scenario.steps)))
+    base_id = f"{Path(scenario.source).stem}-{number:02d}"
+    cases = []
+    for index, values in enumerate(variants, start=1):
+        case_id = base_id if len(variants) == 1 else f"{base_id}-{index}"
+        try:
+            steps = _compile_steps(scenario, values)
+            unsupported = None
+        except Unsupported as exc:
+            steps, unsupported = (), str(exc)
+        cases.append(Case(case_id, scenario.title, scenario.source, steps, unsupported))
+    return cases
+
+
+def _compile_steps(scenario, values):
+    state = _State()
+    steps = []
+    for number, (raw, value) in enumerate(zip(scenario.steps, values), start=1):
+        action_text = ERRATA.get((Path(scenario.source).name, scenario.title, number), raw.action)
+        for pattern, build in _ACTIONS:
+            match = pattern.match(action_text)
+            if match:
+                action = build(state, value, match)
+                break
+        else:
+            raise Unsupported(f"unknown step: {raw.action!r}")
+        steps.append(Step(action, _checks(raw.expected, state), raw.action if value is None else f"{raw.action}: {value}"))
+    return tuple(steps)
+
+
+def _checks(text, state):
+    checks = []
+    leftover = text
+    for pattern, build in _EXPECTATIONS:
+        for match in list(pattern.finditer(leftover)):
+            check = build(state, match)
+            if isinstance(check, list):
+                checks.extend(check)
+            elif check is not None:
+                checks.append(check)
+            leftover = leftover.replace(match.group(0), "", 1)
+    # Всё, что не разобрано словарём, должно быть только разделителями
+    if re.sub(r"[\s.,;]+", "", leftover):
+        raise Unsupported(f"unknown expected result: {leftover.strip(' .,;')!r}")
+    return tuple(checks)
+
+
+def compile_documents(sources=DEFAULT_SOURCES):
+    """Все кейсы документов в порядке следования"""
+    cases = []
+    for source in sources:
+        for number, scenario in enumerate(parse_document(source), start=1):
+            cases.extend(compile_scenario(scenario, number))
+    return cases
+
+
+def sources_digest(sources=DEFAULT_SOURCES):
+    digest = hashlib.sha256(str(COMPILER_VERSION).encode())
+    for source in sources:
+        digest.update(Path(source).name.encode())
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+def load_catalog(sources=DEFAULT_SOURCES, cache_dir=None):
+    """Индекс кейсов из кеша или свежескомпилированный.
+
+    cache_dir - каталог для index.json (обычно в .pytest_cache);
+    без него документы компилируются каждый раз.
+    """
+    digest = sources_digest(sources)
+    index_path = Path(cache_dir) / "index.json" if cache_dir is not None else None
+    if index_path is not None and index_path.is_file():
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if index.get("digest") == digest:
+                return [Case.from_dict(case) for case in index["cases"]]
+        except (ValueError, KeyError):
+            pass
+    cases = compile_documents(sources)
+    if index_path is not None:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_text(
+            json.dumps({"digest": digest, "cases": [asdict(case) for case in cases]}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+    return cases
+
+
+def _tuple(value):
+    return None if value is None else tuple(value)
@@ -0,0 +1,94 @@
+"""Разбор таблиц тест-кейсов из Markdown: HTML-таблицы (test_cases.md) и таблицы с | (SECOND.md)"""
+
+import html
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+_HEADING = re.compile(r"^#+\s*(.+?)\s*$")
+_ROW = re.compile(r"<tr>(.*?)</tr>", re.S)
+_CELL = re.compile(r"<t([dh])>(.*?)</t[dh]>", re.S)
+_ITEM = re.compile(r"<li>(.*?)</li>", re.S)
+_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
+
+# Ячейка без тестовых данных
+EMPTY_DATA = ("", "-")
+
+
+@dataclass(frozen=True, slots=True)
+class RawStep:
+    """Строка таблицы: действие, варианты тестовых данных и ожидаемый результат"""
+
+    action: str
+    data: tuple
+    expected: str
+
+
+@dataclass(frozen=True, slots=True)
+class RawScenario:
+    """Таблица под заголовком тест-кейса"""
+
+    title: str
+    source: str
+    steps: tuple
+
+
+def parse_document(path):
+    """Тест-кейсы документа в порядке следования"""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    scenarios = []
+    title = None
+    lines = text.splitlines()
+    index = 0
+    while index < len(lines):
+        line = lines[index].strip()
+        heading = _HEADING.match(line)
+        if heading:
+            title = heading.group(1)
+        elif line.startswith("<table>"):
+            end = index
+            while "</table>" not in lines[end]:
+                end += 1
+            steps = _html_steps("\n".join(lines[index:end + 1]))
+            scenarios.append(RawScenario(title, path.name, steps))
+            index = end
+        elif line.startswith("|"):
+            end = index
+            while end + 1 < len(lines) and lines[end + 1].strip().startswith("|"):
+                end += 1
+            # Первая строка - заголовок, вторая - выравнивание столбцов
+            steps = tuple(_pipe_step(row) for row in lines[index + 2:end + 1])
+            scenarios.append(RawScenario(title, path.name, steps))
+            index = end
+        index += 1
+    return scenarios
+
+
+def _html_steps(table):
+    steps = []
+    for row in _ROW.findall(table):
+        cells = _CELL.findall(row)
+        if not cells or cells[0][0] == "h":
+            continue
+        action, data, expected = (content for _, content in cells[:3])
+        steps.append(RawStep(_text(action), _variants(data), _text(expected)))
+    return tuple(steps)
+
+
+def _pipe_step(row):
+    action, data, expected = (cell.strip() for cell in row.strip().strip("|").split("|")[:3])
+    return RawStep(action, _variants(data), expected)
+
+
+def _variants(cell):
+    # Список <ul> - несколько вариантов данных для одного шага
+    items = _ITEM.findall(cell)
+    values = [_text(item) for item in items] if items else [_text(cell)]
+    return tuple(value for value in values if value not in EMPTY_DATA)
+
+
+def _text(cell):
+    # Элемент списка в ячейке ожидаемого результата - отдельное утверждение
+    cell = _ITEM.sub(lambda item: item.group(1) + "; ", cell)
+    return " ".join(html.unescape(_TAG.sub("", cell)).split()).rstrip("; ")
@@ -0,0 +1,132 @@
+"""Выполнение кейсов каталога с общими префиксами шагов.
+
+Пройденные шаги кейсов складываются в префиксное дерево. Следующий кейс
+с тем же началом не повторяет его клики, ввод и проверки: форма сразу
+приводится к состоянию конца общего префикса через open_prefilled,
+и выполняется только расходящийся хвост.
+"""
+
+ACCOUNT_BLOCKS = {
+    "rub": "click_rubles_block",
+    "usd": "click_dollars_block",
+    "euro": "click_euros_block",
+}
+
+# Сколько ждать окна подтверждения после нажатия "Перевести"
+PROMPT_TIMEOUT = 5
+
+
+class StepTrie:
+    """Префиксное дерево шагов, уже успешно выполненных в этой сессии"""
+
+    def __init__(self):
+        self._root = {}
+
+    def verified_depth(self, steps):
+        """Длина самого длинного пройденного префикса, к концу которого можно вернуться"""
+        node = self._root
+        depth = 0
+        restorable = 0
+        for step in steps:
+            node = node.get(step)
+            if node is None:
+                break
+            depth += 1
+            if form_state(steps[:depth]) is not None:
+                restorable = depth
+        return restorable
+
+    def mark(self, steps):
+        """Учёт пройденного префикса"""
+        node = self._root
+        for step in steps:
+            node = node.setdefault(step, {})
+
+
+def form_state(steps):
+    """Состояние формы после шагов в виде аргументов open_prefilled.
+
+    None - состояние нельзя воспроизвести одной навигацией (например,
+    счёт сменили после ввода карты): такой префикс выполняется заново.
+    """
+    state = None
+    for step in steps:
+        if step.action is None:
+            continue
+        kind, *args = step.action
+        if kind == "open":
+            state = {"balance": args[0], "reserved": args[1], "currency": None, "card": None, "amount": None}
+        elif state is None:
+            return None
+        elif kind == "select":
+            if state["card"] is not None:
+                return None
+            state["currency"] = args[0]
+        elif kind == "card":
+            state["card"], state["amount"] = args[0], None
+        elif kind == "amount":
+            state["amount"] = args[0]
+    return state
+
+
+def restore(page, state):
+    """Форма в состоянии state за одну навигацию"""
+    if state["currency"] is None:
+        return page.open_page(balance=state["balance"], reserved=state["reserved"])
+    return page.open_prefilled(**state)
+
+
+def run_case(page, case, trie):
+    """Выполнение кейса с конца самого длинного уже пройденного префикса"""
+    steps = case.steps
+    depth = trie.verified_depth(steps)
+    if depth:
+        restore(page, form_state(steps[:depth]))
+    for index in range(depth, len(steps)):
+        step = steps[index]
+        context = {}
+        if step.action is not None:
+            _ACTIONS[step.action[0]](page, context, *step.action[1:])
+        for check in step.checks:
+            kind, *args = check
+            assert _CHECKS[kind](page, context, *args), f"step {index + 1} ({step.text}): {kind} {args} failed"
+        trie.mark(steps[:index + 1])
+
+
+def _transfer(page, context):
+    page.click_transfer_button()
+    # Окно закрывается сразу, чтобы не мешать следующим командам
+    context["prompt"] = page.handle_alert(timeout=PROMPT_TIMEOUT)
+
+
+_ACTIONS = {
+    "open": lambda page, context, balance, reserved: page.open_page(balance=balance, reserved=reserved),
+    "select": lambda page, context, currency: getattr(page, ACCOUNT_BLOCKS[currency])(),
+    "card": lambda page, context, value: page.enter_card_number(value),
+    "amount": lambda page, context, value: page.enter_transfer_amount(value),
+    "transfer": _transfer,
+}
+
+_CHECKS = {
+    "card_field_visible": lambda page, context: page.is_card_number_field_visible(),
+    "card_field_focused": lambda page, context: page.is_card_number_field_focused(),
+    "amount_field_visible": lambda page, context: page.is_transfer_amount_field_visible(),
+    "amount_field_absent": lambda page, context: not page.is_transfer_amount_field_visible(),
+    "card_value": lambda page, context, value: page.get_card_number_field_value() == value,
+    "amount_value": lambda page, context, value: page.get_transfer_amount_field_value() == value,
+    "commission": lambda page, context, value: page.get_commission_text().strip() == str(value),
+    "button_enabled": lambda page, context: page.is_transfer_button_enabled(),
+    "button_unavailable": lambda page, context: not page.is_transfer_button_enabled(),
+    "button_absent": lambda page, context: not page.is_transfer_button_visible(),
+    "insufficient_funds": lambda page, context: page.is_insufficient_funds_message_visible(),
+    "prompt_shown": lambda page, context: bool(context.get("prompt")),
+    "error_shown": lambda page, context: page.get_error_message() != "",
+    "balance_shown": lambda page, context, balance, reserved: (
+        page.get_balance_text() == _grouped(balance) and page.get_reserved_text() == _grouped(reserved)
+    ),
+}
+
+
+def _grouped(number):
+    # Разделитель разрядов в приложении - апостроф: 30'000
+    return f"{number:,}".replace(",", "'")
@@ -0,0 +1,281 @@
+"""Асинхронный клиент W3C WebDriver: много сессий браузера в одном event loop.
+
+Selenium отправляет команды блокирующими HTTP-запросами, поэтому каждому
+браузеру нужен свой поток. Здесь команды всех сессий идут из одного
+event loop через общий пул keep-alive соединений с драйвером, и пока одна
+сессия ждёт ответа браузера, остальные продолжают работу.
+"""
+
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from drivers.bidi_client import BidiConnection, ContextDriver
+from drivers.errors import ELEMENT_KEY, ERRORS
+from drivers.factory import browser_options
+
+# Соединений с одним драйвером; больше одновременных команд ждут свободного
+DEFAULT_CONNECTIONS = 16
+
+# Команды, которые можно отправить повторно, если драйвер не ответил ни байтом
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+class HttpPool:
+    """Keep-alive соединения HTTP/1.1 с сервером драйвера"""
+
+    def __init__(self, url, size=DEFAULT_CONNECTIONS):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def request(self, method, path, payload=None):
+        """Статус и JSON ответа"""
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await asyncio.open_connection(self.host, self.port)
+                try:
+                    try:
+                        writer.write(head + body)
+                        await writer.drain()
+                    except ConnectionError:
+                        # Простаивавшее соединение драйвер мог закрыть: запрос до него не дошёл
+                        if reused:
+                            writer.close()
+                            continue
+                        raise
+                    try:
+                        status_line = await reader.readline()
+                    except ConnectionError:
+                        status_line = b""
+                    if not status_line:
+                        # Ни байта ответа: повтор безопасен только для команды без побочных эффектов,
+                        # иначе клик или ввод могли уже выполниться
+                        if reused and method in IDEMPOTENT_METHODS:
+                            writer.close()
+                            continue
+                        raise ConnectionResetError(f"Driver closed the connection during {method} {path}")
+                    status, keep_alive, data = await _read_response(reader, status_line)
+                    break
+                except BaseException:
+                    writer.close()
+                    raise
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+        return status, json.loads(data) if data else {}
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for _, writer in idle), return_exceptions=True)
+
+
+async def _read_response(reader, status_line):
+    # Статус, можно ли переиспользовать соединение, тело
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    keep_alive = headers.get("connection", "").lower() != "close"
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while await reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        return status, keep_alive, bytes(body)
+    if "content-length" in headers:
+        return status, keep_alive, await reader.readexactly(int(headers["content-length"]))
+    # Без длины тело заканчивается вместе с соединением
+    return status, False, await reader.read()
+
+
+class AsyncElement:
+    """Ссылка на элемент страницы в асинхронной сессии"""
+
+    def __init__(self, driver, element_id):
+        self._driver = driver
+        self.id = element_id
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncElement) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    async def text(self):
+        return await self._driver.execute("GET", f"/element/{self.id}/text")
+
+    async def get_attribute(self, name):
+        return await self._driver.execute("GET", f"/element/{self.id}/attribute/{name}")
+
+    async def is_enabled(self):
+        return await self._driver.execute("GET", f"/element/{self.id}/enabled")
+
+    async def click(self):
+        await self._driver.execute("POST", f"/element/{self.id}/click", {})
+
+
+class AsyncWebDriver:
+    """Сессия W3C WebDriver с подмножеством API Selenium, которым пользуется AsyncTransferPage"""
+
+    def __init__(self, pool, session_id, capabilities):
+        self._pool = pool
+        self.session_id = session_id
+        self.capabilities = capabilities
+
+    @classmethod
+    async def start(cls, pool, capabilities):
+        """Новая сессия на сервере драйвера"""
+        value = await _command(pool, "POST", "/session", {"capabilities": {"alwaysMatch": capabilities}})
+        return cls(pool, value["sessionId"], value.get("capabilities", {}))
+
+    async def execute(self, method, command, payload=None):
+        """Команда сессии; ошибка протокола поднимается исключением Selenium"""
+        return self._unwrap(await _command(self._pool, method, f"/session/{self.session_id}{command}", payload))
+
+    def _wrap(self, value):
+        if isinstance(value, AsyncElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def current_url(self):
+        return await self.execute("GET", "/url")
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": self._wrap(list(args))})
+
+    async def execute_async_script(self, script, *args):
+        return await self.execute("POST", "/execute/async", {"script": script, "args": self._wrap(list(args))})
+
+    async def quit(self):
+        await self.execute("DELETE", "")
+
+
+async def _command(pool, method, path, payload=None):
+    status, response = await pool.request(method, path, payload)
+    value = response.get("value") if isinstance(response, dict) else None
+    if status >= 400:
+        error = value if isinstance(value, dict) else {}
+        exception = ERRORS.get(error.get("error"), WebDriverException)
+        raise exception(error.get("message", f"HTTP {status} from the driver"))
+    return value
+
+
+class AsyncBrowser:
+    """Сессии одного браузера для одного event loop.
+
+    chromedriver ведёт сколько угодно сессий одним процессом, и все они
+    делят пул соединений с ним. geckodriver держит одну сессию на процесс,
+    поэтому для Firefox на каждую сессию запускается свой. Контексты
+    (new_context) живут в одной сессии BiDi и одном процессе браузера.
+    """
+
+    def __init__(self, browser_name, headless, driver_path=None, connections=DEFAULT_CONNECTIONS):
+        if browser_name.lower() not in ("chrome", "firefox"):
+            raise ValueError(f"Unsupported browser: {browser_name}")
+        self.browser_name = browser_name.lower()
+        self.headless = headless
+        self.driver_path = driver_path
+        self.connections = connections
+        self._services = []
+        self._pools = []
+        self._drivers = []
+        self._bidi = None
+        self._starting = asyncio.Lock()
+        self._connecting = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def new_session(self, bidi=False):
+        """Новая сессия браузера"""
+        options = browser_options(self.browser_name, self.headless, bidi=bidi)
+        async with self._starting:
+            if self.browser_name == "firefox" or not self._pools:
+                service = _service(self.browser_name, self.driver_path)
+                if self.driver_path is None:
+                    from selenium.webdriver.common.driver_finder import DriverFinder
+                    service.path = DriverFinder(service, options).get_driver_path()
+                # Запуск процесса и ожидание его порта блокируют: они уходят в поток
+                await asyncio.to_thread(service.start)
+                self._services.append(service)
+                self._pools.append(HttpPool(service.service_url, self.connections))
+            pool = self._pools[-1]
+        driver = await AsyncWebDriver.start(pool, options.to_capabilities())
+        self._drivers.append(driver)
+        return driver
+
+    async def new_context(self):
+        """Новая вкладка в собственном пользовательском контексте общего браузера"""
+        async with self._connecting:
+            if self._bidi is None:
+                session = await self.new_session(bidi=True)
+                self._bidi = await BidiConnection.connect(session.capabilities["webSocketUrl"])
+        return await ContextDriver.open(self._bidi)
+
+    async def close(self):
+        """Закрытие всех сессий и остановка драйверов"""
+        if self._bidi is not None:
+            await self._bidi.close()
+            self._bidi = None
+        drivers, self._drivers = self._drivers, []
+        await asyncio.gather(*(driver.quit() for driver in drivers), return_exceptions=True)
+        pools, self._pools = self._pools, []
+        await asyncio.gather(*(pool.close() for pool in pools))
+        services, self._services = self._services, []
+        for service in services:
+            await asyncio.to_thread(service.stop)
+
+
+def _service(browser_name, driver_path):
+    # Модули браузеров Selenium загружаются только при запуске драйвера (см. drivers.factory)
+    if browser_name == "chrome":
+        from selenium.webdriver.chrome.service import Service
+    else:
+        from selenium.webdriver.firefox.service import Service
+    return Service(driver_path)
@@ -0,0 +1,318 @@
+"""Асинхронный клиент WebDriver BiDi: изолированные контексты внутри одного браузера.
+
+Команды BiDi адресуются конкретному контексту, а не "текущему окну"
+сессии, поэтому одно websocket-соединение ведёт сколько угодно вкладок
+одновременно. Каждая вкладка открывается в своём пользовательском
+контексте (browser.createUserContext): cookies, storage и кеш у неё
+свои, как у окна инкогнито в Chrome или контейнера в Firefox.
+
+Транспорт BiDi из Selenium (remote.websocket_connection) блокирующий и
+читает сообщения в своём потоке; здесь соединение живёт в том же event
+loop, что и сессии drivers.async_client, и не требует потоков.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+
+from drivers.errors import ERRORS
+
+# Сколько ждать ответа на команду BiDi: у скриптов страницы свои таймауты в секунды,
+# так что дольше отвечает только зависший браузер
+COMMAND_TIMEOUT = 60
+
+# Константа рукопожатия из RFC 6455
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+_TEXT, _CLOSE, _PING, _PONG = 0x1, 0x8, 0x9, 0xA
+
+
+class WebSocket:
+    """Клиент WebSocket (RFC 6455) поверх потоков asyncio, только текстовые сообщения"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, url):
+        parts = urlsplit(url)
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write((
+            f"GET {parts.path or '/'} HTTP/1.1\r\n"
+            f"Host: {parts.hostname}:{parts.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "\r\n"
+        ).encode("latin-1"))
+        await writer.drain()
+        status_line = await reader.readline()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        if b" 101 " not in status_line or headers.get("sec-websocket-accept") != accept:
+            writer.close()
+            raise WebDriverException(f"WebSocket handshake with {url} failed: {status_line.decode().strip()}")
+        return cls(reader, writer)
+
+    def _frame(self, opcode, payload):
+        # Кадры клиента всегда маскируются
+        header = bytearray([0x80 | opcode])
+        if len(payload) < 126:
+            header.append(0x80 | len(payload))
+        elif len(payload) < 1 << 16:
+            header.append(0x80 | 126)
+            header += len(payload).to_bytes(2, "big")
+        else:
+            header.append(0x80 | 127)
+            header += len(payload).to_bytes(8, "big")
+        mask = os.urandom(4)
+        return bytes(header) + mask + _mask(payload, mask)
+
+    async def send(self, text):
+        self._writer.write(self._frame(_TEXT, text.encode("utf-8")))
+        await self._writer.drain()
+
+    async def receive(self):
+        """Следующее текстовое сообщение; ConnectionError, если соединение закрыто"""
+        message = bytearray()
+        while True:
+            first, second = await self._reader.readexactly(2)
+            length = second & 0x7F
+            if length == 126:
+                length = int.from_bytes(await self._reader.readexactly(2), "big")
+            elif length == 127:
+                length = int.from_bytes(await self._reader.readexactly(8), "big")
+            mask = await self._reader.readexactly(4) if second & 0x80 else None
+            payload = await self._reader.readexactly(length)
+            if mask is not None:
+                payload = _mask(payload, mask)
+            opcode = first & 0x0F
+            if opcode == _CLOSE:
+                raise ConnectionResetError("WebSocket closed by the driver")
+            if opcode == _PING:
+                self._writer.write(self._frame(_PONG, payload))
+                continue
+            if opcode == _PONG:
+                continue
+            message += payload
+            if first & 0x80:
+                return message.decode("utf-8")
+
+    async def close(self):
+        try:
+            self._writer.write(self._frame(_CLOSE, b""))
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+        self._writer.close()
+
+
+def _mask(data, mask):
+    repeated = (mask * (len(data) // 4 + 1))[:len(data)]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(data), "big")
+
+
+class BidiConnection:
+    """Команды BiDi с ответами по id; команды разных контекстов идут вперемешку"""
+
+    def __init__(self, socket, timeout=COMMAND_TIMEOUT):
+        self._socket = socket
+        self.timeout = timeout
+        self._next_id = 0
+        self._pending = {}
+        self._failure = None
+        self._reader = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, url):
+        return cls(await WebSocket.connect(url))
+
+    async def command(self, method, params):
+        """Результат команды; ошибка протокола поднимается исключением Selenium"""
+        if self._failure is not None:
+            raise WebDriverException(f"BiDi connection lost: {self._failure}")
+        self._next_id += 1
+        command_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        try:
+            await self._socket.send(json.dumps({"id": command_id, "method": method, "params": params}, ensure_ascii=False))
+            return await asyncio.wait_for(future, self.timeout)
+        except TimeoutError:
+            raise TimeoutException(f"No reply to BiDi command {method} within {self.timeout}s") from None
+        finally:
+            self._pending.pop(command_id, None)
+
+    async def _read(self):
+        reason = "connection closed"
+        try:
+            while True:
+                message = json.loads(await self._socket.receive())
+                # События не нужны: окна alert перехватываются на странице
+                future = self._pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if message.get("type") == "error":
+                    exception = ERRORS.get(message.get("error"), WebDriverException)
+                    future.set_exception(exception(message.get("message", message.get("error"))))
+                else:
+                    future.set_result(message.get("result", {}))
+        except Exception as error:
+            # Любая ошибка чтения (обрыв, битый кадр, не JSON) завершает соединение
+            reason = f"{type(error).__name__}: {error}"
+        finally:
+            # Без читателя ответы не придут: ожидающие команды падают сразу, а не висят
+            self._fail(reason)
+
+    def _fail(self, reason):
+        if self._failure is None:
+            self._failure = reason
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(WebDriverException(f"BiDi connection lost: {reason}"))
+
+    async def close(self):
+        self._reader.cancel()
+        self._fail("connection closed")
+        await self._socket.close()
+
+
+class ContextElement:
+    """Элемент страницы в контексте BiDi с API AsyncElement"""
+
+    def __init__(self, driver, shared_id):
+        self._driver = driver
+        self.id = shared_id
+
+    def __eq__(self, other):
+        return isinstance(other, ContextElement) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    async def text(self):
+        return await self._driver.execute_script("return arguments[0].innerText;", self)
+
+    async def get_attribute(self, name):
+        return await self._driver.execute_script("return arguments[0].getAttribute(arguments[1]);", self, name)
+
+    async def is_enabled(self):
+        return await self._driver.execute_script("return !arguments[0].disabled;", self)
+
+    async def click(self):
+        # Клик мышью в центр элемента, как у команды WebDriver element click
+        await self._driver.perform_actions([{
+            "type": "pointer",
+            "id": "mouse",
+            "parameters": {"pointerType": "mouse"},
+            "actions": [
+                {"type": "pointerMove", "x": 0, "y": 0, "origin": {"type": "element", "element": {"sharedId": self.id}}},
+                {"type": "pointerDown", "button": 0},
+                {"type": "pointerUp", "button": 0},
+            ],
+        }])
+
+
+class ContextDriver:
+    """Вкладка в собственном пользовательском контексте с API AsyncWebDriver.
+
+    quit() удаляет пользовательский контекст вместе с его вкладками и данными.
+    """
+
+    def __init__(self, connection, context, user_context):
+        self._connection = connection
+        self.context = context
+        self.user_context = user_context
+
+    @classmethod
+    async def open(cls, connection):
+        """Новая вкладка в новом пользовательском контексте"""
+        user_context = (await connection.command("browser.createUserContext", {}))["userContext"]
+        created = await connection.command("browsingContext.create", {"type": "tab", "userContext": user_context})
+        return cls(connection, created["context"], user_context)
+
+    async def get(self, url):
+        await self._connection.command("browsingContext.navigate", {"context": self.context, "url": url, "wait": "complete"})
+
+    async def current_url(self):
+        tree = await self._connection.command("browsingContext.getTree", {"root": self.context, "maxDepth": 0})
+        return tree["contexts"][0]["url"]
+
+    async def _call(self, declaration, args, await_promise):
+        response = await self._connection.command("script.callFunction", {
+            "functionDeclaration": declaration,
+            "arguments": [_serialize(arg) for arg in args],
+            "target": {"context": self.context},
+            "awaitPromise": await_promise,
+        })
+        if response.get("type") == "exception":
+            raise JavascriptException(response["exceptionDetails"].get("text", "Script failed"))
+        return self._deserialize(response["result"])
+
+    async def execute_script(self, script, *args):
+        return await self._call(f"function() {{\n{script}\n}}", args, await_promise=False)
+
+    async def execute_async_script(self, script, *args):
+        # Последним аргументом скрипт получает done, как в execute_async_script
+        declaration = (
+            "function() {\n"
+            "const args = Array.from(arguments);\n"
+            "return new Promise((resolve) => {\n"
+            "args.push(resolve);\n"
+            f"(function() {{\n{script}\n}}).apply(null, args);\n"
+            "});\n"
+            "}"
+        )
+        return await self._call(declaration, args, await_promise=True)
+
+    async def perform_actions(self, actions):
+        await self._connection.command("input.performActions", {"context": self.context, "actions": actions})
+        await self._connection.command("input.releaseActions", {"context": self.context})
+
+    async def quit(self):
+        await self._connection.command("browser.removeUserContext", {"userContext": self.user_context})
+
+    def _deserialize(self, value):
+        kind = value.get("type")
+        if kind == "node":
+            return ContextElement(self, value["sharedId"])
+        if kind == "array":
+            return [self._deserialize(item) for item in value.get("value", [])]
+        if kind == "object":
+            return {
+                key if isinstance(key, str) else self._deserialize(key): self._deserialize(item)
+                for key, item in value.get("value", [])
+            }
+        if kind in ("undefined", "null"):
+            return None
+        return value.get("value")
+
+
+def _serialize(value):
+    if isinstance(value, ContextElement):
+        return {"sharedId": value.id}
+    if value is None:
+        return {"type": "null"}
+    if isinstance(value, bool):
+        return {"type": "boolean", "value": value}
+    if isinstance(value, (int, float)):
+        return {"type": "number", "value": value}
+    if isinstance(value, str):
+        return {"type": "string", "value": value}
+    if isinstance(value, (list, tuple)):
+        return {"type": "array", "value": [_serialize(item) for item in value]}
+    if isinstance(value, dict):
+        return {"type": "object", "value": [[str(key), _serialize(item)] for key, item in value.items()]}
+    raise TypeError(f"Cannot pass {type(value).__name__} to a BiDi script")
@@ -0,0 +1,23 @@
+"""Пользовательские контексты BiDi для тестов на общем браузере"""
+
+from contextlib import contextmanager
+
+
+@contextmanager
+def user_context(driver):
+    """Вкладка в новом пользовательском контексте на время блока.
+
+    Cookies, storage и кеш контекста не пересекаются с другими тестами,
+    поэтому браузер не нужно перезапускать ради изоляции. Команды WebDriver
+    на время блока переключаются на вкладку; после него контекст удаляется
+    вместе с вкладкой, и драйвер возвращается в прежнее окно.
+    """
+    previous = driver.current_window_handle
+    context_id = driver.browser.create_user_context()
+    try:
+        tab = driver.browsing_context.create(type="tab", user_context=context_id)
+        driver.switch_to.window(tab)
+        yield tab
+    finally:
+        driver.browser.remove_user_context(context_id)
+        driver.switch_to.window(previous)
@@ -0,0 +1,346 @@
+// Мост между DomDriver (Python) и jsdom: команды и ответы - JSON построчно через stdin/stdout.
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const readline = require("readline");
+const { JSDOM, VirtualConsole } = require("jsdom");
+
+const ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf";
+const distDir = path.resolve(process.argv[2]);
+
+let dom = null;
+let scriptTimeoutMs = 30000;
+let nextElementId = 1;
+const elementsById = new Map();
+const idsByElement = new WeakMap();
+const prompts = [];
+
+class BridgeError extends Error {
+    constructor(type, message) {
+        super(message);
+        this.type = type;
+    }
+}
+
+function currentWindow() {
+    return dom.window;
+}
+
+function reference(node) {
+    let id = idsByElement.get(node);
+    if (id === undefined) {
+        id = String(nextElementId++);
+        idsByElement.set(node, id);
+        elementsById.set(id, node);
+    }
+    return { [ELEMENT_KEY]: id };
+}
+
+function element(id) {
+    const node = elementsById.get(id);
+    if (!node || !node.isConnected || node.ownerDocument !== currentWindow().document) {
+        throw new BridgeError("stale element reference", `Element ${id} is no longer attached to the DOM`);
+    }
+    return node;
+}
+
+function serialize(value) {
+    const { Node, NodeList, HTMLCollection } = currentWindow();
+    if (value === undefined || value === null) {
+        return null;
+    }
+    if (value instanceof Node) {
+        return reference(value);
+    }
+    if (Array.isArray(value) || value instanceof NodeList || value instanceof HTMLCollection) {
+        return Array.from(value, serialize);
+    }
+    if (typeof value === "object") {
+        const result = {};
+        for (const [key, item] of Object.entries(value)) {
+            result[key] = serialize(item);
+        }
+        return result;
+    }
+    return value;
+}
+
+function deserialize(value) {
+    if (Array.isArray(value)) {
+        return value.map(deserialize);
+    }
+    if (value !== null && typeof value === "object") {
+        if (ELEMENT_KEY in value) {
+            return element(value[ELEMENT_KEY]);
+        }
+        const result = {};
+        for (const [key, item] of Object.entries(value)) {
+            result[key] = deserialize(item);
+        }
+        return result;
+    }
+    return value;
+}
+
+function macrotask() {
+    return new Promise((resolve) => setTimeout(resolve, 0));
+}
+
+function resolveAsset(url) {
+    const pathname = decodeURIComponent(new URL(url).pathname);
+    const file = path.join(distDir, pathname);
+    if (!file.startsWith(distDir) || !fs.existsSync(file) || fs.statSync(file).isDirectory()) {
+        // SPA: любой неизвестный путь отдаёт index.html
+        return path.join(distDir, "index.html");
+    }
+    return file;
+}
+
+function installBrowserShims(win) {
+    // jsdom не реализует innerText и модальные окна
+    if (!("innerText" in win.HTMLElement.prototype)) {
+        Object.defineProperty(win.HTMLElement.prototype, "innerText", {
+            get() {
+                return this.textContent.replace(/\s+/g, " ").trim();
+            },
+            set(value) {
+                this.textContent = value;
+            },
+        });
+    }
+    for (const type of ["alert", "confirm", "prompt"]) {
+        win[type] = (message) => {
+            prompts.push({ type, text: message === undefined ? "" : String(message) });
+            return type === "confirm" ? true : type === "prompt" ? "" : undefined;
+        };
+    }
+}
+
+async function navigate(url) {
+    if (dom !== null) {
+        dom.window.close();
+    }
+    prompts.length = 0;
+    const virtualConsole = new VirtualConsole();
+    if (url === "about:blank") {
+        dom = new JSDOM("", { url: "about:blank", runScripts: "outside-only", virtualConsole });
+        return;
+    }
+    const html = fs.readFileSync(resolveAsset(url), "utf8");
+    dom = new JSDOM(html, { url, runScripts: "outside-only", pretendToBeVisual: true, virtualConsole });
+    const win = dom.window;
+    installBrowserShims(win);
+    // Модульные скрипты Vite-бандла выполняются после разбора документа, как в браузере
+    for (const script of win.document.querySelectorAll("script[src]")) {
+        const source = fs.readFileSync(resolveAsset(new URL(script.src, url).href), "utf8");
+        win.eval(source);
+    }
+    if (win.document.readyState !== "complete") {
+        await new Promise((resolve) => win.addEventListener("load", resolve, { once: true }));
+    }
+    await macrotask();
+}
+
+function findElements(using, value, root) {
+    const win = currentWindow();
+    const scope = root || win.document;
+    switch (using) {
+        case "id":
+            return Array.from(scope.querySelectorAll(`[id="${value.replace(/"/g, '\\"')}"]`));
+        case "css selector":
+            return Array.from(scope.querySelectorAll(value));
+        case "class name":
+            return Array.from(scope.getElementsByClassName(value));
+        case "tag name":
+            return Array.from(scope.getElementsByTagName(value));
+        case "name":
+            return Array.from(scope.querySelectorAll(`[name="${value.replace(/"/g, '\\"')}"]`));
+        case "xpath": {
+            const result = win.document.evaluate(
+                value, scope, null, win.XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            const nodes = [];
+            for (let index = 0; index < result.snapshotLength; index++) {
+                nodes.push(result.snapshotItem(index));
+            }
+            return nodes;
+        }
+    }
+    throw new BridgeError("invalid argument", `Unsupported locator strategy: ${using}`);
+}
+
+function setNativeValue(input, value) {
+    const prototype = Object.getPrototypeOf(input);
+    Object.getOwnPropertyDescriptor(prototype, "value").set.call(input, value);
+}
+
+function isDisplayed(node) {
+    const win = currentWindow();
+    for (let current = node; current && current.nodeType === 1; current = current.parentElement) {
+        const style = win.getComputedStyle(current);
+        if (current.hidden || style.display === "none" || style.visibility === "hidden") {
+            return false;
+        }
+    }
+    return node.isConnected;
+}
+
+async function typeText(input, text) {
+    const win = currentWindow();
+    input.focus();
+    for (const char of text) {
+        input.dispatchEvent(new win.KeyboardEvent("keydown", { key: char, bubbles: true }));
+        input.dispatchEvent(new win.KeyboardEvent("keypress", { key: char, bubbles: true }));
+        const start = input.selectionStart === null ? input.value.length : input.selectionStart;
+        const end = input.selectionEnd === null ? start : input.selectionEnd;
+        setNativeValue(input, input.value.slice(0, start) + char + input.value.slice(end));
+        input.dispatchEvent(new win.InputEvent("input", { bubbles: true, data: char, inputType: "insertText" }));
+        input.dispatchEvent(new win.KeyboardEvent("keyup", { key: char, bubbles: true }));
+        // Как в браузере: каждая клавиша - отдельная задача, React успевает перерисоваться
+        await macrotask();
+    }
+}
+
+async function runScript(script, args, isAsync) {
+    const win = currentWindow();
+    const fn = win.eval(`(function() {\n${script}\n})`);
+    const callArgs = deserialize(args);
+    if (!isAsync) {
+        return serialize(fn.apply(win, callArgs));
+    }
+    const value = await new Promise((resolve, reject) => {
+        const timer = setTimeout(
+            () => reject(new BridgeError("script timeout", `Script did not finish in ${scriptTimeoutMs} ms`)),
+            scriptTimeoutMs
+        );
+        fn.apply(win, [...callArgs, (result) => {
+            clearTimeout(timer);
+            resolve(result);
+        }]);
+    });
+    return serialize(value);
+}
+
+const commands = {
+    async get({ url }) {
+        await navigate(url);
+    },
+    currentUrl() {
+        return currentWindow().location.href;
+    },
+    pageSource() {
+        return dom.serialize();
+    },
+    findElements({ using, value, parent }) {
+        const root = parent ? element(parent) : null;
+        return findElements(using, value, root).map(reference);
+    },
+    activeElement() {
+        const { document } = currentWindow();
+        return reference(document.activeElement || document.body);
+    },
+    async click({ id }) {
+        const node = element(id);
+        const win = currentWindow();
+        node.dispatchEvent(new win.MouseEvent("mousedown", { bubbles: true, cancelable: true }));
+        if (typeof node.focus === "function") {
+            node.focus();
+        }
+        node.dispatchEvent(new win.MouseEvent("mouseup", { bubbles: true, cancelable: true }));
+        node.click();
+        await macrotask();
+    },
+    async clear({ id }) {
+        const node = element(id);
+        const win = currentWindow();
+        node.focus();
+        setNativeValue(node, "");
+        node.dispatchEvent(new win.Event("input", { bubbles: true }));
+        node.dispatchEvent(new win.Event("change", { bubbles: true }));
+        await macrotask();
+    },
+    async sendKeys({ id, text }) {
+        await typeText(element(id), text);
+    },
+    text({ id }) {
+        return element(id).innerText;
+    },
+    attribute({ id, name }) {
+        const node = element(id);
+        if (name in node && node[name] !== null && typeof node[name] !== "object") {
+            return typeof node[name] === "boolean" ? (node[name] ? "true" : null) : String(node[name]);
+        }
+        return node.getAttribute(name);
+    },
+    property({ id, name }) {
+        return serialize(element(id)[name]);
+    },
+    tagName({ id }) {
+        return element(id).tagName.toLowerCase();
+    },
+    enabled({ id }) {
+        return !element(id).disabled;
+    },
+    displayed({ id }) {
+        return isDisplayed(element(id));
+    },
+    async execute({ script, args }) {
+        return runScript(script, args, false);
+    },
+    async executeAsync({ script, args }) {
+        return runScript(script, args, true);
+    },
+    setScriptTimeout({ ms }) {
+        scriptTimeoutMs = ms;
+    },
+    deleteAllCookies() {
+        dom.cookieJar.removeAllCookiesSync();
+    },
+    alertText() {
+        if (prompts.length === 0) {
+            throw new BridgeError("no such alert", "No alert is open");
+        }
+        return prompts[0].text;
+    },
+    closeAlert() {
+        if (prompts.length === 0) {
+            throw new BridgeError("no such alert", "No alert is open");
+        }
+        prompts.shift();
+    },
+};
+
+async function handle(line) {
+    const { id, command, params } = JSON.parse(line);
+    try {
+        if (!(command in commands)) {
+            throw new BridgeError("unknown command", `Unknown command: ${command}`);
+        }
+        if (dom === null && command !== "get" && command !== "setScriptTimeout") {
+            await navigate("about:blank");
+        }
+        const value = await commands[command](params || {});
+        return { id, value: value === undefined ? null : value };
+    } catch (error) {
+        if (error instanceof BridgeError) {
+            return { id, error: { type: error.type, message: error.message } };
+        }
+        return { id, error: { type: "javascript error", message: String(error && error.stack ? error.stack : error) } };
+    }
+}
+
+async function main() {
+    const input = readline.createInterface({ input: process.stdin });
+    for await (const line of input) {
+        if (line.trim() === "") {
+            continue;
+        }
+        process.stdout.write(JSON.stringify(await handle(line)) + "\n");
+    }
+    if (dom !== null) {
+        dom.window.close();
+    }
+}
+
+main();
@@ -0,0 +1,244 @@
+import json
+import queue
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+from drivers.errors import ELEMENT_KEY, ERRORS
+
+BRIDGE_SCRIPT = Path(__file__).with_name("bridge.js")
+DEFAULT_DIST_DIR = Path(__file__).resolve().parents[2] / "dist"
+
+# Сколько ждать ответа моста: у скриптов страницы свои таймауты в секунды,
+# так что дольше молчит только зависший Node.js
+COMMAND_TIMEOUT = 60
+
+# Сколько последних символов журнала stderr моста показывать в ошибке
+STDERR_TAIL = 2000
+
+
+class DomElement:
+    """Элемент страницы в jsdom с API WebElement"""
+
+    def __init__(self, driver, element_id):
+        self._driver = driver
+        self.id = element_id
+
+    def __eq__(self, other):
+        return isinstance(other, DomElement) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    @property
+    def text(self):
+        return self._driver._execute("text", id=self.id)
+
+    @property
+    def tag_name(self):
+        return self._driver._execute("tagName", id=self.id)
+
+    def get_attribute(self, name):
+        return self._driver._execute("attribute", id=self.id, name=name)
+
+    def get_property(self, name):
+        return self._driver._unwrap(self._driver._execute("property", id=self.id, name=name))
+
+    def is_enabled(self):
+        return self._driver._execute("enabled", id=self.id)
+
+    def is_displayed(self):
+        return self._driver._execute("displayed", id=self.id)
+
+    def click(self):
+        self._driver._execute("click", id=self.id)
+
+    def clear(self):
+        self._driver._execute("clear", id=self.id)
+
+    def send_keys(self, *value):
+        self._driver._execute("sendKeys", id=self.id, text="".join(str(item) for item in value))
+
+    def find_element(self, by="id", value=None):
+        return self._driver._find_element(by, value, parent=self.id)
+
+    def find_elements(self, by="id", value=None):
+        return self._driver._find_elements(by, value, parent=self.id)
+
+
+class DomAlert:
+    """Окно alert/confirm/prompt, перехваченное в jsdom"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    @property
+    def text(self):
+        return self._driver._execute("alertText")
+
+    def accept(self):
+        self._driver._execute("closeAlert")
+
+    def dismiss(self):
+        self._driver._execute("closeAlert")
+
+
+class DomSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    @property
+    def alert(self):
+        # Как и в Selenium, отсутствие окна сразу даёт NoAlertPresentException
+        self._driver._execute("alertText")
+        return DomAlert(self._driver)
+
+    @property
+    def active_element(self):
+        return self._driver._unwrap(self._driver._execute("activeElement"))
+
+
+class DomDriver:
+    """Драйвер без браузера: dist/ отрисовывается в jsdom через мост на Node.js.
+
+    Реализует подмножество API Selenium WebDriver, которым пользуется TransferPage.
+    """
+
+    name = "jsdom"
+
+    def __init__(self, dist_dir=DEFAULT_DIST_DIR, node="node"):
+        self.dist_dir = Path(dist_dir)
+        self._next_id = 0
+        # stderr идёт в файл, а не в канал: непрочитанный канал переполнится
+        # предупреждениями Node.js и остановит мост посреди сессии
+        self._stderr = tempfile.TemporaryFile(mode="a+", encoding="utf-8")
+        try:
+            self._process = subprocess.Popen(
+                [node, str(BRIDGE_SCRIPT), str(self.dist_dir)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self._stderr,
+                text=True,
+                encoding="utf-8",
+            )
+        except FileNotFoundError as error:
+            self._stderr.close()
+            raise WebDriverException(f"Node.js is required for the DOM engine: {error}") from error
+        # Ответы читает отдельный поток: так у ожидания ответа есть таймаут
+        self._responses = queue.Queue()
+        threading.Thread(target=self._read_responses, name="dom-bridge", daemon=True).start()
+        self.switch_to = DomSwitchTo(self)
+        self.capabilities = {"browserName": self.name}
+
+    def _execute(self, command, **params):
+        self._next_id += 1
+        request = {"id": self._next_id, "command": command, "params": params}
+        try:
+            self._process.stdin.write(json.dumps(request, ensure_ascii=False) + "\n")
+            self._process.stdin.flush()
+            line = self._responses.get(timeout=COMMAND_TIMEOUT)
+        except (BrokenPipeError, ValueError):
+            line = ""
+        except queue.Empty:
+            self._process.kill()
+            raise WebDriverException(
+                f"DOM bridge did not answer {command!r} in {COMMAND_TIMEOUT}s: {self._stderr_tail()}"
+            ) from None
+        if not line:
+            raise WebDriverException(
+                f"DOM bridge exited (run `npm install --prefix drivers/dom`): {self._stderr_tail()}"
+            )
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            raise ERRORS.get(error["type"], WebDriverException)(error["message"])
+        return response["value"]
+
+    def _read_responses(self):
+        for line in self._process.stdout:
+            self._responses.put(line)
+        # Пустая строка - мост завершился
+        self._responses.put("")
+
+    def _stderr_tail(self):
+        self._stderr.seek(0)
+        return self._stderr.read()[-STDERR_TAIL:].strip()
+
+    def _wrap(self, value):
+        if isinstance(value, DomElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return DomElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    def _find_elements(self, by, value, parent=None):
+        found = self._execute("findElements", using=by, value=value, parent=parent)
+        return [DomElement(self, reference[ELEMENT_KEY]) for reference in found]
+
+    def _find_element(self, by, value, parent=None):
+        found = self._find_elements(by, value, parent)
+        if not found:
+            raise NoSuchElementException(f"Unable to locate element: {by}={value}")
+        return found[0]
+
+    def get(self, url):
+        self._execute("get", url=url)
+
+    @property
+    def current_url(self):
+        return self._execute("currentUrl")
+
+    @property
+    def page_source(self):
+        return self._execute("pageSource")
+
+    def find_element(self, by="id", value=None):
+        return self._find_element(by, value)
+
+    def find_elements(self, by="id", value=None):
+        return self._find_elements(by, value)
+
+    def execute_script(self, script, *args):
+        return self._unwrap(self._execute("execute", script=script, args=self._wrap(list(args))))
+
+    def execute_async_script(self, script, *args):
+        return self._unwrap(self._execute("executeAsync", script=script, args=self._wrap(list(args))))
+
+    def set_script_timeout(self, time_to_wait):
+        self._execute("setScriptTimeout", ms=int(time_to_wait * 1000))
+
+    def implicitly_wait(self, time_to_wait):
+        # Неявные ожидания не поддерживаются и не нужны: DOM меняется синхронно с командами
+        pass
+
+    def maximize_window(self):
+        pass
+
+    def delete_all_cookies(self):
+        self._execute("deleteAllCookies")
+
+    def get_screenshot_as_png(self):
+        raise WebDriverException("Screenshots are not available in the DOM engine")
+
+    def quit(self):
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._stderr.close()
@@ -0,0 +1,38 @@
+"""Коды ошибок W3C WebDriver и исключения Selenium для них.
+
+Общие для движка jsdom (drivers.dom), асинхронного клиента HTTP
+(drivers.async_client) и клиента BiDi (drivers.bidi_client).
+"""
+
+from selenium.common.exceptions import (
+    InvalidArgumentException,
+    InvalidSessionIdException,
+    JavascriptException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    NoSuchFrameException,
+    SessionNotCreatedException,
+    StaleElementReferenceException,
+    TimeoutException,
+    UnexpectedAlertPresentException,
+    UnknownMethodException,
+)
+
+# Ключ ссылки на элемент из протокола W3C WebDriver
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# Неизвестный код поднимается как WebDriverException
+ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "no such alert": NoAlertPresentException,
+    "no such frame": NoSuchFrameException,
+    "script timeout": TimeoutException,
+    "timeout": TimeoutException,
+    "javascript error": JavascriptException,
+    "invalid argument": InvalidArgumentException,
+    "unknown command": UnknownMethodException,
+    "invalid session id": InvalidSessionIdException,
+    "session not created": SessionNotCreatedException,
+    "unexpected alert open": UnexpectedAlertPresentException,
+}
@@ -0,0 +1,89 @@
+"""Запуск браузеров.
+
+Модули Selenium для браузеров импортируются только при создании драйвера:
+сбор тестов, запуск на движке jsdom и --collect-only обходятся без них.
+"""
+
+import os
+
+from drivers.profiles import CHROME_PROFILE_ARGUMENTS, clone_profile
+
+
+def create_driver(browser_name, headless, driver_path=None, profile_dir=None, bidi=False, profile_template=None):
+    """Создание экземпляра WebDriver
+
+    driver_path разрешается один раз за сессию (см. drivers.resolver);
+    без него путь к драйверу ищет Selenium Manager.
+    profile_dir - собственный каталог профиля и временных файлов браузера,
+    чтобы параллельные браузеры не делили общий профиль в /tmp.
+    bidi включает WebDriver BiDi: окна alert приходят событиями
+    (см. page_objects.prompts) и остаются открытыми до их обработки.
+    profile_template - прогретый профиль (см. drivers.profiles), который
+    копируется в profile_dir перед запуском.
+    """
+    env = None
+    if profile_dir is not None:
+        temp_dir = os.path.join(profile_dir, "tmp")
+        os.makedirs(temp_dir, exist_ok=True)
+        env = {**os.environ, "TMPDIR": temp_dir}
+        if profile_template is not None:
+            clone_profile(profile_template, profile_dir)
+
+    options = browser_options(browser_name, headless, profile_dir=profile_dir, bidi=bidi)
+    if browser_name.lower() == "chrome":
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        from selenium.webdriver.chrome.webdriver import WebDriver as Chrome
+        driver = Chrome(service=ChromeService(driver_path, env=env), options=options)
+    else:
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        from selenium.webdriver.firefox.webdriver import WebDriver as Firefox
+        driver = Firefox(service=FirefoxService(driver_path, env=env), options=options)
+
+    # Неявное ожидание не используется: проверки отсутствия элементов
+    # обходятся без таймаутов (см. TransferPage.assert_stays_absent)
+    driver.maximize_window()
+    return driver
+
+
+def browser_options(browser_name, headless, profile_dir=None, bidi=False):
+    """Опции запуска браузера; отдельно от драйвера нужны и асинхронному клиенту (drivers.async_client)"""
+    if browser_name.lower() == "chrome":
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        options = ChromeOptions()
+        if headless:
+            options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1920,1080")
+        # Консоль страницы целиком: её последние записи сохраняются при падении теста
+        options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+        if profile_dir is not None:
+            options.add_argument(f"--user-data-dir={os.path.join(profile_dir, 'profile')}")
+            for argument in CHROME_PROFILE_ARGUMENTS:
+                options.add_argument(argument)
+
+    elif browser_name.lower() == "firefox":
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
+        options = FirefoxOptions()
+        if headless:
+            options.add_argument("--headless")
+        options.add_argument("--width=1920")
+        options.add_argument("--height=1080")
+        if profile_dir is not None:
+            firefox_profile = os.path.join(profile_dir, "profile")
+            os.makedirs(firefox_profile, exist_ok=True)
+            options.add_argument("-profile")
+            options.add_argument(firefox_profile)
+    else:
+        raise ValueError(f"Unsupported browser: {browser_name}")
+
+    _configure_bidi(options, bidi)
+    return options
+
+
+def _configure_bidi(options, bidi):
+    if bidi:
+        options.enable_bidi = True
+        # Окно не закрывается автоматически следующей командой: его закрывает подписчик событий
+        options.unhandled_prompt_behavior = "ignore"
@@ -0,0 +1,49 @@
+import os
+import time
+
+
+class FileLock:
+    """Межпроцессная блокировка на lock-файле (общая для воркеров pytest-xdist)"""
+
+    def __init__(self, path, timeout=300, stale_after=600, poll_interval=0.1):
+        self.path = str(path)
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return self
+            except FileExistsError:
+                self._break_if_stale()
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not acquire lock {self.path} in {self.timeout}s")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _break_if_stale(self):
+        # Lock-файл процесса, упавшего посреди загрузки, не должен блокировать остальных вечно
+        try:
+            if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -0,0 +1,182 @@
+"""Замеры и журнал команд WebDriver, ожиданий и методов Page Object"""
+
+import functools
+import inspect
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# Методы Page Object, в которых тест ждёт страницу, а не работает с ней
+WAIT_METHODS = frozenset({
+    "wait_for_dom_quiescence",
+    "assert_stays_absent",
+    "handle_alert",
+})
+
+
+class TimingRecorder:
+    """Замеры одного теста"""
+
+    def __init__(self):
+        self.commands = defaultdict(lambda: [0, 0.0])
+        self.page_methods = defaultdict(lambda: [0, 0.0])
+        self.fixtures = {}
+        self.phases = {}
+        self.locator_matches = Counter()
+        self.wait_time = 0.0
+        self._wait_depth = 0
+
+    def add_command(self, name, seconds):
+        entry = self.commands[name]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def add_page_method(self, name, seconds):
+        entry = self.page_methods[name]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def add_locator_matches(self, matches):
+        """Учёт сработавших стратегий локаторов: {(элемент, стратегия): число} из ElementCache.matches"""
+        self.locator_matches.update({f"{name}: {strategy}": count for (name, strategy), count in matches.items()})
+
+    @contextmanager
+    def waiting(self):
+        """Учёт времени ожидания; вложенные ожидания не суммируются дважды"""
+        self._wait_depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._wait_depth -= 1
+            if self._wait_depth == 0:
+                self.wait_time += time.perf_counter() - started
+
+    def to_dict(self):
+        call = self.phases.get("call", 0.0)
+        return {
+            "phases": dict(self.phases),
+            "fixtures": dict(self.fixtures),
+            "command_count": sum(count for count, _ in self.commands.values()),
+            "command_time": sum(seconds for _, seconds in self.commands.values()),
+            "commands": {name: {"count": count, "time": seconds} for name, (count, seconds) in self.commands.items()},
+            "page_methods": {
+                name: {"count": count, "time": seconds} for name, (count, seconds) in self.page_methods.items()
+            },
+            "locator_matches": dict(self.locator_matches),
+            "wait_time": self.wait_time,
+            "work_time": max(call - self.wait_time, 0.0),
+        }
+
+
+def instrument_driver(driver, current):
+    """Замер каждой команды драйвера.
+
+    current - функция, возвращающая TimingRecorder текущего теста (или None):
+    драйвер живёт в пуле дольше одного теста. Обёртка ставится на экземпляр,
+    поэтому команды элементов, идущие через драйвер, тоже учитываются.
+    """
+    if getattr(driver, "_timing_instrumented", False):
+        return driver
+    # Selenium отправляет команды через execute, DomDriver - через _execute
+    name = "execute" if hasattr(driver, "command_executor") else "_execute"
+    original = getattr(driver, name)
+
+    @functools.wraps(original)
+    def timed(command, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original(command, *args, **kwargs)
+        finally:
+            recorder = current()
+            if recorder is not None:
+                recorder.add_command(command, time.perf_counter() - started)
+
+    setattr(driver, name, timed)
+    driver._timing_instrumented = True
+    return driver
+
+
+def instrument_page(page, current):
+    """Замер публичных методов Page Object на экземпляре страницы"""
+    cls = type(page)
+    for name, method in inspect.getmembers(cls, inspect.isfunction):
+        if name.startswith("_"):
+            continue
+        setattr(page, name, _timed_method(getattr(page, name), f"{cls.__name__}.{name}", name in WAIT_METHODS, current))
+    return page
+
+
+def _timed_method(method, label, is_wait, current):
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        recorder = current()
+        if recorder is None:
+            return method(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            if is_wait:
+                with recorder.waiting():
+                    return method(*args, **kwargs)
+            return method(*args, **kwargs)
+        finally:
+            recorder.add_page_method(label, time.perf_counter() - started)
+
+    return timed
+
+
+def instrument_waits(wait_class, current):
+    """Учёт опроса WebDriverWait как ожидания; возвращает функцию отката"""
+    originals = {name: getattr(wait_class, name) for name in ("until", "until_not")}
+
+    def wrap(original):
+        @functools.wraps(original)
+        def timed(self, *args, **kwargs):
+            recorder = current()
+            if recorder is None:
+                return original(self, *args, **kwargs)
+            with recorder.waiting():
+                return original(self, *args, **kwargs)
+
+        return timed
+
+    for name, original in originals.items():
+        setattr(wait_class, name, wrap(original))
+
+    def restore():
+        for name, original in originals.items():
+            setattr(wait_class, name, original)
+
+    return restore
+
+
+def trace_commands(driver, current):
+    """Запись команд драйвера в кольцевой буфер текущего теста.
+
+    current - функция, возвращающая буфер (collections.deque с maxlen) или None.
+    В буфер попадают ссылки на параметры: в текст они переводятся,
+    только если тест упал (см. plugins.artifacts).
+    """
+    if getattr(driver, "_command_trace_installed", False):
+        return driver
+    name = "execute" if hasattr(driver, "command_executor") else "_execute"
+    original = getattr(driver, name)
+
+    @functools.wraps(original)
+    def traced(command, *args, **kwargs):
+        buffer = current()
+        if buffer is None:
+            return original(command, *args, **kwargs)
+        started = time.time()
+        error = None
+        try:
+            return original(command, *args, **kwargs)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            buffer.append((started, command, args, kwargs, time.time() - started, error))
+
+    setattr(driver, name, traced)
+    driver._command_trace_installed = True
+    return driver
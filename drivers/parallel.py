@@ -0,0 +1,66 @@
+"""Параметры параллельного прогона на pytest-xdist"""
+
+import os
+
+# Сколько памяти (МБ) занимает один процесс браузера вместе с драйвером
+BROWSER_MEMORY_MB = {
+    "chrome": 600,
+    "firefox": 700,
+    "dom": 150,
+}
+DEFAULT_BROWSER_MEMORY_MB = 700
+
+# Память, оставляемая системе и самому pytest
+RESERVED_MEMORY_MB = 512
+
+
+def usable_cpus():
+    """Число ядер, доступных текущему процессу"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def available_memory_mb():
+    """Свободная память системы в МБ; None, если её не узнать"""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def auto_worker_count(browser, pool_size=1, cpus=None, memory_mb=None):
+    """Число воркеров: не больше ядер и не больше браузеров, помещающихся в память"""
+    cpus = usable_cpus() if cpus is None else cpus
+    memory_mb = available_memory_mb() if memory_mb is None else memory_mb
+    count = cpus
+    if memory_mb is not None:
+        per_worker = BROWSER_MEMORY_MB.get(browser, DEFAULT_BROWSER_MEMORY_MB) * max(pool_size, 1)
+        count = min(count, (memory_mb - RESERVED_MEMORY_MB) // per_worker)
+    return max(count, 1)
+
+
+def scheduling_key(item, browser):
+    """Группа xdist для теста: браузер и состояние страницы.
+
+    Состояние задаётся маркером page_state, по умолчанию - тестовая функция:
+    её параметризованные варианты идут на одном воркере подряд и
+    переиспользуют его браузер. Тесты без страницы группы не получают.
+    """
+    if "page" not in getattr(item, "fixturenames", ()):
+        return None
+    marker = item.get_closest_marker("page_state")
+    if marker is not None:
+        state = marker.args[0] if marker.args else marker.kwargs["name"]
+    else:
+        name = getattr(item, "originalname", item.name)
+        state = name if item.cls is None else f"{item.cls.__name__}.{name}"
+    return f"{browser}:{state}"
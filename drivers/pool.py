@@ -0,0 +1,108 @@
+import queue
+import threading
+
+from selenium.common.exceptions import NoAlertPresentException
+
+# Сколько ждать свободного браузера: тесты воркера идут по одному, так что
+# долгое ожидание означает браузер, который тест не вернул в пул
+DEFAULT_ACQUIRE_TIMEOUT = 120
+
+
+class DriverPool:
+    """Пул переиспользуемых экземпляров WebDriver"""
+
+    def __init__(self, factory, size=1, max_uses=50, keep_page=False):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        # Страница остаётся открытой для следующего теста (см. TransferPage.soft_reset)
+        self.keep_page = keep_page
+        # LIFO: в работу отдаётся последний освобождённый, "самый тёплый" браузер
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        """Получение браузера из пула (создаётся при необходимости).
+
+        TimeoutError, если за timeout секунд ни один браузер не освободился.
+        """
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            driver = self._create_or_wait(timeout)
+        self._uses[driver] += 1
+        return driver
+
+    def release(self, driver, broken=False):
+        """Возврат браузера в пул со сбросом состояния"""
+        if not broken and self._uses.get(driver, 0) < self.max_uses:
+            if self.reset(driver):
+                self._idle.put(driver)
+                return
+        self._discard(driver)
+
+    def close(self):
+        """Закрытие всех браузеров пула"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def reset(self, driver):
+        """Дешёвый сброс состояния браузера между тестами.
+
+        Возвращает False, если браузер не отвечает и его нужно пересоздать.
+        """
+        try:
+            # Закрываем все оставшиеся alert, иначе следующая команда упадёт
+            for _ in range(5):
+                try:
+                    driver.switch_to.alert.dismiss()
+                except NoAlertPresentException:
+                    break
+            if driver.current_url.startswith("http"):
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            driver.delete_all_cookies()
+            if not self.keep_page:
+                driver.get("about:blank")
+        except Exception:
+            # Упавший браузер может отдавать как WebDriverException, так и ошибки соединения
+            return False
+        return True
+
+    def _create_or_wait(self, timeout):
+        with self._lock:
+            can_create = len(self._uses) < self.size
+            if can_create:
+                # Резервируем место, пока браузер запускается
+                placeholder = object()
+                self._uses[placeholder] = 0
+        if not can_create:
+            try:
+                return self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"No pooled browser was released in {timeout}s: all {self.size} are in use "
+                    f"(a test may have kept its driver)"
+                ) from None
+        try:
+            driver = self.factory()
+        except BaseException:
+            with self._lock:
+                del self._uses[placeholder]
+            raise
+        with self._lock:
+            del self._uses[placeholder]
+            self._uses[driver] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
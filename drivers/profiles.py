@@ -0,0 +1,110 @@
+"""Прогретый профиль браузера: шаблон собирается один раз и копируется для каждого драйвера"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+from drivers.filelock import FileLock
+
+# Загрузок страницы при прогреве: V8/SpiderMonkey сохраняют байткод скрипта
+# в кеш не с первой загрузки, а когда скрипт встречается повторно
+WARMUP_LOADS = 3
+
+# Признак отрисованного приложения (как TransferPage.APP_RENDERED)
+APP_RENDERED_SELECTOR = "#root > *"
+
+# Файлы блокировки запущенного браузера в каталоге профиля: в копию не попадают
+PROFILE_LOCKS = shutil.ignore_patterns("Singleton*", "lock", ".parentlock", "parent.lock")
+
+# Настройки Firefox, записываемые в user.js шаблона
+FIREFOX_PREFS = {
+    "browser.cache.disk.enable": True,
+    "browser.cache.disk.smart_size.enabled": False,
+    "browser.cache.disk.capacity": 262144,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.reportingpolicy.firstRun": False,
+}
+
+# Флаги Chrome для профиля: у Chrome нет user.js, настройки шаблона передаются
+# при каждом запуске (см. drivers.factory.browser_options)
+CHROME_PROFILE_ARGUMENTS = (
+    "--disk-cache-size=268435456",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-features=Translate",
+)
+
+
+def template_key(browser_name, base_url, assets_dir):
+    """Ключ шаблона: браузер, origin и хешированные имена файлов сборки.
+
+    Кеш браузера привязан к URL ресурса, поэтому шаблон годится только
+    для того же origin; новая сборка dist/ даёт новый ключ.
+    """
+    digest = hashlib.sha1(browser_name.lower().encode())
+    digest.update(base_url.encode())
+    for path in sorted(Path(assets_dir).rglob("*")):
+        digest.update(path.name.encode())
+    return f"{browser_name.lower()}-{digest.hexdigest()[:12]}"
+
+
+def build_profile_template(browser_name, create, template_dir, url, loads=WARMUP_LOADS, timeout=30):
+    """Профиль с прогретым HTTP-кешем и кешем байткода, собранный один раз.
+
+    create(profile_dir) запускает браузер с профилем в profile_dir/profile
+    (см. drivers.factory.create_driver); для Firefox в профиль заранее
+    записывается user.js с FIREFOX_PREFS. Сборка идёт под lock-файлом,
+    поэтому воркеры xdist с общим origin собирают шаблон один раз;
+    готовый шаблон возвращается сразу.
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    template_dir = Path(template_dir)
+    profile = template_dir / "profile"
+    ready = template_dir / "ready"
+    template_dir.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(template_dir.with_name(template_dir.name + ".lock")):
+        if ready.exists():
+            return profile
+        shutil.rmtree(template_dir, ignore_errors=True)
+        profile.mkdir(parents=True)
+        if browser_name.lower() == "firefox":
+            (profile / "user.js").write_text(
+                "".join(f'user_pref("{name}", {_pref_value(value)});\n' for name, value in FIREFOX_PREFS.items())
+            )
+        driver = create(template_dir)
+        try:
+            for _ in range(loads):
+                driver.get(url)
+                WebDriverWait(driver, timeout).until(
+                    lambda d: d.execute_script("return !!document.querySelector(arguments[0])", APP_RENDERED_SELECTOR)
+                )
+        finally:
+            # Кеш дописывается на диск при закрытии браузера
+            driver.quit()
+        shutil.rmtree(template_dir / "tmp", ignore_errors=True)
+        ready.touch()
+    return profile
+
+
+def clone_profile(template, profile_dir):
+    """Копия шаблона в profile_dir/profile для нового браузера"""
+    target = os.path.join(profile_dir, "profile")
+    shutil.copytree(template, target, ignore=PROFILE_LOCKS, symlinks=True, dirs_exist_ok=True)
+    return target
+
+
+def _pref_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    return f'"{value}"'
@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from selenium.common.exceptions import WebDriverException
+
+from drivers.filelock import FileLock
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".drivers"
+
+DRIVER_NAMES = {
+    "chrome": "chromedriver",
+    "firefox": "geckodriver",
+}
+
+SOURCES = ("manager", "selenium", "offline")
+
+# Непривязанная к версии запись считается актуальной сутки, как и в webdriver-manager
+UNPINNED_TTL = 24 * 60 * 60
+
+
+class DriverResolutionError(RuntimeError):
+    """Не удалось найти бинарник драйвера"""
+
+
+class DriverResolver:
+    """Однократное разрешение пути к бинарнику драйвера через локальный кеш.
+
+    Результат записывается в manifest.json в каталоге кеша под lock-файлом,
+    поэтому параллельные воркеры не скачивают один и тот же драйвер.
+    """
+
+    def __init__(self, source="manager", version=None, driver_path=None, cache_dir=None):
+        if source not in SOURCES:
+            raise ValueError(f"Unsupported driver source: {source}")
+        self.source = source
+        self.version = version
+        self.driver_path = driver_path
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+
+    @property
+    def manifest_path(self):
+        return self.cache_dir / "manifest.json"
+
+    def resolve(self, browser_name):
+        """Получение пути к драйверу для браузера"""
+        browser_name = browser_name.lower()
+        if browser_name not in DRIVER_NAMES:
+            raise ValueError(f"Unsupported browser: {browser_name}")
+
+        if self.driver_path:
+            if not os.path.isfile(self.driver_path):
+                raise DriverResolutionError(f"Driver not found: {self.driver_path}")
+            return self.driver_path
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.cache_dir / f"{browser_name}.lock"):
+            manifest = self._read_manifest()
+            key = f"{browser_name}:{self.version or 'latest'}"
+            path = self._cached(manifest.get(key))
+            if path:
+                return path
+
+            if self.source == "offline":
+                path = self._resolve_offline(browser_name, manifest)
+            elif self.source == "selenium":
+                path = self._resolve_selenium_manager(browser_name)
+            else:
+                path = self._resolve_webdriver_manager(browser_name)
+
+            manifest[key] = {"path": path, "resolved_at": time.time(), "source": self.source}
+            self._write_manifest(manifest)
+            return path
+
+    def _cached(self, entry):
+        if not entry or not os.path.isfile(entry["path"]):
+            return None
+        if self.version is None and self.source != "offline":
+            if time.time() - entry["resolved_at"] > UNPINNED_TTL:
+                return None
+        return entry["path"]
+
+    def _resolve_offline(self, browser_name, manifest):
+        # Любая ранее закешированная версия драйвера лучше, чем сеть
+        for key, entry in sorted(manifest.items(), key=lambda item: -item[1]["resolved_at"]):
+            if key.startswith(f"{browser_name}:") and os.path.isfile(entry["path"]):
+                if self.version is None or key == f"{browser_name}:{self.version}":
+                    return entry["path"]
+
+        path = shutil.which(DRIVER_NAMES[browser_name])
+        if path:
+            return path
+
+        try:
+            return self._resolve_selenium_manager(browser_name, offline=True)
+        except DriverResolutionError as error:
+            raise DriverResolutionError(
+                f"{DRIVER_NAMES[browser_name]} is not cached in {self.cache_dir}, not on PATH "
+                f"and not in the Selenium Manager cache; pass --driver-path"
+            ) from error
+
+    def _resolve_selenium_manager(self, browser_name, offline=False):
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+        args = ["--browser", browser_name, "--cache-path", str(self.cache_dir / "selenium")]
+        if self.version:
+            args += ["--driver-version", self.version]
+        if offline:
+            args.append("--offline")
+        try:
+            path = SeleniumManager().binary_paths(args).get("driver_path")
+        except WebDriverException as error:
+            raise DriverResolutionError(str(error)) from error
+        if not path or not os.path.isfile(path):
+            raise DriverResolutionError(f"Selenium Manager could not resolve {DRIVER_NAMES[browser_name]}")
+        return path
+
+    def _resolve_webdriver_manager(self, browser_name):
+        from webdriver_manager.core.driver_cache import DriverCacheManager
+
+        cache_manager = DriverCacheManager(root_dir=str(self.cache_dir))
+        if browser_name == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            manager = ChromeDriverManager(driver_version=self.version, cache_manager=cache_manager)
+        else:
+            from webdriver_manager.firefox import GeckoDriverManager
+
+            manager = GeckoDriverManager(version=self.version, cache_manager=cache_manager)
+        return manager.install()
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as manifest_file:
+                return json.load(manifest_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.manifest_path.with_name(f"manifest.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,65 @@
+"""Генератор случайных сценариев перевода для дифференциального прогона"""
+
+import random
+from dataclasses import dataclass
+
+from oracle.transfer_rules import COMMISSION_PERCENT
+
+# Сколько сценариев в среднем приходится на одно состояние счёта (одну навигацию)
+CASES_PER_ACCOUNT = 50
+
+NON_NUMERIC_AMOUNTS = ("", "abc", "!@#", "12.34.56", "1 000", "1e3", "-", "٣٠")
+
+
+@dataclass(frozen=True, slots=True)
+class TransferCase:
+    """Сценарий: состояние счёта, номер карты и введённая сумма"""
+
+    balance: int
+    reserved: int
+    card_number: str
+    amount: str
+
+
+def generate_cases(count, seed=0):
+    """Генерация count воспроизводимых сценариев"""
+    rng = random.Random(seed)
+    accounts = [_account(rng) for _ in range(max(1, count // CASES_PER_ACCOUNT))]
+    cases = []
+    for index in range(count):
+        balance, reserved = accounts[index % len(accounts)]
+        cases.append(TransferCase(balance, reserved, _card_number(rng), _amount(rng, balance - reserved)))
+    return cases
+
+
+def _account(rng):
+    balance = rng.choice((rng.randint(1, 1000), rng.randint(1000, 100000), rng.randint(-1000, 0)))
+    reserved = rng.randint(0, max(abs(balance), 1))
+    return balance, reserved
+
+
+def _card_number(rng):
+    roll = rng.random()
+    if roll < 0.7:
+        digits = "".join(rng.choice("0123456789") for _ in range(16))
+        if rng.random() < 0.5:
+            return " ".join(digits[i:i + 4] for i in range(0, 16, 4))
+        return digits
+    if roll < 0.9:
+        length = rng.choice((0, 1, 4, 12, 15, 17, 18, 20))
+        return "".join(rng.choice("0123456789") for _ in range(length))
+    # Буквы и спецсимволы вместо части цифр
+    return "".join(rng.choice("0123456789abcxyz!@#") for _ in range(16))
+
+
+def _amount(rng, available_amount):
+    roll = rng.random()
+    if roll < 0.3:
+        # Граница: сумма + комиссия около доступной суммы
+        boundary = max(available_amount, 0) * 100 // (100 + COMMISSION_PERCENT)
+        return str(boundary + rng.randint(-2, 2))
+    if roll < 0.8:
+        return str(rng.randint(1, max(int(available_amount * 1.5), 10)))
+    if roll < 0.9:
+        return str(rng.choice((0, -1, -rng.randint(1, 100000))))
+    return rng.choice(NON_NUMERIC_AMOUNTS)
@@ -0,0 +1,65 @@
+"""Дифференциальный прогон: эталонная модель против реальной страницы"""
+
+from dataclasses import dataclass
+from itertools import groupby
+
+from oracle.transfer_rules import expected_state
+
+# Сколько вводов отправляется на страницу одним execute_async_script
+BATCH_SIZE = 100
+
+
+@dataclass(frozen=True, slots=True)
+class Mismatch:
+    """Расхождение страницы с моделью по одному сценарию"""
+
+    case: object
+    field: str
+    expected: object
+    actual: object
+
+    def __str__(self):
+        case = self.case
+        return (
+            f"balance={case.balance} reserved={case.reserved} card={case.card_number!r} "
+            f"amount={case.amount!r}: {self.field} expected {self.expected!r}, got {self.actual!r}"
+        )
+
+
+def run_differential(page, cases, batch_size=BATCH_SIZE):
+    """Прогон сценариев на странице пачками; одна навигация на состояние счёта"""
+    mismatches = []
+    ordered = sorted(cases, key=lambda case: (case.balance, case.reserved))
+    for (balance, reserved), account_cases in groupby(ordered, key=lambda case: (case.balance, case.reserved)):
+        account_cases = list(account_cases)
+        page.open_prefilled(balance=balance, reserved=reserved)
+        for start in range(0, len(account_cases), batch_size):
+            batch = account_cases[start:start + batch_size]
+            outcomes = page.evaluate_transfers([(case.card_number, case.amount) for case in batch])
+            for case, outcome in zip(batch, outcomes):
+                mismatches.extend(compare(case, outcome))
+    return mismatches
+
+
+def compare(case, outcome):
+    """Сравнение состояния страницы с ожиданием модели"""
+    expected = expected_state(case.balance, case.reserved, case.card_number, case.amount)
+    actual = {
+        "transfer_amount_field_visible": outcome["transfer_amount_field_visible"],
+        "commission": _parse_commission(outcome["commission_text"]),
+        "insufficient_funds": outcome["insufficient_funds_visible"],
+        "transfer_allowed": outcome["transfer_button_enabled"],
+    }
+    mismatches = []
+    for field, actual_value in actual.items():
+        expected_value = getattr(expected, field)
+        if expected_value is not None and expected_value != actual_value:
+            mismatches.append(Mismatch(case, field, expected_value, actual_value))
+    return mismatches
+
+
+def _parse_commission(text):
+    try:
+        return int(text.replace("'", ""))
+    except ValueError:
+        return None
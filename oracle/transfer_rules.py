@@ -0,0 +1,72 @@
+"""Эталонная модель бизнес-правил рублёвого перевода (по test_cases.md)"""
+
+import re
+from dataclasses import dataclass
+
+COMMISSION_PERCENT = 10
+CARD_NUMBER_LENGTH = 16
+
+_AMOUNT_PATTERN = re.compile(r"-?[0-9]+")
+
+
+@dataclass(frozen=True, slots=True)
+class ExpectedState:
+    """Ожидаемое состояние формы; None означает "не проверяется\""""
+
+    transfer_amount_field_visible: bool
+    commission: int | None
+    insufficient_funds: bool | None
+    transfer_allowed: bool
+
+
+def commission(amount):
+    """Комиссия за перевод: 10% от суммы"""
+    return amount * COMMISSION_PERCENT // 100
+
+
+def available(balance, reserved):
+    """Доступная для перевода сумма"""
+    return balance - reserved
+
+
+def is_card_number_valid(card_number):
+    """Номер карты - ровно 16 цифр (пробелы между группами допустимы)"""
+    digits = card_number.replace(" ", "")
+    return len(digits) == CARD_NUMBER_LENGTH and digits.isdigit()
+
+
+def parse_amount(text):
+    """Разбор суммы перевода; None для нечисловых значений"""
+    if _AMOUNT_PATTERN.fullmatch(text.strip()) is None:
+        return None
+    return int(text)
+
+
+def expected_state(balance, reserved, card_number, amount_text):
+    """Ожидаемое состояние формы после ввода карты и суммы"""
+    if not is_card_number_valid(card_number):
+        return ExpectedState(
+            transfer_amount_field_visible=False,
+            commission=None,
+            insufficient_funds=None,
+            transfer_allowed=False,
+        )
+
+    amount = parse_amount(amount_text)
+    if amount is None or amount <= 0:
+        # Нулевые, отрицательные и нечисловые суммы отклоняются
+        return ExpectedState(
+            transfer_amount_field_visible=True,
+            commission=None,
+            insufficient_funds=None,
+            transfer_allowed=False,
+        )
+
+    fee = commission(amount)
+    insufficient = amount + fee > available(balance, reserved)
+    return ExpectedState(
+        transfer_amount_field_visible=True,
+        commission=fee,
+        insufficient_funds=insufficient,
+        transfer_allowed=not insufficient,
+    )
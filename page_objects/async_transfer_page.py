@@ -0,0 +1,180 @@
+"""Асинхронный вариант TransferPage и прогон переборов во многих сессиях одного event loop"""
+
+import asyncio
+
+from selenium.common.exceptions import TimeoutException
+
+from page_objects import scripts
+from page_objects.locators import TransferPageLocators
+from page_objects.prompts import Prompt
+from page_objects.snapshot import SNAPSHOT_CANDIDATES, TransferPageSnapshot
+from page_objects.transfer_page import TransferPage
+
+
+class AsyncTransferPage(TransferPageLocators):
+    """Page Object страницы переводов поверх drivers.async_client.AsyncWebDriver
+    или вкладки в пользовательском контексте (drivers.bidi_client.ContextDriver).
+
+    Локаторы (page_objects.locators) и скрипты те же, что у TransferPage.
+    Каждое действие - один скрипт, поэтому ввод всегда идёт через
+    FILL_INPUT, без посимвольного send_keys; окна alert перехватываются
+    на странице.
+    """
+
+    QUIET_PERIOD_MS = TransferPage.QUIET_PERIOD_MS
+
+    def __init__(self, driver, base_url=TransferPage.DEFAULT_BASE_URL):
+        self.driver = driver
+        self.base_url = base_url.rstrip("/")
+
+    async def _locate(self, locator, timeout=5):
+        # [элемент, номер стратегии] или None, как только DOM устоялся
+        return await self.driver.execute_async_script(
+            scripts.LOCATE_WHEN_QUIET, locator.candidates, self.QUIET_PERIOD_MS, int(timeout * 1000)
+        )
+
+    async def open_page(self, balance=30000, reserved=20000):
+        """Открытие страницы с заданными параметрами баланса"""
+        await self.driver.get(f"{self.base_url}/?balance={balance}&reserved={reserved}")
+        if await self._locate(self.APP_RENDERED) is None:
+            raise TimeoutException("The app did not render")
+        await self.driver.execute_script(scripts.INSTALL_PROMPT_HOOK)
+        return self
+
+    async def open_prefilled(self, balance=30000, reserved=20000, currency="rub", card=None, amount=None):
+        """Открытие страницы сразу в нужном состоянии формы (см. TransferPage.open_prefilled)"""
+        if currency not in self.CURRENCY_BLOCKS:
+            raise ValueError(f"Unsupported currency: {currency}")
+        if amount is not None and card is None:
+            raise ValueError("Transfer amount can only be prefilled together with a card number")
+
+        await self.driver.get(f"{self.base_url}/?balance={balance}&reserved={reserved}")
+        await self.driver.execute_script(scripts.INSTALL_PROMPT_HOOK)
+        error = await self.driver.execute_async_script(
+            scripts.PREFILL_FORM,
+            self.CURRENCY_BLOCKS[currency].candidates,
+            self.CARD_NUMBER_FIELD.candidates,
+            self.TRANSFER_AMOUNT_FIELD.candidates,
+            card,
+            None if amount is None else str(amount),
+            5000,
+        )
+        if error:
+            raise RuntimeError(f"Could not prefill transfer form: {error}")
+        return self
+
+    async def _click(self, locator):
+        match = await self._locate(locator)
+        if match is None:
+            raise TimeoutException(f"Could not click {locator!r}: element not found")
+        await match[0].click()
+        return self
+
+    async def click_rubles_block(self):
+        """Клик по блоку 'Рубли'"""
+        return await self._click(self.RUBLES_BLOCK)
+
+    async def click_dollars_block(self):
+        """Клик по блоку 'Доллары'"""
+        return await self._click(self.DOLLARS_BLOCK)
+
+    async def click_euros_block(self):
+        """Клик по блоку 'Евро'"""
+        return await self._click(self.EUROS_BLOCK)
+
+    async def click_transfer_button(self):
+        """Клик по кнопке 'Перевести'"""
+        return await self._click(self.TRANSFER_BUTTON)
+
+    async def _fill(self, locator, value):
+        error = await self.driver.execute_async_script(scripts.FILL_INPUT, locator.candidates, value, 5000)
+        if error:
+            raise TimeoutException(f"Could not fill {locator!r}: {error}")
+        return self
+
+    async def enter_card_number(self, card_number):
+        """Ввод номера карты"""
+        return await self._fill(self.CARD_NUMBER_FIELD, card_number)
+
+    async def enter_transfer_amount(self, amount):
+        """Ввод суммы перевода"""
+        return await self._fill(self.TRANSFER_AMOUNT_FIELD, str(amount))
+
+    async def is_element_present(self, locator, timeout=5):
+        """Проверка наличия элемента в устоявшемся DOM без ожидания таймаута"""
+        return await self._locate(locator, timeout) is not None
+
+    async def is_transfer_amount_field_visible(self):
+        """Проверка видимости поля суммы перевода"""
+        return await self.is_element_present(self.TRANSFER_AMOUNT_FIELD)
+
+    async def is_transfer_button_enabled(self):
+        """Проверка активности кнопки перевода"""
+        match = await self._locate(self.TRANSFER_BUTTON)
+        return match is not None and await match[0].is_enabled()
+
+    async def assert_stays_absent(self, locator, duration=0.3):
+        """Проверка, что элемент не появляется в течение duration секунд"""
+        await self.driver.execute_async_script(scripts.WAIT_FOR_QUIESCENCE, self.QUIET_PERIOD_MS, 5000)
+        appeared = await self.driver.execute_async_script(
+            scripts.WATCH_FOR_APPEARANCE, locator.candidates, int(duration * 1000)
+        )
+        assert not appeared, f"Element {locator} appeared within {duration}s"
+        return self
+
+    async def get_commission_text(self):
+        """Получение текста комиссии"""
+        return await self.driver.execute_script(scripts.ELEMENT_TEXT, self.COMMISSION_TEXT.candidates)
+
+    async def get_error_message(self):
+        """Получение текста ошибки"""
+        return await self.driver.execute_script(scripts.ELEMENT_TEXT, self.ERROR_MESSAGE.candidates)
+
+    async def snapshot(self):
+        """Чтение всего состояния формы за один запрос к браузеру"""
+        state = await self.driver.execute_async_script(
+            scripts.READ_SNAPSHOT,
+            SNAPSHOT_CANDIDATES,
+            self.QUIET_PERIOD_MS,
+            5000,
+        )
+        return TransferPageSnapshot(**state)
+
+    async def handle_alert(self, timeout=10):
+        """Следующее окно alert/confirm/prompt; None, если за timeout секунд его не было"""
+        prompt = await self.driver.execute_async_script(scripts.TAKE_PROMPT, int(timeout * 1000))
+        if not prompt:
+            return None
+        return Prompt(prompt["type"], prompt["message"])
+
+
+async def run_sweep(browser, base_url, cases, check, concurrency=8, contexts=False):
+    """Проверка check(page, case) для каждого кейса, не больше concurrency одновременно.
+
+    contexts=False - сессии браузера открываются по мере надобности, не больше
+    concurrency, и переходят от кейса к кейсу. contexts=True - каждый кейс
+    получает свою вкладку в новом пользовательском контексте одного браузера,
+    которая удаляется после проверки. Возвращает [(кейс, исключение)] упавших кейсов.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    idle = []
+
+    async def run(case):
+        async with limit:
+            if contexts:
+                page = AsyncTransferPage(await browser.new_context(), base_url)
+            else:
+                page = idle.pop() if idle else AsyncTransferPage(await browser.new_session(), base_url)
+            try:
+                await check(page, case)
+                return None
+            except Exception as exc:
+                return case, exc
+            finally:
+                if contexts:
+                    await page.driver.quit()
+                else:
+                    idle.append(page)
+
+    results = await asyncio.gather(*(run(case) for case in cases))
+    return [result for result in results if result is not None]
@@ -0,0 +1,168 @@
+"""Локаторы со списком стратегий и кеш найденных элементов"""
+
+from collections import Counter
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from page_objects import scripts
+
+
+class By:
+    """Стратегии поиска W3C - те же строки, что у selenium.webdriver.common.by.By.
+
+    Импорт selenium.webdriver загружает модули всех браузеров, а локаторы
+    нужны уже при сборе тестов, в том числе без браузера.
+    """
+
+    ID = "id"
+    XPATH = "xpath"
+    CSS_SELECTOR = "css selector"
+    CLASS_NAME = "class name"
+
+
+class Locator(tuple):
+    """Логический элемент страницы: стратегии поиска от быстрой (ID/CSS) к запасной (XPath).
+
+    Как кортеж совпадает с основной стратегией, поэтому по-прежнему
+    подходит для driver.find_element(*locator). candidates - готовый
+    к передаче в скрипт список [[by, value], ...].
+    """
+
+    def __new__(cls, name, *strategies):
+        locator = super().__new__(cls, strategies[0])
+        locator.name = name
+        locator.strategies = strategies
+        locator.candidates = [list(strategy) for strategy in strategies]
+        return locator
+
+    def __repr__(self):
+        return f"Locator({self.name!r}, {', '.join(map(repr, self.strategies))})"
+
+
+class TransferPageLocators:
+    """Локаторы страницы переводов: сначала ID/CSS, XPath - запасная стратегия.
+
+    Общие для TransferPage и AsyncTransferPage.
+    """
+
+    RUBLES_BLOCK = Locator(
+        "rubles_block",
+        (By.CSS_SELECTOR, "div[role='button']:has(#rub-sum)"),
+        (By.XPATH, "(//div[@role='button'])[1]"),
+    )
+    DOLLARS_BLOCK = Locator(
+        "dollars_block",
+        (By.CSS_SELECTOR, "div[role='button']:has(#usd-sum)"),
+        (By.XPATH, "(//div[@role='button'])[2]"),
+    )
+    EUROS_BLOCK = Locator(
+        "euros_block",
+        (By.CSS_SELECTOR, "div[role='button']:has(#euro-sum)"),
+        (By.XPATH, "(//div[@role='button'])[3]"),
+    )
+
+    CARD_NUMBER_FIELD = Locator(
+        "card_number_field",
+        (By.CSS_SELECTOR, "input[placeholder='0000 0000 0000 0000']"),
+        (By.XPATH, "//h3[contains(text(),'Номер карты')]/following-sibling::input[@type='text']"),
+    )
+    TRANSFER_AMOUNT_FIELD = Locator(
+        "transfer_amount_field",
+        (By.CSS_SELECTOR, "input[placeholder='1000']"),
+        (By.XPATH, "//h3[contains(text(),'Сумма перевода')]/following-sibling::input[@type='text']"),
+    )
+
+    TRANSFER_BUTTON = Locator(
+        "transfer_button",
+        (By.CSS_SELECTOR, "p:has(> #comission) ~ button"),
+        (By.XPATH, "//button[.//span[text()='Перевести']]"),
+    )
+
+    COMMISSION_TEXT = Locator("commission", (By.ID, "comission"))
+    ERROR_MESSAGE = Locator(
+        "error_message",
+        (By.CSS_SELECTOR, "span[style*='color: red']"),
+        (By.XPATH, "//span[@style='font-size: 15px; color: red;']"),
+    )
+    INSUFFICIENT_FUNDS_MESSAGE = Locator(
+        "insufficient_funds_message",
+        (By.CSS_SELECTOR, "p:has(> #comission) ~ span[style*='color: red']"),
+        (By.XPATH, "//*[contains(text(), 'Недостаточно средств')]"),
+    )
+
+    BALANCE_TEXT = Locator("balance", (By.ID, "rub-sum"))
+    RESERVED_TEXT = Locator("reserved", (By.ID, "rub-reserved"))
+
+    CONFIRM_DIALOG = Locator("confirm_dialog", (By.CSS_SELECTOR, ".confirm-dialog"), (By.CLASS_NAME, "confirm-dialog"))
+
+    # Блоки счетов по метке валюты в приложении
+    CURRENCY_BLOCKS = {
+        "rub": RUBLES_BLOCK,
+        "usd": DOLLARS_BLOCK,
+        "euro": EUROS_BLOCK,
+    }
+
+    # Признак того, что React отрисовал приложение
+    APP_RENDERED = Locator("app_rendered", (By.CSS_SELECTOR, "#root > *"))
+
+
+def as_locator(locator):
+    """Locator из обычного кортежа (by, value)"""
+    if isinstance(locator, Locator):
+        return locator
+    return Locator(f"{locator[0]}={locator[1]}", tuple(locator))
+
+
+class ElementCache:
+    """Найденные элементы текущего состояния страницы.
+
+    Элемент ищется одним скриптом по всем стратегиям сразу и дальше
+    берётся из кеша; устаревший элемент (StaleElementReferenceException)
+    ищется заново. matches считает, какая стратегия сработала для какого элемента.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._elements = {}
+        self.matches = Counter()
+
+    def invalidate(self, locator=None):
+        """Сброс кеша: целиком (смена состояния страницы) или для одного элемента"""
+        if locator is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(as_locator(locator).name, None)
+
+    def remember(self, locator, match):
+        """Учёт результата поиска [элемент, номер стратегии] или None"""
+        locator = as_locator(locator)
+        if match is None:
+            self._elements.pop(locator.name, None)
+            return None
+        element, index = match
+        self._elements[locator.name] = element
+        self.matches[locator.name, locator.strategies[index][0]] += 1
+        return element
+
+    def locate(self, locator):
+        """Поиск элемента в DOM мимо кеша; None, если его нет"""
+        locator = as_locator(locator)
+        return self.remember(locator, self.driver.execute_script(scripts.LOCATE, locator.candidates))
+
+    def find(self, locator):
+        """Элемент из кеша или из DOM"""
+        locator = as_locator(locator)
+        element = self._elements.get(locator.name)
+        if element is None:
+            element = self.locate(locator)
+        if element is None:
+            raise NoSuchElementException(f"Unable to locate {locator!r}")
+        return element
+
+    def call(self, locator, action):
+        """Действие над элементом; устаревший элемент ищется заново один раз"""
+        try:
+            return action(self.find(locator))
+        except StaleElementReferenceException:
+            self.invalidate(locator)
+            return action(self.find(locator))
@@ -0,0 +1,113 @@
+"""Окна alert/confirm/prompt по событиям, без опроса"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from selenium.common.exceptions import NoAlertPresentException
+
+from page_objects import scripts
+
+
+@dataclass(frozen=True, slots=True)
+class Prompt:
+    """Окно, открытое страницей"""
+
+    type: str
+    message: str
+
+
+def prompt_monitor(driver):
+    """Наблюдатель за окнами драйвера: через WebDriver BiDi, если сессия его поддерживает,
+    иначе через перехват window.alert/confirm/prompt на странице.
+
+    Наблюдатель один на драйвер: подписка BiDi переживает тесты, которые берут драйвер из пула.
+    """
+    monitor = getattr(driver, "_prompt_monitor", None)
+    if monitor is None:
+        capabilities = getattr(driver, "capabilities", {})
+        if isinstance(capabilities.get("webSocketUrl"), str):
+            monitor = BidiPromptMonitor(driver)
+        else:
+            monitor = HookPromptMonitor(driver)
+        driver._prompt_monitor = monitor
+    return monitor
+
+
+class HookPromptMonitor:
+    """Окна из очереди, которую ведёт перехватчик на странице"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def install(self):
+        """Установка перехватчика; после каждой навигации"""
+        self.driver.execute_script(scripts.INSTALL_PROMPT_HOOK)
+
+    def pending(self):
+        """Окна, открытые и ещё не обработанные"""
+        prompts = self.driver.execute_script(scripts.PEEK_PROMPTS)
+        if prompts is None:
+            alert = self._native_alert(accept=False)
+            return [] if alert is None else [alert]
+        return [Prompt(prompt["type"], prompt["message"]) for prompt in prompts]
+
+    def wait(self, timeout=0):
+        """Следующее окно; None, если за timeout секунд его не было.
+
+        Перехваченное окно уже закрыто: alert и confirm подтверждены.
+        """
+        prompt = self.driver.execute_async_script(scripts.TAKE_PROMPT, int(timeout * 1000))
+        if prompt is False:
+            # Страница открыта в обход Page Object, перехватчика нет
+            return self._native_alert(accept=True)
+        return None if prompt is None else Prompt(prompt["type"], prompt["message"])
+
+    def _native_alert(self, accept):
+        try:
+            alert = self.driver.switch_to.alert
+            prompt = Prompt("alert", alert.text)
+        except NoAlertPresentException:
+            return None
+        if accept:
+            alert.accept()
+        return prompt
+
+
+class BidiPromptMonitor:
+    """Окна из событий browsingContext.userPromptOpened"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._opened = deque()
+        self._condition = threading.Condition()
+        driver.browsing_context.add_event_handler("user_prompt_opened", self._on_opened)
+
+    def _on_opened(self, params):
+        # Вызывается из потока websocket-соединения
+        with self._condition:
+            self._opened.append(params)
+            self._condition.notify_all()
+
+    def _sync(self):
+        # Ответ на команду BiDi приходит после событий, отправленных до неё:
+        # окно, открытое предыдущей командой, к этому моменту уже в очереди
+        self.driver.browsing_context.get_tree(max_depth=0)
+
+    def install(self):
+        with self._condition:
+            self._opened.clear()
+
+    def pending(self):
+        self._sync()
+        with self._condition:
+            return [Prompt(params.type, params.message) for params in self._opened]
+
+    def wait(self, timeout=0):
+        self._sync()
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._opened, timeout):
+                return None
+            params = self._opened.popleft()
+        self.driver.browsing_context.handle_user_prompt(params.context, accept=True)
+        return Prompt(params.type, params.message)
@@ -0,0 +1,343 @@
+"""JavaScript, выполняемый на странице через execute_script / execute_async_script"""
+
+# Поиск элемента по локатору - списку стратегий Selenium [[by, value], ...].
+# Стратегии проверяются по порядку, locate возвращает [элемент, номер стратегии] или null
+FIND_ELEMENT = """
+function findBy(by, value) {
+    switch (by) {
+        case "id":
+            return document.getElementById(value);
+        case "css selector":
+            return document.querySelector(value);
+        case "class name":
+            return document.getElementsByClassName(value)[0] || null;
+        case "xpath":
+            return document.evaluate(
+                value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+function locate(candidates) {
+    for (let index = 0; index < candidates.length; index++) {
+        let found = null;
+        try {
+            found = findBy(candidates[index][0], candidates[index][1]);
+        } catch (error) {
+            // Селектор, который браузер не поддерживает (например, :has), уступает запасной стратегии
+            if (!(error instanceof DOMException)) {
+                throw error;
+            }
+        }
+        if (found) {
+            return [found, index];
+        }
+    }
+    return null;
+}
+function findElement(candidates) {
+    const match = locate(candidates);
+    return match ? match[0] : null;
+}
+"""
+
+# Поиск элемента одним вызовом по всем стратегиям локатора
+LOCATE = FIND_ELEMENT + """
+return locate(arguments[0]);
+"""
+
+# Промис, который разрешается, когда DOM не менялся в течение quietMs.
+# Разрешается значением false, если за timeoutMs DOM так и не успокоился.
+WHEN_QUIET = """
+function whenQuiet(quietMs, timeoutMs) {
+    return new Promise((resolve) => {
+        let quietTimer = null;
+        let guardTimer = null;
+        const observer = new MutationObserver(() => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(() => finish(true), quietMs);
+        });
+        function finish(settled) {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(guardTimer);
+            resolve(settled);
+        }
+        observer.observe(document.documentElement, {
+            childList: true, subtree: true, attributes: true, characterData: true
+        });
+        quietTimer = setTimeout(() => finish(true), quietMs);
+        guardTimer = setTimeout(() => finish(false), timeoutMs);
+    });
+}
+"""
+
+# Видимый текст элемента за один вызов; пустая строка, если элемента нет
+ELEMENT_TEXT = FIND_ELEMENT + """
+const found = findElement(arguments[0]);
+return found ? found.innerText : "";
+"""
+
+# Ожидание, пока DOM перестанет меняться в течение quietMs
+WAIT_FOR_QUIESCENCE = WHEN_QUIET + """
+const [quietMs, timeoutMs, done] = arguments;
+whenQuiet(quietMs, timeoutMs).then(done);
+"""
+
+# Поиск элемента, как только DOM устоялся: [элемент, номер стратегии] или null
+LOCATE_WHEN_QUIET = FIND_ELEMENT + WHEN_QUIET + """
+const [candidates, quietMs, timeoutMs, done] = arguments;
+whenQuiet(quietMs, timeoutMs).then(() => done(locate(candidates)));
+"""
+
+# Наблюдение за DOM в течение durationMs: true, если элемент появился хотя бы раз
+WATCH_FOR_APPEARANCE = FIND_ELEMENT + """
+const [candidates, durationMs, done] = arguments;
+if (findElement(candidates)) {
+    done(true);
+    return;
+}
+const observer = new MutationObserver(() => {
+    if (findElement(candidates)) {
+        finish(true);
+    }
+});
+const timer = setTimeout(() => finish(false), durationMs);
+let finished = false;
+function finish(appeared) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(appeared);
+}
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+"""
+
+# Установка значения поля так, как это делает пользователь: через нативный
+# сеттер value (минуя трекер значений React) и событие input, на которое
+# подписан onChange
+SET_INPUT_VALUE = """
+function setInputValue(input, value) {
+    const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+    setter.call(input, value);
+    input.dispatchEvent(new Event("input", { bubbles: true }));
+}
+"""
+
+# Ожидание появления элемента после перерисовки без опроса через WebDriver
+WAIT_FOR_ELEMENT = """
+function waitForElement(candidates, timeoutMs) {
+    return new Promise((resolve, reject) => {
+        const found = findElement(candidates);
+        if (found) {
+            resolve(found);
+            return;
+        }
+        const observer = new MutationObserver(() => {
+            const element = findElement(candidates);
+            if (element) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(element);
+            }
+        });
+        const timer = setTimeout(() => {
+            observer.disconnect();
+            reject(new Error("Element not found: " + JSON.stringify(candidates)));
+        }, timeoutMs);
+        observer.observe(document.documentElement, { childList: true, subtree: true });
+    });
+}
+"""
+
+# Перевод формы в целевое состояние одним вызовом: выбор счёта, номер карты, сумма.
+# Возвращает null при успехе или текст ошибки.
+PREFILL_FORM = FIND_ELEMENT + SET_INPUT_VALUE + WAIT_FOR_ELEMENT + """
+const [block, cardField, amountField, card, amount, timeoutMs, done] = arguments;
+(async () => {
+    (await waitForElement(block, timeoutMs)).click();
+    if (card !== null) {
+        setInputValue(await waitForElement(cardField, timeoutMs), card);
+        if (amount !== null) {
+            setInputValue(await waitForElement(amountField, timeoutMs), amount);
+        }
+    }
+})().then(() => done(null), (error) => done(String(error)));
+"""
+
+# Чтение всего состояния формы за один вызов после того, как DOM устоялся
+READ_SNAPSHOT = FIND_ELEMENT + WHEN_QUIET + """
+const [locators, quietMs, timeoutMs, done] = arguments;
+function element(name) {
+    return findElement(locators[name]);
+}
+function text(name) {
+    const found = element(name);
+    return found ? found.innerText : "";
+}
+whenQuiet(quietMs, timeoutMs).then(() => {
+    const card = element("card_number_field");
+    const amount = element("transfer_amount_field");
+    const button = element("transfer_button");
+    done({
+        balance_text: text("balance"),
+        reserved_text: text("reserved"),
+        card_number_field_visible: card !== null,
+        card_number_value: card ? card.value : "",
+        card_number_field_focused: card !== null && card === document.activeElement,
+        transfer_amount_field_visible: amount !== null,
+        transfer_amount_value: amount ? amount.value : "",
+        commission_text: text("commission"),
+        error_message: text("error_message"),
+        insufficient_funds_visible: element("insufficient_funds_message") !== null,
+        transfer_button_visible: button !== null,
+        transfer_button_enabled: button !== null && !button.disabled,
+        confirm_dialog_visible: element("confirm_dialog") !== null,
+    });
+});
+"""
+
+# Прогон пачки вводов (номер карты, сумма) на уже открытой форме.
+# Для каждого ввода возвращается видимое состояние формы.
+EVALUATE_TRANSFERS = FIND_ELEMENT + SET_INPUT_VALUE + """
+const [locators, inputs, done] = arguments;
+const nextTick = () => new Promise((resolve) => setTimeout(resolve, 0));
+function element(name) {
+    return findElement(locators[name]);
+}
+(async () => {
+    const results = [];
+    for (const [card, amount] of inputs) {
+        // Пустой номер скрывает блок суммы, сбрасывая форму перед новым вводом
+        setInputValue(element("card_number_field"), "");
+        await nextTick();
+        setInputValue(element("card_number_field"), card);
+        await nextTick();
+        const amountField = element("transfer_amount_field");
+        if (amountField !== null) {
+            // Сначала пустое значение: иначе сумма, равная значению по умолчанию, не вызовет onChange
+            setInputValue(amountField, "");
+            setInputValue(amountField, amount);
+            await nextTick();
+        }
+        const commission = element("commission");
+        const button = element("transfer_button");
+        results.push({
+            transfer_amount_field_visible: amountField !== null,
+            commission_text: commission ? commission.innerText : "",
+            insufficient_funds_visible: element("insufficient_funds_message") !== null,
+            transfer_button_enabled: button !== null && !button.disabled,
+        });
+    }
+    return results;
+})().then(done, (error) => done(String(error)));
+"""
+
+# Перехват alert/confirm/prompt: окно не открывается, а попадает в очередь
+# window.__prompts; ожидающие скрипты узнают о нём сразу, без опроса
+INSTALL_PROMPT_HOOK = """
+if (!window.__prompts) {
+    window.__prompts = [];
+    window.__promptWaiters = [];
+    for (const type of ["alert", "confirm", "prompt"]) {
+        window[type] = (message, defaultValue) => {
+            window.__prompts.push({ type, message: message === undefined ? "" : String(message) });
+            window.__promptWaiters.splice(0).forEach((notify) => notify());
+            if (type === "confirm") {
+                return true;
+            }
+            return type === "prompt" ? (defaultValue === undefined ? "" : String(defaultValue)) : undefined;
+        };
+    }
+}
+"""
+
+# Следующее окно из очереди: сразу, если оно уже было, иначе по событию в течение timeoutMs.
+# null - окна не было; false - перехват на странице не установлен
+TAKE_PROMPT = """
+const [timeoutMs, done] = arguments;
+const queue = window.__prompts;
+if (!queue) {
+    done(false);
+} else if (queue.length > 0 || timeoutMs <= 0) {
+    done(queue.length > 0 ? queue.shift() : null);
+} else {
+    const notify = () => {
+        clearTimeout(timer);
+        done(queue.shift());
+    };
+    const timer = setTimeout(() => {
+        window.__promptWaiters.splice(window.__promptWaiters.indexOf(notify), 1);
+        done(null);
+    }, timeoutMs);
+    window.__promptWaiters.push(notify);
+}
+"""
+
+# Окна в очереди без их извлечения; null - перехват не установлен
+PEEK_PROMPTS = """
+return window.__prompts ? window.__prompts.slice() : null;
+"""
+
+# Ввод значения в поле одним вызовом вместо clear() и send_keys() по символу.
+# Сначала пустое значение, как после clear(): иначе совпадающее значение не вызовет onChange
+FILL_INPUT = FIND_ELEMENT + SET_INPUT_VALUE + WAIT_FOR_ELEMENT + """
+const [field, value, timeoutMs, done] = arguments;
+(async () => {
+    const input = await waitForElement(field, timeoutMs);
+    input.focus();
+    setInputValue(input, "");
+    setInputValue(input, value);
+    input.dispatchEvent(new Event("change", { bubbles: true }));
+})().then(() => done(null), (error) => done(String(error)));
+"""
+
+# Новое состояние приложения без перезагрузки страницы: react-router приложения следит за popstate.
+# Переход на маршрут без страницы размонтирует форму, возврат на "/" с новыми параметрами
+# монтирует её заново с чистым состоянием. true - готово; false - открыто не приложение
+SOFT_RESET = """
+const [appUrl, targetUrl, timeoutMs, done] = arguments;
+const root = document.getElementById("root");
+if (!location.href.startsWith(appUrl + "/") || !root || !root.firstElementChild) {
+    done(false);
+    return;
+}
+function navigate(url) {
+    history.pushState(null, "", url);
+    window.dispatchEvent(new PopStateEvent("popstate", { state: null }));
+}
+function waitForRoot(rendered) {
+    return new Promise((resolve, reject) => {
+        if (Boolean(root.firstElementChild) === rendered) {
+            resolve();
+            return;
+        }
+        const observer = new MutationObserver(() => {
+            if (Boolean(root.firstElementChild) === rendered) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve();
+            }
+        });
+        const timer = setTimeout(() => {
+            observer.disconnect();
+            reject(new Error(rendered ? "App did not render" : "App did not unmount"));
+        }, timeoutMs);
+        observer.observe(root, { childList: true });
+    });
+}
+if (window.__prompts) {
+    window.__prompts.length = 0;
+}
+(async () => {
+    navigate(appUrl + "/__reset__");
+    await waitForRoot(false);
+    navigate(targetUrl);
+    await waitForRoot(true);
+})().then(() => done(true), (error) => done(String(error)));
+"""
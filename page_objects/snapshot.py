@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+from page_objects.locators import TransferPageLocators
+
+# Элементы, которые scripts.READ_SNAPSHOT читает по имени
+SNAPSHOT_LOCATORS = {
+    "balance": TransferPageLocators.BALANCE_TEXT,
+    "reserved": TransferPageLocators.RESERVED_TEXT,
+    "card_number_field": TransferPageLocators.CARD_NUMBER_FIELD,
+    "transfer_amount_field": TransferPageLocators.TRANSFER_AMOUNT_FIELD,
+    "commission": TransferPageLocators.COMMISSION_TEXT,
+    "error_message": TransferPageLocators.ERROR_MESSAGE,
+    "insufficient_funds_message": TransferPageLocators.INSUFFICIENT_FUNDS_MESSAGE,
+    "transfer_button": TransferPageLocators.TRANSFER_BUTTON,
+    "confirm_dialog": TransferPageLocators.CONFIRM_DIALOG,
+}
+
+SNAPSHOT_CANDIDATES = {name: locator.candidates for name, locator in SNAPSHOT_LOCATORS.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class TransferPageSnapshot:
+    """Состояние страницы переводов, прочитанное за один вызов execute_script"""
+
+    balance_text: str
+    reserved_text: str
+    card_number_field_visible: bool
+    card_number_value: str
+    card_number_field_focused: bool
+    transfer_amount_field_visible: bool
+    transfer_amount_value: str
+    commission_text: str
+    error_message: str
+    insufficient_funds_visible: bool
+    transfer_button_visible: bool
+    transfer_button_enabled: bool
+    confirm_dialog_visible: bool
@@ -1,212 +1,293 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from page_objects import scripts
+from page_objects.locators import ElementCache, TransferPageLocators, as_locator
+from page_objects.prompts import prompt_monitor
+from page_objects.snapshot import SNAPSHOT_CANDIDATES, TransferPageSnapshot
 import time
 
-class TransferPage:
+class TransferPage(TransferPageLocators):
     """Page Object для страницы переводов"""
     
-    # Локаторы
-    RUBLES_BLOCK = (By.XPATH, "(//div[@role='button'])[1]")
-    DOLLARS_BLOCK = (By.XPATH, "(//div[@role='button'])[2]")
-    EUROS_BLOCK = (By.XPATH, "(//div[@role='button'])[3]")
+    # DOM считается устоявшимся, если не менялся столько миллисекунд
+    QUIET_PERIOD_MS = 50
     
-    CARD_NUMBER_FIELD = (By.XPATH, "//h3[contains(text(),'Номер карты')]/following-sibling::input[@type='text']")
-    TRANSFER_AMOUNT_FIELD = (By.XPATH, "//h3[contains(text(),'Сумма перевода')]/following-sibling::input[@type='text']")
+    DEFAULT_BASE_URL = "http://localhost:8000"
     
-    TRANSFER_BUTTON = (By.XPATH, "//button[.//span[text()='Перевести']]")
-    
-    COMMISSION_TEXT = (By.ID, "comission")
-    ERROR_MESSAGE = (By.XPATH, "//span[@style='font-size: 15px; color: red;']")
-    INSUFFICIENT_FUNDS_MESSAGE = (By.XPATH, "//*[contains(text(), 'Недостаточно средств')]")
-    
-    BALANCE_TEXT = (By.ID, "rub-sum")
-    RESERVED_TEXT = (By.ID, "rub-reserved")
-    
-    CONFIRM_DIALOG = (By.CLASS_NAME, "confirm-dialog")
-    
-    def __init__(self, driver):
+    def __init__(self, driver, base_url=DEFAULT_BASE_URL, fast_input=False, soft_reset=False):
+        # Ожидания Selenium нужны только рядом с живым драйвером: модуль не тянет selenium.webdriver при сборе тестов
+        from selenium.webdriver.support.ui import WebDriverWait
         self.driver = driver
-        self.wait = WebDriverWait(driver, 5)
+        self.base_url = base_url.rstrip("/")
+        # Ввод значений одним скриптом вместо посимвольного send_keys
+        self.fast_input = fast_input
+        # Новое состояние через history API, если браузер уже на приложении
+        self.soft_reset = soft_reset
+        self.wait = WebDriverWait(driver, 5, ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
+        self.elements = ElementCache(driver)
+        self.prompts = prompt_monitor(driver)
+
+    def wait_for_dom_quiescence(self, timeout=5):
+        """Ожидание, пока приложение закончит перерисовку DOM"""
+        return self.driver.execute_async_script(
+            scripts.WAIT_FOR_QUIESCENCE, self.QUIET_PERIOD_MS, int(timeout * 1000)
+        )
+
+    def _wait_for(self, locator, clickable=False):
+        """Ожидание элемента через кеш локаторов; устаревший элемент ищется заново"""
+        def ready(driver):
+            try:
+                element = self.elements.find(locator)
+                if clickable and not (element.is_displayed() and element.is_enabled()):
+                    return False
+                return element
+            except StaleElementReferenceException:
+                self.elements.invalidate(locator)
+                return False
+        return self.wait.until(ready)
+
+    def is_element_present(self, locator, timeout=5):
+        """Проверка наличия элемента в устоявшемся DOM без ожидания таймаута"""
+        locator = as_locator(locator)
+        match = self.driver.execute_async_script(
+            scripts.LOCATE_WHEN_QUIET, locator.candidates, self.QUIET_PERIOD_MS, int(timeout * 1000)
+        )
+        return self.elements.remember(locator, match) is not None
+
+    def _read(self, locator, read, default=""):
+        """Чтение элемента устоявшегося DOM; default, если элемента нет.
+
+        Как у is_*: элемент ищется, когда приложение закончило перерисовку,
+        поэтому значение не читается с промежуточного состояния формы.
+        """
+        if not self.is_element_present(locator):
+            return default
+        try:
+            return self.elements.call(locator, read)
+        except NoSuchElementException:
+            return default
+
+    def assert_stays_absent(self, locator, duration=0.3):
+        """Проверка, что элемент не появляется в течение duration секунд"""
+        self.wait_for_dom_quiescence()
+        appeared = self.driver.execute_async_script(
+            scripts.WATCH_FOR_APPEARANCE, as_locator(locator).candidates, int(duration * 1000)
+        )
+        assert not appeared, f"Element {locator} appeared within {duration}s"
+        return self
+
+    def snapshot(self):
+        """Чтение всего состояния формы за один запрос к браузеру"""
+        state = self.driver.execute_async_script(
+            scripts.READ_SNAPSHOT,
+            SNAPSHOT_CANDIDATES,
+            self.QUIET_PERIOD_MS,
+            5000,
+        )
+        return TransferPageSnapshot(**state)
+
+    def evaluate_transfers(self, inputs):
+        """Прогон пачки вводов (номер карты, сумма) на открытой форме за один вызов"""
+        locators = {
+            "card_number_field": self.CARD_NUMBER_FIELD,
+            "transfer_amount_field": self.TRANSFER_AMOUNT_FIELD,
+            "commission": self.COMMISSION_TEXT,
+            "insufficient_funds_message": self.INSUFFICIENT_FUNDS_MESSAGE,
+            "transfer_button": self.TRANSFER_BUTTON,
+        }
+        results = self.driver.execute_async_script(
+            scripts.EVALUATE_TRANSFERS,
+            {name: locator.candidates for name, locator in locators.items()},
+            [[card_number, str(amount)] for card_number, amount in inputs],
+        )
+        if isinstance(results, str):
+            raise RuntimeError(f"Could not evaluate transfers: {results}")
+        return results
 
     # Проверка появления alert и работа с ним
     def handle_alert(self, timeout=10):
-        try:
-            # Ожидание появления alert
-            wait = WebDriverWait(self.driver, timeout)
-            alert = wait.until(EC.alert_is_present())
-            
-            # Получение текста alert (если нужно)
-            alert_text = alert.text
-            print(f"Alert появился с текстом: {alert_text}")
-            
-            # Принятие alert (нажатие OK)
-            alert.accept()
-            
-            return True
-        except TimeoutException:
+        """Ожидание окна alert и его подтверждение.
+
+        Окно приходит событием (BiDi или перехватчик на странице), поэтому
+        ответ возвращается сразу после его появления, без опроса.
+        """
+        prompt = self.prompts.wait(timeout)
+        if prompt is None:
             print("Alert не появился в течение указанного времени")
             return False
+        print(f"Alert появился с текстом: {prompt.message}")
+        return True
 
     # Или более простой вариант без ожидания
     def check_and_accept_alert(self):
-        try:
-            alert = self.driver.switch_to.alert
-            alert_text = alert.text
-            print(f"Alert обнаружен: {alert_text}")
-            alert.accept()  # Для принятия (OK)
-            # alert.dismiss()  # Для отмены (Cancel)
-            return True
-        except:
+        """Подтверждение уже открытого окна alert"""
+        prompt = self.prompts.wait(0)
+        if prompt is None:
             print("Alert не обнаружен")
             return False
+        print(f"Alert обнаружен: {prompt.message}")
+        return True
 
+    def _navigate(self, balance, reserved):
+        """Переход к приложению с параметрами баланса.
+
+        В режиме soft_reset приложение, уже открытое в браузере, монтируется
+        заново с новыми параметрами без перезагрузки; иначе - driver.get().
+        """
+        url = f"{self.base_url}/?balance={balance}&reserved={reserved}"
+        reset = False
+        if self.soft_reset:
+            reset = self.driver.execute_async_script(scripts.SOFT_RESET, self.base_url, url, 5000)
+            if isinstance(reset, str):
+                raise TimeoutException(f"Could not reset the page in place: {reset}")
+        if not reset:
+            self.driver.get(url)
+        self.elements.invalidate()
+        self.prompts.install()
+    
     def open_page(self, balance=30000, reserved=20000):
         """Открытие страницы с заданными параметрами баланса"""
-        url = f"http://localhost:8000/?balance={balance}&reserved={reserved}"
-        self.driver.get(url)
+        from selenium.webdriver.support import expected_conditions as EC
+        self._navigate(balance, reserved)
+        self.wait.until(EC.presence_of_element_located(self.APP_RENDERED))
+        return self
+    
+    def open_prefilled(self, balance=30000, reserved=20000, currency="rub", card=None, amount=None):
+        """Открытие страницы сразу в нужном состоянии формы.
+
+        Одна навигация и один скрипт вместо цепочки кликов и ввода с ожиданиями.
+        Для тестов самого взаимодействия остаются click_*_block и enter_*.
+        """
+        if currency not in self.CURRENCY_BLOCKS:
+            raise ValueError(f"Unsupported currency: {currency}")
+        if amount is not None and card is None:
+            raise ValueError("Transfer amount can only be prefilled together with a card number")
+        
+        self._navigate(balance, reserved)
+        error = self.driver.execute_async_script(
+            scripts.PREFILL_FORM,
+            self.CURRENCY_BLOCKS[currency].candidates,
+            self.CARD_NUMBER_FIELD.candidates,
+            self.TRANSFER_AMOUNT_FIELD.candidates,
+            card,
+            None if amount is None else str(amount),
+            5000,
+        )
+        if error:
+            raise RuntimeError(f"Could not prefill transfer form: {error}")
         return self
     
     def click_rubles_block(self):
         """Клик по блоку 'Рубли'"""
-        rubles_block = self.wait.until(EC.element_to_be_clickable(self.RUBLES_BLOCK))
-        rubles_block.click()
+        self._wait_for(self.RUBLES_BLOCK, clickable=True)
+        self.elements.call(self.RUBLES_BLOCK, lambda block: block.click())
         return self
     
     def click_dollars_block(self):
         """Клик по блоку 'Доллары'"""
-        dollars_block = self.wait.until(EC.element_to_be_clickable(self.DOLLARS_BLOCK))
-        dollars_block.click()
+        self._wait_for(self.DOLLARS_BLOCK, clickable=True)
+        self.elements.call(self.DOLLARS_BLOCK, lambda block: block.click())
         return self
     
     def click_euros_block(self):
         """Клик по блоку 'Евро'"""
-        euros_block = self.wait.until(EC.element_to_be_clickable(self.EUROS_BLOCK))
-        euros_block.click()
+        self._wait_for(self.EUROS_BLOCK, clickable=True)
+        self.elements.call(self.EUROS_BLOCK, lambda block: block.click())
         return self
     
-    def enter_card_number(self, card_number):
-        """Ввод номера карты"""
-        card_field = self.wait.until(EC.presence_of_element_located(self.CARD_NUMBER_FIELD))
-        card_field.clear()
-        card_field.send_keys(card_number)
+    def _use_keystrokes(self, keystrokes):
+        return not self.fast_input if keystrokes is None else keystrokes
+
+    def _fill(self, locator, value):
+        """Быстрый ввод: значение и события input/change одним вызовом"""
+        error = self.driver.execute_async_script(scripts.FILL_INPUT, locator.candidates, value, 5000)
+        if error:
+            raise TimeoutException(f"Could not fill {locator!r}: {error}")
+
+    def enter_card_number(self, card_number, keystrokes=None):
+        """Ввод номера карты.
+
+        keystrokes=True - посимвольный ввод, как у пользователя; по умолчанию
+        способ задаёт fast_input страницы.
+        """
+        if not self._use_keystrokes(keystrokes):
+            self._fill(self.CARD_NUMBER_FIELD, card_number)
+            return self
+        self._wait_for(self.CARD_NUMBER_FIELD)
+        self.elements.call(self.CARD_NUMBER_FIELD, lambda field: (field.clear(), field.send_keys(card_number)))
         return self
     
-    def enter_transfer_amount(self, amount):
+    def enter_transfer_amount(self, amount, keystrokes=None):
         """Ввод суммы перевода"""
-        amount_field = self.wait.until(EC.presence_of_element_located(self.TRANSFER_AMOUNT_FIELD))
-        amount_field.clear()
-        amount_field.send_keys(str(amount))
+        if not self._use_keystrokes(keystrokes):
+            self._fill(self.TRANSFER_AMOUNT_FIELD, str(amount))
+            return self
+        self._wait_for(self.TRANSFER_AMOUNT_FIELD)
+        self.elements.call(self.TRANSFER_AMOUNT_FIELD, lambda field: (field.clear(), field.send_keys(str(amount))))
         return self
     
     def click_transfer_button(self):
         """Клик по кнопке 'Перевести'"""
-        transfer_btn = self.wait.until(EC.element_to_be_clickable(self.TRANSFER_BUTTON))
-        transfer_btn.click()
+        self._wait_for(self.TRANSFER_BUTTON, clickable=True)
+        self.elements.call(self.TRANSFER_BUTTON, lambda button: button.click())
         return self
     
     def is_card_number_field_visible(self):
         """Проверка видимости поля номера карты"""
-        try:
-            self.wait.until(EC.presence_of_element_located(self.CARD_NUMBER_FIELD))
-            return True
-        except TimeoutException:
-            return False
+        return self.is_element_present(self.CARD_NUMBER_FIELD)
     
     def is_transfer_amount_field_visible(self):
         """Проверка видимости поля суммы перевода"""
-        try:
-            self.wait.until(EC.presence_of_element_located(self.TRANSFER_AMOUNT_FIELD))
-            return True
-        except TimeoutException:
-            return False
+        return self.is_element_present(self.TRANSFER_AMOUNT_FIELD)
     
     def is_transfer_button_enabled(self):
         """Проверка активности кнопки перевода"""
+        if not self.is_element_present(self.TRANSFER_BUTTON):
+            return False
         try:
-            button = self.driver.find_element(*self.TRANSFER_BUTTON)
-            return button.is_enabled()
+            return self.elements.call(self.TRANSFER_BUTTON, lambda button: button.is_enabled())
         except NoSuchElementException:
             return False
     
     def is_transfer_button_visible(self):
         """Проверка видимости кнопки перевода"""
-        try:
-            self.driver.find_element(*self.TRANSFER_BUTTON)
-            return True
-        except NoSuchElementException:
-            return False
+        return self.is_element_present(self.TRANSFER_BUTTON)
     
     def get_commission_text(self):
         """Получение текста комиссии"""
-        try:
-            commission_element = self.driver.find_element(*self.COMMISSION_TEXT)
-            return commission_element.text
-        except NoSuchElementException:
-            return ""
+        return self._read(self.COMMISSION_TEXT, lambda commission_element: commission_element.text)
     
     def get_error_message(self):
         """Получение текста ошибки"""
-        try:
-            error_element = self.driver.find_element(*self.ERROR_MESSAGE)
-            return error_element.text
-        except NoSuchElementException:
-            return ""
+        return self._read(self.ERROR_MESSAGE, lambda error_element: error_element.text)
     
     def is_insufficient_funds_message_visible(self):
         """Проверка видимости сообщения о недостатке средств"""
-        try:
-            self.driver.find_element(*self.INSUFFICIENT_FUNDS_MESSAGE)
-            return True
-        except NoSuchElementException:
-            return False
+        return self.is_element_present(self.INSUFFICIENT_FUNDS_MESSAGE)
     
     def is_confirm_dialog_visible(self):
-        """Проверка видимости диалога подтверждения"""
-        try:
-            self.wait.until(EC.presence_of_element_located(self.CONFIRM_DIALOG))
-            return True
-        except TimeoutException:
-            return False
+        """Проверка видимости диалога подтверждения.
+
+        Подтверждением считается и окно alert/confirm, и элемент диалога на
+        странице; ответ известен, как только DOM устоялся, без таймаута.
+        """
+        return self.is_element_present(self.CONFIRM_DIALOG) or bool(self.prompts.pending())
     
     def get_card_number_field_value(self):
         """Получение значения поля номера карты"""
-        try:
-            field = self.driver.find_element(*self.CARD_NUMBER_FIELD)
-            return field.get_attribute("value")
-        except NoSuchElementException:
-            return ""
+        return self._read(self.CARD_NUMBER_FIELD, lambda field: field.get_attribute("value"))
     
     def get_transfer_amount_field_value(self):
         """Получение значения поля суммы перевода"""
-        try:
-            field = self.driver.find_element(*self.TRANSFER_AMOUNT_FIELD)
-            return field.get_attribute("value")
-        except NoSuchElementException:
-            return ""
+        return self._read(self.TRANSFER_AMOUNT_FIELD, lambda field: field.get_attribute("value"))
     
     def is_card_number_field_focused(self):
         """Проверка фокуса на поле номера карты"""
-        try:
-            field = self.driver.find_element(*self.CARD_NUMBER_FIELD)
-            return field == self.driver.switch_to.active_element
-        except NoSuchElementException:
-            return False
+        return self._read(self.CARD_NUMBER_FIELD, lambda field: field == self.driver.switch_to.active_element, default=False)
     
     def get_balance_text(self):
         """Получение текста баланса"""
-        try:
-            balance_element = self.driver.find_element(*self.BALANCE_TEXT)
-            return balance_element.text
-        except NoSuchElementException:
-            return ""
+        return self._read(self.BALANCE_TEXT, lambda balance_element: balance_element.text)
     
     def get_reserved_text(self):
         """Получение текста резерва"""
-        try:
-            reserved_element = self.driver.find_element(*self.RESERVED_TEXT)
-            return reserved_element.text
-        except NoSuchElementException:
-            return ""
+        return self._read(self.RESERVED_TEXT, lambda reserved_element: reserved_element.text)
@@ -0,0 +1,218 @@
+"""Плагин pytest: скриншот, DOM и журналы браузера для упавших тестов.
+
+Пока тест идёт, в кольцевые буферы пишутся только последние команды
+WebDriver и записи консоли. Снимок страницы делается лишь при падении,
+а сжатие и запись на диск идут в фоновом потоке и не задерживают teardown.
+Объём за прогон ограничен: после лимита артефакты не сохраняются.
+"""
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from drivers.instrumentation import trace_commands
+from reporting.events import strip_group
+
+# Длина параметров команды в журнале: скрипты и значения обрезаются
+PARAMS_LIMIT = 300
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("artifacts")
+    group.addoption(
+        "--artifacts",
+        action="store",
+        default=None,
+        help="Save a screenshot, the DOM, recent WebDriver commands and console entries of failed tests here"
+    )
+    group.addoption(
+        "--artifacts-buffer",
+        action="store",
+        type=int,
+        default=50,
+        help="Number of recent WebDriver commands and console entries kept per test"
+    )
+    group.addoption(
+        "--artifacts-max-mb",
+        action="store",
+        type=float,
+        default=200,
+        help="Stop saving failure artifacts once the run has written this many megabytes"
+    )
+
+
+def pytest_configure(config):
+    directory = config.getoption("--artifacts")
+    if directory:
+        config.pluginmanager.register(ArtifactsPlugin(config, Path(directory)), "artifacts-plugin")
+
+
+class FailureTrace:
+    """Кольцевые буферы одного теста"""
+
+    def __init__(self, size):
+        self.started = time.time()
+        self.commands = deque(maxlen=size)
+        self.console = deque(maxlen=size)
+
+
+class ArtifactsPlugin:
+    """Буферы на время теста, снимок при падении, запись в фоне"""
+
+    def __init__(self, config, directory):
+        self.config = config
+        self.directory = directory.resolve()
+        self.buffer_size = config.getoption("--artifacts-buffer")
+        limit = int(config.getoption("--artifacts-max-mb") * 1024 * 1024)
+        workerinput = getattr(config, "workerinput", None)
+        if workerinput is not None:
+            # Лимит прогона делится между воркерами xdist поровну
+            limit //= workerinput["workercount"]
+        self.limit = limit
+        self.current = None
+        self._used = 0
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifacts")
+
+    def _commands(self):
+        return None if self.current is None else self.current.commands
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.current = FailureTrace(self.buffer_size)
+        try:
+            return (yield)
+        finally:
+            self.current = None
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item):
+        driver = item.funcargs.get("driver")
+        if driver is not None:
+            trace_commands(driver, self._commands)
+            self._watch_console(driver)
+        return (yield)
+
+    def _watch_console(self, driver):
+        # Консоль событиями приходит только по BiDi; без него её читает _console при падении
+        if getattr(driver, "_console_watched", False) or not _has_bidi(driver):
+            return
+
+        def on_entry(entry):
+            trace = self.current
+            if trace is not None:
+                trace.console.append({"level": entry.level, "text": entry.text, "timestamp": entry.timestamp})
+
+        driver.script.add_console_message_handler(on_entry)
+        driver.script.add_javascript_error_handler(on_entry)
+        driver._console_watched = True
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        report = yield
+        if report.failed and report.when in ("setup", "call") and self.current is not None:
+            driver = item.funcargs.get("driver")
+            if driver is not None:
+                self._capture(report, driver, self.current)
+        return report
+
+    def _capture(self, report, driver, trace):
+        """Снимок страницы сразу, пока драйвер не вернулся в пул; запись - в фоне"""
+        errors = []
+        screenshot = _attempt(driver.get_screenshot_as_png, errors)
+        dom = _attempt(lambda: driver.page_source, errors) or ""
+        url = _attempt(lambda: driver.current_url, errors)
+        console = list(trace.console) or _attempt(lambda: self._console(driver, trace), errors) or []
+        commands = list(trace.commands)
+
+        # Оценка сверху: сжатые файлы меньше, разница вернётся после записи
+        estimate = len(screenshot or b"") + len(dom) * 4 + (len(commands) + len(console)) * PARAMS_LIMIT
+        with self._lock:
+            if self._used + estimate > self.limit:
+                report.sections.append(("artifacts", "Not saved: the artifact size limit of the run is reached"))
+                return
+            self._used += estimate
+
+        target = self.directory / _slug(strip_group(report.nodeid))
+        artifacts = []
+        if screenshot is not None:
+            artifacts.append({"name": "screenshot", "path": str(target / "screenshot.png"), "mime": "image/png"})
+        artifacts.append({"name": "dom", "path": str(target / "dom.html.gz"), "mime": "application/gzip"})
+        artifacts.append({"name": "trace", "path": str(target / "trace.json.gz"), "mime": "application/gzip"})
+        # Атрибут отчёта переживает передачу с воркера xdist и попадает в журнал событий
+        report.artifacts = artifacts
+        trace_document = {
+            "nodeid": strip_group(report.nodeid),
+            "when": report.when,
+            "url": url,
+            "started_at": trace.started,
+            "commands": commands,
+            "console": console,
+            "errors": errors,
+        }
+        self._writer.submit(self._write, target, screenshot, dom, trace_document, estimate)
+
+    def _console(self, driver, trace):
+        # Chrome без BiDi отдаёт буфер консоли командой; записи до начала теста отбрасываются
+        if not hasattr(driver, "get_log"):
+            return []
+        since = trace.started * 1000
+        entries = [entry for entry in driver.get_log("browser") if entry.get("timestamp", 0) >= since]
+        return entries[-self.buffer_size:]
+
+    def _write(self, target, screenshot, dom, trace_document, estimate):
+        target.mkdir(parents=True, exist_ok=True)
+        written = 0
+        if screenshot is not None:
+            written += (target / "screenshot.png").write_bytes(screenshot)
+        written += (target / "dom.html.gz").write_bytes(gzip.compress(dom.encode("utf-8"), compresslevel=6))
+        trace_document["commands"] = [_format_command(*command) for command in trace_document["commands"]]
+        body = json.dumps(trace_document, ensure_ascii=False, indent=1, default=repr).encode("utf-8")
+        written += (target / "trace.json.gz").write_bytes(gzip.compress(body, compresslevel=6))
+        with self._lock:
+            self._used += written - estimate
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        # Отчёты строятся после прогона: к этому моменту все файлы должны быть на диске
+        self._writer.shutdown(wait=True)
+
+
+def _has_bidi(driver):
+    capabilities = getattr(driver, "capabilities", {})
+    return isinstance(capabilities.get("webSocketUrl"), str)
+
+
+def _attempt(action, errors):
+    # Браузер упавшего теста может не отвечать: снимок собирается из того, что удалось получить
+    try:
+        return action()
+    except Exception as exc:
+        errors.append(f"{type(exc).__name__}: {exc}".strip())
+        return None
+
+
+def _format_command(started, command, args, kwargs, seconds, error):
+    params = json.dumps([args, kwargs], ensure_ascii=False, default=repr)
+    if len(params) > PARAMS_LIMIT:
+        params = params[:PARAMS_LIMIT] + "..."
+    return {
+        "at": started,
+        "command": command,
+        "params": params,
+        "duration": seconds,
+        "error": None if error is None else f"{type(error).__name__}: {error}",
+    }
+
+
+def _slug(nodeid):
+    name = re.sub(r"[^\w.-]+", "_", nodeid).strip("_")[:80]
+    return f"{name}-{hashlib.sha1(nodeid.encode()).hexdigest()[:8]}"
@@ -0,0 +1,124 @@
+"""Плагин pytest: поток результатов в компактный журнал событий (JSON Lines).
+
+Отчёты JUnit, HTML и сводка времени строятся из журнала после прогона
+(python -m reporting), поэтому набор не нужно запускать повторно ради
+другого формата отчёта.
+"""
+
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from reporting.events import SCHEMA_VERSION, strip_group
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("eventlog")
+    group.addoption(
+        "--event-log",
+        action="store",
+        default=None,
+        help="Stream test results to this JSON Lines file; render reports from it with python -m reporting"
+    )
+
+
+def pytest_configure(config):
+    path = config.getoption("--event-log")
+    # Под xdist отчёты воркеров приходят на контроллер, журнал пишет только он
+    if path and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(EventLog(Path(path)), "event-log")
+
+
+class EventLog:
+    """Запись одной строки на тест по мере завершения тестов"""
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("w", encoding="utf-8")
+        # Незавершённые тесты: под xdist их не больше, чем воркеров
+        self._pending = {}
+        self._started = None
+
+    def _write(self, event):
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def pytest_sessionstart(self, session):
+        self._started = time.time()
+        self._write({
+            "type": "session_start",
+            "schema_version": SCHEMA_VERSION,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": session.config.invocation_params.args,
+        })
+
+    def pytest_runtest_logreport(self, report):
+        nodeid = strip_group(report.nodeid)
+        event = self._pending.setdefault(nodeid, {
+            "type": "test",
+            "nodeid": nodeid,
+            "location": list(report.location),
+            "outcome": "passed",
+            "duration": 0.0,
+            "phases": {},
+            "sections": [],
+            "artifacts": [],
+        })
+        event["duration"] += report.duration
+        event["phases"][report.when] = report.duration
+        event["sections"].extend([title, content] for title, content in report.sections if content)
+        event["artifacts"].extend(getattr(report, "artifacts", ()))
+        if getattr(report, "timing", None) is not None:
+            event["timing"] = report.timing
+        self._apply_outcome(event, report)
+        if report.when == "teardown":
+            # Секции захвата повторяются в каждой фазе; в журнал идут уникальные
+            event["sections"] = [list(section) for section in dict.fromkeys(map(tuple, event["sections"]))]
+            self._write(self._pending.pop(nodeid))
+
+    @staticmethod
+    def _apply_outcome(event, report):
+        if report.passed and not hasattr(report, "wasxfail"):
+            return
+        if report.skipped:
+            if hasattr(report, "wasxfail"):
+                event["outcome"] = "xfailed"
+                event["message"] = report.wasxfail
+            elif event["outcome"] == "passed":
+                event["outcome"] = "skipped"
+                event["message"] = report.longrepr[2] if isinstance(report.longrepr, tuple) else str(report.longrepr)
+            return
+        if report.passed:
+            event["outcome"] = "xpassed"
+            return
+        # Падение вне тела теста - ошибка окружения, как в JUnit-отчёте pytest
+        event["outcome"] = "failed" if report.when == "call" else "error"
+        event["when"] = report.when
+        event["message"] = report.longreprtext.strip().splitlines()[-1] if report.longreprtext else ""
+        event["longrepr"] = report.longreprtext
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self._write({
+                "type": "collect_error",
+                "nodeid": report.nodeid,
+                "longrepr": str(report.longrepr),
+            })
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        for event in self._pending.values():
+            self._write(event)
+        self._pending.clear()
+        self._write({
+            "type": "session_finish",
+            "exitstatus": int(exitstatus),
+            "duration": time.time() - self._started if self._started else 0.0,
+        })
+        self._file.close()
@@ -0,0 +1,143 @@
+"""Плагин pytest: порядок и отбор тестов по истории прошлых прогонов.
+
+Сначала идут недавно упавшие тесты, затем smoke/critical, затем
+остальные. В одиночном прогоне внутри уровня первыми идут короткие тесты -
+первая ошибка приходит раньше; под xdist - длинные группы, чтобы воркеры
+заканчивали одновременно (longest job first).
+"""
+
+import statistics
+
+import pytest
+
+from reporting.events import strip_group
+
+CACHE_KEY = "testing-hw/history"
+
+# Вес нового замера в скользящем среднем длительности
+DURATION_ALPHA = 0.3
+# Длительность теста без истории, если не из чего оценить
+DEFAULT_DURATION = 1.0
+# Сколько прогонов упавший тест считается "недавно упавшим"
+RECENT_FAILURE_RUNS = 3
+
+PRIORITY_MARKERS = ("smoke", "critical")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("history")
+    group.addoption(
+        "--no-history",
+        action="store_true",
+        default=False,
+        help="Keep file order instead of ordering tests by past failures, markers and durations"
+    )
+    group.addoption(
+        "--history-select",
+        action="store",
+        default=None,
+        choices=("failed",),
+        help="'failed' runs only tests that failed recently or have no history yet"
+    )
+
+
+def pytest_configure(config):
+    if getattr(config, "cache", None) is None:
+        # Без cacheprovider истории негде храниться
+        return
+    config.pluginmanager.register(HistoryPlugin(config), "history-plugin")
+
+
+class HistoryPlugin:
+    """История длительностей и исходов в кеше pytest (.pytest_cache)"""
+
+    def __init__(self, config):
+        self.config = config
+        stored = config.cache.get(CACHE_KEY, {})
+        self.run = stored.get("run", 0) + 1
+        self.tests = stored.get("tests", {})
+        self._durations = {}
+        self._failed = set()
+        self._skipped = set()
+
+    def recently_failed(self, nodeid):
+        entry = self.tests.get(strip_group(nodeid))
+        last_failed = entry.get("last_failed") if entry else None
+        return last_failed is not None and self.run - last_failed <= RECENT_FAILURE_RUNS
+
+    def estimate(self, nodeid, default):
+        entry = self.tests.get(strip_group(nodeid))
+        return entry["duration"] if entry and entry.get("duration") is not None else default
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        known = [entry["duration"] for entry in self.tests.values() if entry.get("duration") is not None]
+        default = statistics.median(known) if known else DEFAULT_DURATION
+
+        if config.getoption("--history-select") == "failed":
+            selected, deselected = [], []
+            for item in items:
+                wanted = strip_group(item.nodeid) not in self.tests or self.recently_failed(item.nodeid)
+                (selected if wanted else deselected).append(item)
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+                items[:] = selected
+
+        if config.getoption("--no-history"):
+            return
+
+        def tier(item):
+            if self.recently_failed(item.nodeid):
+                return 0
+            if any(item.get_closest_marker(name) for name in PRIORITY_MARKERS):
+                return 1
+            return 2
+
+        if getattr(config.option, "numprocesses", None) or hasattr(config, "workerinput"):
+            # Под xdist группа (xdist_group) уходит на один воркер целиком:
+            # порядок групп определяется их суммарной длительностью
+            groups = {}
+            for item in items:
+                name = _group(item)
+                groups[name] = groups.get(name, 0.0) + self.estimate(item.nodeid, default)
+            group_tier = {}
+            for item in items:
+                name = _group(item)
+                group_tier[name] = min(group_tier.get(name, 2), tier(item))
+            items.sort(key=lambda item: (
+                group_tier[_group(item)], -groups[_group(item)], _group(item), -self.estimate(item.nodeid, default)
+            ))
+        else:
+            items.sort(key=lambda item: (tier(item), self.estimate(item.nodeid, default)))
+
+    def pytest_runtest_logreport(self, report):
+        nodeid = strip_group(report.nodeid)
+        self._durations[nodeid] = self._durations.get(nodeid, 0.0) + report.duration
+        if report.failed:
+            self._failed.add(nodeid)
+        elif report.skipped:
+            self._skipped.add(nodeid)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        # Воркеры xdist только читают историю; записывает её контроллер
+        if hasattr(self.config, "workerinput") or not self._durations:
+            return
+        for nodeid, duration in self._durations.items():
+            if nodeid in self._skipped and nodeid not in self._failed:
+                # Длительность пропущенного теста ничего не говорит о настоящей
+                continue
+            entry = self.tests.setdefault(nodeid, {"duration": None, "last_failed": None})
+            if nodeid in self._failed:
+                entry["last_failed"] = self.run
+            if entry["duration"] is None:
+                entry["duration"] = duration
+            else:
+                entry["duration"] = (1 - DURATION_ALPHA) * entry["duration"] + DURATION_ALPHA * duration
+        self.config.cache.set(CACHE_KEY, {"run": self.run, "tests": self.tests})
+
+
+def _group(item):
+    marker = item.get_closest_marker("xdist_group")
+    if marker is None:
+        return item.nodeid
+    return marker.args[0] if marker.args else marker.kwargs.get("name", "default")
@@ -0,0 +1,200 @@
+"""Плагин pytest: время импорта conftest и сбора тестов, бюджеты на них.
+
+Сбор замеряется в процессе, который собирает тесты (под xdist - на
+воркерах, controller берёт самый медленный). Импорт conftest замеряется
+отдельно, в свежем интерпретаторе с -X importtime: в текущем процессе
+он уже произошёл до загрузки плагина, поэтому тяжёлые импорты верхнего
+уровня в бюджет сбора не попадают и проверяются своим бюджетом.
+"""
+
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+
+import pytest
+
+CONFTEST_MODULE = "tests.conftest"
+
+# Сколько самых тяжёлых импортов conftest показывать
+PROFILE_TOP = 10
+
+# Замеров импорта conftest: берётся самый быстрый, чтобы бюджет не срабатывал от шума
+IMPORT_RUNS = 3
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("startup")
+    group.addoption(
+        "--startup-profile",
+        action="store_true",
+        default=False,
+        help="Report the conftest import time with its heaviest imports and the collection time"
+    )
+    group.addoption(
+        "--collect-budget",
+        action="store",
+        type=float,
+        default=None,
+        help="Fail the run if collecting tests takes longer than this many seconds"
+    )
+    group.addoption(
+        "--import-budget",
+        action="store",
+        type=float,
+        default=None,
+        help="Fail the run if importing tests/conftest.py in a fresh interpreter takes longer than this many seconds"
+    )
+
+
+def pytest_configure(config):
+    if (
+        config.getoption("--startup-profile")
+        or config.getoption("--collect-budget") is not None
+        or config.getoption("--import-budget") is not None
+    ):
+        config.pluginmanager.register(StartupPlugin(config), "startup-plugin")
+
+
+class StartupPlugin:
+    """Замер импорта conftest и сбора тестов, проверка бюджетов"""
+
+    def __init__(self, config):
+        self.config = config
+        self.budget = config.getoption("--collect-budget")
+        self.import_budget = config.getoption("--import-budget")
+        self.collect_seconds = None
+        self.import_profile = None
+
+    def pytest_sessionstart(self, session):
+        # Импорт замеряется один раз, в controller'е или в процессе без xdist
+        if hasattr(self.config, "workerinput"):
+            return
+        if self.config.getoption("--startup-profile") or self.import_budget is not None:
+            self.import_profile = conftest_import_times(self.config.rootpath)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_collection(self, session):
+        started = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            # Controller xdist сам не собирает: его время не в счёт
+            if not session.config.pluginmanager.hasplugin("dsession"):
+                self.collect_seconds = time.perf_counter() - started
+                workeroutput = getattr(self.config, "workeroutput", None)
+                if workeroutput is not None:
+                    workeroutput["collect_seconds"] = self.collect_seconds
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        seconds = getattr(node, "workeroutput", {}).get("collect_seconds")
+        if seconds is not None:
+            self.collect_seconds = max(self.collect_seconds or 0, seconds)
+
+    def over_budget(self):
+        return self.budget is not None and self.collect_seconds is not None and self.collect_seconds > self.budget
+
+    def import_seconds(self):
+        if self.import_profile is None or self.import_profile.total is None:
+            return None
+        return self.import_profile.total / 1_000_000
+
+    def import_over_budget(self):
+        if self.import_budget is None or self.import_profile is None:
+            return False
+        # Импорт, который не удалось замерить, бюджет тоже не проходит
+        return self.import_seconds() is None or self.import_seconds() > self.import_budget
+
+    def pytest_sessionfinish(self, session):
+        if (self.over_budget() or self.import_over_budget()) and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(self.config, "workerinput"):
+            return
+        if self.config.getoption("--startup-profile"):
+            terminalreporter.write_sep("-", "startup profile")
+            for line in format_import_profile(self.import_profile):
+                terminalreporter.write_line(line)
+            if self.collect_seconds is not None:
+                terminalreporter.write_line(f"collection: {self.collect_seconds * 1000:.0f} ms")
+        if self.over_budget():
+            terminalreporter.write_line(
+                f"Collection took {self.collect_seconds:.2f}s, over the budget of {self.budget:.2f}s",
+                red=True, bold=True,
+            )
+        if self.import_over_budget():
+            if self.import_seconds() is None:
+                message = f"Could not time the conftest import: {self.import_profile.error}"
+            else:
+                message = (
+                    f"Importing conftest took {self.import_seconds() * 1000:.0f} ms, "
+                    f"over the budget of {self.import_budget * 1000:.0f} ms"
+                )
+            terminalreporter.write_line(message, red=True, bold=True)
+
+
+@dataclass(frozen=True, slots=True)
+class ImportProfile:
+    """Время импорта conftest (мкс) и его прямые импорты [(мкс, модуль)]"""
+
+    total: int | None
+    direct: list
+    error: str | None = None
+
+
+def conftest_import_times(rootpath, runs=IMPORT_RUNS):
+    """Самый быстрый из runs импортов conftest в свежем интерпретаторе с -X importtime.
+
+    pytest импортируется заранее, как в настоящем запуске: в счёт идёт
+    только то, что conftest загружает сверх него.
+    """
+    fastest = None
+    for _ in range(runs):
+        profile = _import_times(rootpath)
+        if profile.total is None:
+            return profile
+        if fastest is None or profile.total < fastest.total:
+            fastest = profile
+    return fastest
+
+
+def _import_times(rootpath):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import pytest; import {CONFTEST_MODULE}"],
+        cwd=rootpath, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return ImportProfile(None, [], f"conftest import failed: {result.stderr.strip().splitlines()[-1:]}")
+    total = None
+    direct = []
+    # Строки вида "import time: self [us] | cumulative | name", вложенность - отступ имени
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        name = name.strip()
+        if name == CONFTEST_MODULE and depth == 0:
+            total = int(cumulative)
+        elif depth == 1:
+            direct.append((int(cumulative), name))
+        elif depth == 0:
+            # Импорты верхнего уровня до conftest (site, pytest) в его время не входят
+            direct = []
+    if total is None:
+        return ImportProfile(None, [], "conftest import: no importtime data")
+    return ImportProfile(total, direct)
+
+
+def format_import_profile(profile, top=PROFILE_TOP):
+    """Строки отчёта: время импорта conftest и его самые тяжёлые прямые импорты"""
+    if profile.total is None:
+        return [profile.error]
+    lines = [f"conftest import (fresh interpreter, pytest preloaded): {profile.total / 1000:.0f} ms"]
+    for microseconds, name in sorted(profile.direct, reverse=True)[:top]:
+        lines.append(f"  {microseconds / 1000:8.1f} ms  {name}")
+    return lines
@@ -0,0 +1,159 @@
+"""Плагин pytest: время тестов по фазам, командам WebDriver, ожиданиям и методам Page Object"""
+
+import csv
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from drivers.instrumentation import TimingRecorder, instrument_driver, instrument_page, instrument_waits
+from reporting.summary import format_summary, summarize
+
+CSV_FIELDS = (
+    "nodeid", "outcome", "setup", "call", "teardown",
+    "wait_time", "work_time", "command_count", "command_time",
+)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("timing")
+    group.addoption(
+        "--timing",
+        action="store_true",
+        default=False,
+        help="Instrument WebDriver commands and page methods and print the slowest ones"
+    )
+    group.addoption(
+        "--timing-report",
+        action="store",
+        default=None,
+        help="Write per-test timings to this .json or .csv file (implies --timing)"
+    )
+    group.addoption(
+        "--timing-top",
+        action="store",
+        type=int,
+        default=10,
+        help="Number of slowest tests and page methods in the timing summary"
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("--timing") or config.getoption("--timing-report"):
+        config.pluginmanager.register(TimingPlugin(config), "timing-plugin")
+
+
+class TimingPlugin:
+    """Сбор замеров на воркере и их сведение там, где работает терминал"""
+
+    def __init__(self, config):
+        self.config = config
+        self.current = None
+        self.results = []
+        self._outcomes = {}
+        # selenium.webdriver загружает все браузеры: импорт только при включённых замерах
+        from selenium.webdriver.support.ui import WebDriverWait
+        self._restore_waits = instrument_waits(WebDriverWait, self._recorder)
+
+    def _recorder(self):
+        return self.current
+
+    def pytest_unconfigure(self):
+        self._restore_waits()
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.current = TimingRecorder()
+        try:
+            return (yield)
+        finally:
+            self.current = None
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef):
+        started = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            if self.current is not None:
+                self.current.fixtures[fixturedef.argname] = time.perf_counter() - started
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item):
+        # Фикстуры уже созданы: драйвер и страница оборачиваются до тела теста
+        driver = item.funcargs.get("driver")
+        if driver is not None:
+            instrument_driver(driver, self._recorder)
+        page = item.funcargs.get("page")
+        if page is not None:
+            instrument_page(page, self._recorder)
+        try:
+            return (yield)
+        finally:
+            # Какая стратегия нашла каждый элемент: CSS/ID или запасной XPath
+            elements = getattr(page, "elements", None)
+            if elements is not None and self.current is not None:
+                self.current.add_locator_matches(elements.matches)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        report = yield
+        if self.current is not None:
+            self.current.phases[report.when] = report.duration
+            if report.when == "teardown":
+                # Атрибут отчёта переживает передачу с воркера xdist
+                report.timing = self.current.to_dict()
+        return report
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            self._outcomes[report.nodeid] = report.outcome
+        timing = getattr(report, "timing", None)
+        if report.when == "teardown" and timing is not None:
+            self.results.append({
+                "nodeid": report.nodeid,
+                "outcome": self._outcomes.pop(report.nodeid, report.outcome),
+                **timing,
+            })
+
+    def pytest_sessionfinish(self, session):
+        path = self.config.getoption("--timing-report")
+        if path is None or hasattr(self.config, "workerinput"):
+            return
+        write_report(self.results, Path(path))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        top = self.config.getoption("--timing-top")
+        terminalreporter.section("timing")
+        for line in format_summary(summarize(self.results, top), top):
+            terminalreporter.write_line(line)
+
+
+def write_report(results, path):
+    """Запись замеров в JSON (подробно) или CSV (строка на тест)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".csv":
+        with path.open("w", newline="", encoding="utf-8") as report:
+            writer = csv.DictWriter(report, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for result in results:
+                writer.writerow({
+                    "nodeid": result["nodeid"],
+                    "outcome": result["outcome"],
+                    **{phase: result["phases"].get(phase, 0.0) for phase in ("setup", "call", "teardown")},
+                    **{field: result[field] for field in CSV_FIELDS[5:]},
+                })
+        return
+    summary = summarize(results, top=0)
+    document = {
+        "tests": results,
+        "page_methods": {name: {"count": count, "time": seconds}
+                         for name, (count, seconds) in summary.page_methods.items()},
+        "commands": {name: {"count": count, "time": seconds}
+                     for name, (count, seconds) in summary.commands.items()},
+        "locator_matches": summary.locator_matches,
+    }
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
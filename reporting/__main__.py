@@ -0,0 +1,42 @@
+"""Отчёты из журнала событий: python -m reporting events.jsonl --junit ... --html ... --summary"""
+
+import argparse
+import sys
+
+from reporting.events import totals
+from reporting.html import render_html
+from reporting.junit import render_junit
+from reporting.summary import format_summary, summarize_log
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m reporting", description="Render reports from a pytest event log")
+    parser.add_argument("event_log", help="JSON Lines file written by pytest --event-log")
+    parser.add_argument("--junit", default=None, help="Write JUnit XML to this path")
+    parser.add_argument("--html", default=None, help="Write a self-contained HTML report to this path")
+    parser.add_argument("--title", default="Test report", help="Title of the HTML report")
+    parser.add_argument("--summary", action="store_true", help="Print outcome counts and the timing summary")
+    parser.add_argument("--top", type=int, default=10, help="Entries per section of the timing summary")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.junit:
+        print(f"JUnit XML written to {render_junit(args.event_log, args.junit)}")
+    if args.html:
+        print(f"HTML report written to {render_html(args.event_log, args.html, title=args.title)}")
+    if args.summary:
+        counts, collect_errors, duration = totals(args.event_log)
+        outcomes = ", ".join(f"{count} {outcome}" for outcome, count in counts.items() if count)
+        if collect_errors:
+            outcomes += f", {collect_errors} collection errors"
+        print(f"{outcomes or 'no tests'} in {duration:.1f}s")
+        summary = summarize_log(args.event_log, args.top)
+        if summary.slowest:
+            print("\n".join(format_summary(summary, args.top)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
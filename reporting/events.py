@@ -0,0 +1,55 @@
+"""Чтение журнала событий прогона (JSON Lines)"""
+
+import json
+from pathlib import Path
+
+# Версия формата журнала; меняется при несовместимых изменениях записей
+SCHEMA_VERSION = 1
+
+OUTCOMES = ("passed", "failed", "error", "skipped", "xfailed", "xpassed")
+
+
+def strip_group(nodeid):
+    """nodeid без суффикса группы xdist: test_a.py::test_b@chrome:x -> test_a.py::test_b"""
+    at = nodeid.rfind("@")
+    return nodeid[:at] if at > nodeid.rfind("]") and at > nodeid.rfind("::") else nodeid
+
+
+def read_events(path, types=None):
+    """Построчное чтение журнала; в памяти держится одна запись"""
+    with Path(path).open(encoding="utf-8") as log:
+        for line in log:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["type"] == "session_start" and event.get("schema_version") != SCHEMA_VERSION:
+                raise ValueError(f"{path}: unsupported event log schema {event.get('schema_version')}")
+            if types is None or event["type"] in types:
+                yield event
+
+
+def tests(path):
+    return read_events(path, types=("test",))
+
+
+def totals(path):
+    """Счётчики исходов и общее время; отдельный проход по журналу"""
+    counts = dict.fromkeys(OUTCOMES, 0)
+    duration = 0.0
+    collect_errors = 0
+    for event in read_events(path):
+        if event["type"] == "test":
+            counts[event["outcome"]] += 1
+            duration += event["duration"]
+        elif event["type"] == "collect_error":
+            collect_errors += 1
+        elif event["type"] == "session_finish":
+            duration = event["duration"]
+    return counts, collect_errors, duration
+
+
+def split_nodeid(nodeid):
+    """Имя класса и теста в стиле JUnit-отчёта pytest"""
+    path, _, rest = nodeid.partition("::")
+    names = [path.replace("/", ".").removesuffix(".py"), *rest.split("::")] if rest else [path]
+    return ".".join(names[:-1]), names[-1]
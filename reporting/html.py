@@ -0,0 +1,90 @@
+"""Самодостаточный HTML-отчёт из журнала событий.
+
+Строки таблицы пишутся в файл по мере чтения журнала, скриншоты
+встраиваются по одному, так что память не растёт с размером набора.
+"""
+
+import base64
+import html
+from pathlib import Path
+
+from reporting.events import OUTCOMES, read_events
+
+STYLE = """
+body { font-family: sans-serif; margin: 0; display: flex; flex-direction: column; }
+header { order: -1; padding: 12px 16px; background: #f4f4f4; border-bottom: 1px solid #ddd; }
+header span { margin-right: 16px; }
+table { border-collapse: collapse; width: 100%; }
+td, th { text-align: left; padding: 4px 8px; border-bottom: 1px solid #eee; vertical-align: top; }
+.passed, .xpassed { color: #2a7d2a; }
+.failed, .error { color: #c0392b; }
+.skipped, .xfailed { color: #b7950b; }
+pre { white-space: pre-wrap; background: #fafafa; padding: 8px; margin: 4px 0; }
+img { max-width: 640px; border: 1px solid #ccc; display: block; margin: 4px 0; }
+"""
+
+
+def render_html(log_path, output_path, title="Test report"):
+    """Запись HTML-отчёта за один проход по журналу"""
+    log_path = Path(log_path)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    counts = dict.fromkeys(OUTCOMES, 0)
+    duration = 0.0
+    with output_path.open("w", encoding="utf-8") as out:
+        out.write(
+            f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+            f"<style>{STYLE}</style></head><body>\n"
+            "<table><thead><tr><th>Result</th><th>Test</th><th>Duration</th></tr></thead><tbody>\n"
+        )
+        for event in read_events(log_path):
+            if event["type"] == "test":
+                counts[event["outcome"]] += 1
+                out.write(_row(event, log_path.parent))
+            elif event["type"] == "collect_error":
+                counts["error"] += 1
+                out.write(_row({**event, "outcome": "error", "duration": 0.0, "sections": []}, log_path.parent))
+            elif event["type"] == "session_finish":
+                duration = event["duration"]
+        # Сводка известна только в конце; CSS показывает её над таблицей
+        summary = "".join(
+            f'<span class="{outcome}">{count} {outcome}</span>' for outcome, count in counts.items() if count
+        )
+        out.write(
+            f"</tbody></table>\n<header><h1>{html.escape(title)}</h1>{summary}"
+            f"<span>{duration:.1f}s</span></header>\n</body></html>\n"
+        )
+    return output_path
+
+
+def _row(event, base_dir):
+    outcome = event["outcome"]
+    details = ""
+    if event.get("longrepr"):
+        details += f"<pre>{html.escape(event['longrepr'])}</pre>"
+    elif event.get("message"):
+        details += f"<pre>{html.escape(event['message'])}</pre>"
+    for title, content in event["sections"]:
+        details += f"<details><summary>{html.escape(title)}</summary><pre>{html.escape(content)}</pre></details>"
+    for artifact in event.get("artifacts", ()):
+        details += _artifact(artifact, base_dir)
+    cell = f'<details><summary>{html.escape(event["nodeid"])}</summary>{details}</details>' if details \
+        else html.escape(event["nodeid"])
+    return (
+        f'<tr><td class="{outcome}">{outcome}</td><td>{cell}</td>'
+        f'<td>{event["duration"]:.2f}s</td></tr>\n'
+    )
+
+
+def _artifact(artifact, base_dir):
+    path = Path(artifact["path"])
+    if not path.is_absolute():
+        path = base_dir / path
+    name = html.escape(artifact.get("name", path.name))
+    mime = artifact.get("mime", "")
+    if not path.is_file():
+        return f"<p>{name}: missing ({html.escape(str(path))})</p>"
+    if mime.startswith("image/"):
+        encoded = base64.b64encode(path.read_bytes()).decode("ascii")
+        return f'<p>{name}</p><img src="data:{mime};base64,{encoded}" alt="{name}">'
+    return f'<p><a href="{html.escape(path.resolve().as_uri())}">{name}</a></p>'
@@ -0,0 +1,63 @@
+"""JUnit XML из журнала событий"""
+
+import re
+from pathlib import Path
+from xml.sax.saxutils import escape as _escape, quoteattr as _quoteattr
+
+from reporting.events import read_events, split_nodeid, totals
+
+# Символы, недопустимые в XML 1.0 (управляющие коды из вывода браузера и т.п.)
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def escape(text):
+    return _escape(_ILLEGAL_XML.sub("?", text))
+
+
+def quoteattr(text):
+    return _quoteattr(_ILLEGAL_XML.sub("?", text))
+
+
+def render_junit(log_path, output_path, suite_name="pytest"):
+    """Запись JUnit XML в два прохода: счётчики, затем тесты по одному"""
+    counts, collect_errors, duration = totals(log_path)
+    tests = sum(counts.values()) + collect_errors
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
+        out.write(
+            f'<testsuite name={quoteattr(suite_name)} tests="{tests}" '
+            f'failures="{counts["failed"]}" errors="{counts["error"] + collect_errors}" '
+            f'skipped="{counts["skipped"] + counts["xfailed"]}" time="{duration:.3f}">\n'
+        )
+        for event in read_events(log_path, types=("test", "collect_error")):
+            out.write(_testcase(event))
+        out.write("</testsuite>\n</testsuites>\n")
+    return output_path
+
+
+def _testcase(event):
+    classname, name = split_nodeid(event["nodeid"])
+    if event["type"] == "collect_error":
+        return (
+            f'<testcase classname={quoteattr(classname)} name={quoteattr(name)} time="0">'
+            f'<error message="collection failure">{escape(event["longrepr"])}</error></testcase>\n'
+        )
+    body = ""
+    outcome = event["outcome"]
+    message = quoteattr(event.get("message", ""))
+    if outcome == "failed":
+        body = f'<failure message={message}>{escape(event.get("longrepr", ""))}</failure>'
+    elif outcome == "error":
+        body = f'<error message={message}>{escape(event.get("longrepr", ""))}</error>'
+    elif outcome in ("skipped", "xfailed"):
+        body = f'<skipped type="pytest.{outcome}" message={message}/>'
+    for title, content in event["sections"]:
+        tag = "system-err" if "stderr" in title else "system-out"
+        text = f"--- {title} ---\n{content}"
+        body += f"<{tag}>{escape(text)}</{tag}>"
+    return (
+        f'<testcase classname={quoteattr(classname)} name={quoteattr(name)} '
+        f'time="{event["duration"]:.3f}">{body}</testcase>\n'
+    )
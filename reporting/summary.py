@@ -0,0 +1,75 @@
+"""Сводка времени: самые медленные тесты, методы Page Object, команды WebDriver и стратегии локаторов"""
+
+import heapq
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from reporting.events import tests
+
+
+@dataclass(slots=True)
+class TimingSummary:
+    """Сводка, собранная за один проход; хранит только top самых медленных тестов"""
+
+    slowest: list = field(default_factory=list)
+    page_methods: dict = field(default_factory=dict)
+    commands: dict = field(default_factory=dict)
+    locator_matches: dict = field(default_factory=dict)
+
+
+def summarize(results, top=10):
+    """Сводка по замерам тестов (записи плагина plugins.timing)"""
+    heap = []
+    page_methods = defaultdict(lambda: [0, 0.0])
+    commands = defaultdict(lambda: [0, 0.0])
+    locator_matches = Counter()
+    for index, result in enumerate(results):
+        total = sum(result["phases"].values())
+        entry = (total, index, {key: result[key] for key in ("nodeid", "phases", "wait_time", "work_time", "command_count")})
+        if len(heap) < top:
+            heapq.heappush(heap, entry)
+        elif top:
+            heapq.heappushpop(heap, entry)
+        for totals, key in ((page_methods, "page_methods"), (commands, "commands")):
+            for name, measured in result[key].items():
+                totals[name][0] += measured["count"]
+                totals[name][1] += measured["time"]
+        # В записях до появления учёта стратегий поля нет
+        locator_matches.update(result.get("locator_matches", {}))
+    return TimingSummary(
+        slowest=[(total, result) for total, _, result in sorted(heap, reverse=True)],
+        page_methods={name: tuple(entry) for name, entry in page_methods.items()},
+        commands={name: tuple(entry) for name, entry in commands.items()},
+        locator_matches=dict(locator_matches),
+    )
+
+
+def summarize_log(log_path, top=10):
+    """Сводка по журналу событий: замеры есть у тестов, прогнанных с --timing"""
+    return summarize(
+        ({"nodeid": event["nodeid"], **event["timing"]} for event in tests(log_path) if "timing" in event),
+        top,
+    )
+
+
+def format_summary(summary, top=10):
+    """Строки сводки для терминала"""
+    lines = [f"slowest {len(summary.slowest)} tests (setup / call / teardown, wait vs work, commands):"]
+    for total, result in summary.slowest:
+        phases = result["phases"]
+        lines.append(
+            f"  {total:8.3f}s  {phases.get('setup', 0):.3f} / {phases.get('call', 0):.3f} / "
+            f"{phases.get('teardown', 0):.3f}  wait {result['wait_time']:.3f} work {result['work_time']:.3f}  "
+            f"{result['command_count']} cmds  {result['nodeid']}"
+        )
+    for title, totals in (("page methods", summary.page_methods), ("WebDriver commands", summary.commands)):
+        if not totals:
+            continue
+        lines.append(f"slowest {title} (total, calls, mean):")
+        for name, (count, seconds) in sorted(totals.items(), key=lambda entry: entry[1][1], reverse=True)[:top]:
+            lines.append(f"  {seconds:8.3f}s  {count:5d}  {seconds / count:.3f}s  {name}")
+    if summary.locator_matches:
+        lines.append("locator strategies (matches, element: strategy):")
+        for name, count in sorted(summary.locator_matches.items()):
+            lines.append(f"  {count:8d}  {name}")
+    return lines
@@ -0,0 +1,21 @@
+"""Распределение воркеров pytest-xdist по серверам приложения"""
+
+import os
+import re
+
+
+def worker_index(worker_id=None):
+    """Номер воркера xdist: gw0 -> 0; без xdist - 0"""
+    worker_id = worker_id or os.environ.get("PYTEST_XDIST_WORKER", "")
+    match = re.fullmatch(r"gw(\d+)", worker_id)
+    return int(match.group(1)) if match else 0
+
+
+def shard_url(urls, worker_id=None):
+    """Выбор URL из списка по кругу по номеру воркера"""
+    return urls[worker_index(worker_id) % len(urls)]
+
+
+def parse_urls(value):
+    """Список URL из значения вида "http://a:8000,http://b:8000\""""
+    return [url.strip().rstrip("/") for url in value.split(",") if url.strip()]
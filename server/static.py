@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+# Файлы сборки Vite с хешем содержимого в имени: index-BUH56GOL.js
+HASHED_NAME = re.compile(r"-[A-Za-z0-9_-]{8,}\.[a-z0-9]+$")
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+@dataclass(frozen=True, slots=True)
+class Asset:
+    """Файл, заранее прочитанный и сжатый в память"""
+
+    body: bytes
+    content_type: str
+    etag: str
+    cache_control: str
+    gzip: bytes | None = None
+    brotli: bytes | None = None
+
+
+def load_assets(root):
+    """Чтение всех файлов каталога в память с предварительным сжатием"""
+    root = Path(root)
+    assets = {}
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix in (".gz", ".br"):
+            continue
+        body = path.read_bytes()
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type == "text/javascript":
+            content_type = "application/javascript"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+        compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+        assets["/" + path.relative_to(root).as_posix()] = Asset(
+            body=body,
+            content_type=content_type,
+            etag='"' + hashlib.sha1(body).hexdigest() + '"',
+            cache_control=IMMUTABLE_CACHE if HASHED_NAME.search(path.name) else REVALIDATE_CACHE,
+            gzip=_precompressed(path, ".gz", body, gzip.compress if compressible else None),
+            brotli=_precompressed(path, ".br", body, brotli.compress if compressible and brotli else None),
+        )
+    return assets
+
+
+def _precompressed(path, suffix, body, compress):
+    # Готовые .gz/.br рядом с файлом (если сборка их создала) используются как есть
+    ready = path.with_name(path.name + suffix)
+    if ready.is_file():
+        return ready.read_bytes()
+    if compress is None:
+        return None
+    compressed = compress(body)
+    return compressed if len(compressed) < len(body) else None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 с Content-Length даёт keep-alive соединения
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        path = unquote(urlsplit(self.path).path)
+        assets = self.server.assets
+        asset = assets.get(path)
+        if asset is None and path.endswith("/"):
+            asset = assets.get(path + "index.html")
+        if asset is None and "." not in path.rsplit("/", 1)[-1]:
+            # SPA: маршруты приложения отдают index.html
+            asset = assets.get("/index.html")
+        if asset is None:
+            self.send_error(404)
+            return
+
+        if self.headers.get("If-None-Match") == asset.etag:
+            self.send_response(304)
+            self.send_header("ETag", asset.etag)
+            self.send_header("Cache-Control", asset.cache_control)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body, encoding = self._negotiate(asset)
+        self.send_response(200)
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", asset.cache_control)
+        self.send_header("ETag", asset.etag)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _negotiate(self, asset):
+        accepted = {
+            item.split(";")[0].strip()
+            for item in self.headers.get("Accept-Encoding", "").split(",")
+        }
+        if asset.brotli is not None and "br" in accepted:
+            return asset.brotli, "br"
+        if asset.gzip is not None and "gzip" in accepted:
+            return asset.gzip, "gzip"
+        return asset.body, None
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StaticServer:
+    """Многопоточный сервер статики с кешем в памяти.
+
+    Порт занимается в конструкторе, поэтому сервер готов принимать
+    соединения сразу, без опроса.
+    """
+
+    def __init__(self, root, host="127.0.0.1", port=0):
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.assets = load_assets(root)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="static-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
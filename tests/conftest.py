@@ -1,11 +1,23 @@
+import os
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
+from selenium.common.exceptions import WebDriverException
+from catalog.runner import StepTrie
+from drivers.contexts import user_context
+from drivers.dom.driver import DomDriver
+from drivers.factory import create_driver
+from drivers.parallel import auto_worker_count, scheduling_key
+from drivers.pool import DriverPool
+from drivers.profiles import build_profile_template, template_key
+from drivers.resolver import SOURCES, DriverResolver
+from oracle.cases import generate_cases
+from page_objects.transfer_page import TransferPage
+from server.sharding import parse_urls, shard_url
+from server.static import StaticServer
+
+pytest_plugins = ["plugins.startup", "plugins.timing", "plugins.eventlog", "plugins.history", "plugins.artifacts"]
+
+# Сервер статики controller'а xdist, общий origin прогретого профиля для всех воркеров
+shared_origin_key = pytest.StashKey[StaticServer]()
 
 def pytest_addoption(parser):
     """Добавление опций командной строки для pytest"""
@@ -24,9 +36,187 @@ def pytest_addoption(parser):
     parser.addoption(
         "--base-url", 
         action="store", 
-        default="http://localhost:8000",
-        help="Base URL for tests"
+        default=os.environ.get("BASE_URL"),
+        help="Base URL for tests; a comma-separated list is spread round-robin over xdist workers. "
+             "Without it dist/ is served in-process for each worker"
+    )
+    parser.addoption(
+        "--parallel",
+        action="store",
+        default=None,
+        help="Run tests on pytest-xdist workers: 'auto' sizes them from CPUs and free memory "
+             "per browser, a number sets them explicitly"
+    )
+    parser.addoption(
+        "--engine",
+        action="store",
+        default="browser",
+        choices=("browser", "dom"),
+        help="Run pages in a real browser or in the jsdom-based DOM engine"
+    )
+    parser.addoption(
+        "--fast-input",
+        action="store_true",
+        default=False,
+        help="Fill inputs with one script call instead of per-character send_keys; "
+             "tests marked keystrokes still type"
+    )
+    parser.addoption(
+        "--bidi",
+        action="store_true",
+        default=False,
+        help="Enable WebDriver BiDi so alerts arrive as browsingContext.userPromptOpened events"
+    )
+    parser.addoption(
+        "--pool-size",
+        action="store",
+        type=int,
+        default=1,
+        help="Maximum number of browsers kept in the driver pool"
+    )
+    parser.addoption(
+        "--driver-max-uses",
+        action="store",
+        type=int,
+        default=50,
+        help="Recycle a pooled browser after this many tests"
+    )
+    parser.addoption(
+        "--soft-reset",
+        action="store_true",
+        default=False,
+        help="Keep the app open between tests on a pooled browser and remount it through the history API"
+    )
+    parser.addoption(
+        "--user-contexts",
+        action="store_true",
+        default=False,
+        help="Run every test and sweep case in its own BiDi user context (an isolated tab) "
+             "of a shared browser; implies --bidi"
+    )
+    parser.addoption(
+        "--warm-profile",
+        action="store_true",
+        default=False,
+        help="Start every browser from a template profile with the app's assets already cached; "
+             "without --base-url the xdist workers then share one dist/ server of the controller"
+    )
+    parser.addoption(
+        "--driver-path",
+        action="store",
+        default=None,
+        help="Use this chromedriver/geckodriver binary instead of resolving one"
+    )
+    parser.addoption(
+        "--driver-source",
+        action="store",
+        default="manager",
+        choices=SOURCES,
+        help="How to resolve the driver binary: webdriver-manager, Selenium Manager or offline cache only"
+    )
+    parser.addoption(
+        "--driver-version",
+        action="store",
+        default=None,
+        help="Pin the driver version kept in the local cache"
+    )
+    parser.addoption(
+        "--driver-cache",
+        action="store",
+        default=None,
+        help="Directory of the local driver cache (default: .drivers/)"
+    )
+    parser.addoption(
+        "--sweep-concurrency",
+        action="store",
+        type=int,
+        default=8,
+        help="Number of browser sessions a sweep test drives concurrently from one event loop"
+    )
+    parser.addoption(
+        "--oracle-cases",
+        action="store",
+        type=int,
+        default=500,
+        help="Number of randomized cases checked against the reference model"
     )
+    parser.addoption(
+        "--oracle-seed",
+        action="store",
+        type=int,
+        default=0,
+        help="Seed of the randomized reference-model cases"
+    )
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """Включение xdist для --parallel до того, как его разберёт сам xdist"""
+    parallel = config.getoption("--parallel")
+    if parallel is None:
+        return
+    if hasattr(config, "workerinput"):
+        # Воркер разбирает исходную командную строку, где --dist не было
+        config.option.loadgroup = config.workerinput.get("loadgroup", False)
+        return
+    if not config.pluginmanager.hasplugin("xdist"):
+        raise pytest.UsageError("--parallel requires pytest-xdist")
+    if parallel != "auto" and not parallel.isdigit():
+        raise pytest.UsageError(f"--parallel expects 'auto' or a number of workers, got {parallel!r}")
+    config.option.numprocesses = parallel if parallel == "auto" else int(parallel)
+    if config.option.dist == "no":
+        config.option.dist = "loadgroup"
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Передача воркеру режима loadgroup, выбранного через --parallel, и общего origin для --warm-profile"""
+    node.workerinput["loadgroup"] = node.config.option.dist == "loadgroup"
+    config = node.config
+    if config.getoption("--warm-profile") and config.getoption("--engine") != "dom" and not config.getoption("--base-url"):
+        # Кеш браузера привязан к origin: при своём сервере у каждого воркера
+        # шаблон прогревался бы отдельно, поэтому dist/ раздаёт один сервер controller'а
+        if shared_origin_key not in config.stash:
+            config.stash[shared_origin_key] = StaticServer(config.rootpath / "dist").start()
+            config.add_cleanup(config.stash[shared_origin_key].stop)
+        node.workerinput["base_url"] = config.stash[shared_origin_key].url
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """Число воркеров для -n auto с учётом памяти под браузеры"""
+    if os.environ.get("PYTEST_XDIST_AUTO_NUM_WORKERS"):
+        return None
+    browser = "dom" if config.getoption("--engine") == "dom" else config.getoption("--browser")
+    return auto_worker_count(browser, pool_size=config.getoption("--pool-size"))
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Группы xdist по браузеру и состоянию страницы; критичные тесты - только в браузере"""
+    engine = config.getoption("--engine")
+    # Опцию loadgroup выставляет воркер xdist; он же дописывает группу к nodeid
+    if getattr(config.option, "loadgroup", False):
+        browser = "dom" if engine == "dom" else config.getoption("--browser")
+        for item in items:
+            key = scheduling_key(item, browser)
+            if key is not None and item.get_closest_marker("xdist_group") is None:
+                item.add_marker(pytest.mark.xdist_group(key))
+    if engine != "dom":
+        return
+    skip_critical = pytest.mark.skip(reason="critical tests run only with --engine=browser")
+    for item in items:
+        if "critical" in item.keywords:
+            item.add_marker(skip_critical)
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Отметка теста, упавшего на ошибке WebDriver: его браузер не возвращается в пул"""
+    report = yield
+    if call.when == "call" and call.excinfo is not None and call.excinfo.errisinstance(WebDriverException):
+        item.webdriver_failed = True
+    return report
+
+@pytest.fixture(scope="session")
+def engine(request):
+    """Движок выполнения страниц: браузер или jsdom"""
+    return request.config.getoption("--engine")
 
 @pytest.fixture(scope="session")
 def browser_name(request):
@@ -39,40 +229,139 @@ def headless(request):
     return request.config.getoption("--headless")
 
 @pytest.fixture(scope="session")
-def base_url(request):
-    """Получение базового URL"""
-    return request.config.getoption("--base-url")
+def static_server(request):
+    """Сервер статики dist/, запущенный внутри процесса pytest"""
+    with StaticServer(request.config.rootpath / "dist") as server:
+        yield server
 
-@pytest.fixture
-def driver(browser_name, headless):
-    """Создание экземпляра WebDriver"""
-    if browser_name.lower() == "chrome":
-        options = ChromeOptions()
-        if headless:
-            options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-        
-        service = ChromeService(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        
-    elif browser_name.lower() == "firefox":
-        options = FirefoxOptions()
-        if headless:
-            options.add_argument("--headless")
-        options.add_argument("--width=1920")
-        options.add_argument("--height=1080")
-        
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=options)
+@pytest.fixture(scope="session")
+def base_url(request, engine):
+    """Получение базового URL для текущего воркера"""
+    urls = parse_urls(request.config.getoption("--base-url") or "")
+    if urls:
+        return shard_url(urls)
+    if engine == "dom":
+        # jsdom читает dist/ с диска, сервер не нужен
+        return TransferPage.DEFAULT_BASE_URL
+    if "base_url" in getattr(request.config, "workerinput", {}):
+        return request.config.workerinput["base_url"]
+    # У каждого воркера xdist своя сессия, а значит и свой сервер на своём порту
+    return request.getfixturevalue("static_server").url
+
+@pytest.fixture(scope="session")
+def driver_binary(request, browser_name):
+    """Путь к бинарнику драйвера, разрешённый один раз за сессию"""
+    resolver = DriverResolver(
+        source=request.config.getoption("--driver-source"),
+        version=request.config.getoption("--driver-version"),
+        driver_path=request.config.getoption("--driver-path"),
+        cache_dir=request.config.getoption("--driver-cache"),
+    )
+    return resolver.resolve(browser_name)
+
+@pytest.fixture(scope="session")
+def profile_template(request, browser_name, headless, base_url, driver_binary, tmp_path_factory):
+    """Прогретый профиль браузера, собранный один раз для origin базового URL"""
+    # Каталог над basetemp воркеров общий для всех воркеров xdist
+    root = tmp_path_factory.getbasetemp()
+    if hasattr(request.config, "workerinput"):
+        root = root.parent
+    dist = request.config.rootpath / "dist"
+    return build_profile_template(
+        browser_name,
+        lambda profile_dir: create_driver(browser_name, headless, driver_binary, profile_dir=profile_dir),
+        root / "profile-templates" / template_key(browser_name, base_url, dist / "assets"),
+        f"{base_url}/",
+    )
+
+@pytest.fixture(scope="session")
+def driver_pool(request, engine, browser_name, headless, tmp_path_factory):
+    """Пул браузеров, общий для всей сессии"""
+    if engine == "dom":
+        factory = lambda: DomDriver(request.config.rootpath / "dist")
     else:
-        raise ValueError(f"Unsupported browser: {browser_name}")
+        driver_binary = request.getfixturevalue("driver_binary")
+        template = None
+        if request.config.getoption("--warm-profile"):
+            template = request.getfixturevalue("profile_template")
+        # basetemp у каждого воркера xdist свой, так что профили не пересекаются
+        factory = lambda: create_driver(
+            browser_name, headless, driver_binary,
+            profile_dir=tmp_path_factory.mktemp(f"{browser_name}-profile"),
+            bidi=request.config.getoption("--bidi") or request.config.getoption("--user-contexts"),
+            profile_template=template,
+        )
+    
+    pool = DriverPool(
+        factory,
+        size=request.config.getoption("--pool-size"),
+        max_uses=request.config.getoption("--driver-max-uses"),
+        keep_page=request.config.getoption("--soft-reset"),
+    )
+    
+    yield pool
+    
+    pool.close()
+
+@pytest.fixture(scope="session")
+def oracle_cases(request):
+    """Случайные сценарии для сверки страницы с эталонной моделью"""
+    return generate_cases(
+        request.config.getoption("--oracle-cases"),
+        seed=request.config.getoption("--oracle-seed"),
+    )
+
+@pytest.fixture
+def sweep(request, engine, browser_name, headless, base_url):
+    """Прогон проверки по списку кейсов в асинхронных сессиях браузера одного event loop"""
+    if engine == "dom":
+        pytest.skip("sweeps drive real browser sessions")
+    # asyncio и асинхронный клиент нужны только переборам
+    import asyncio
+    from drivers.async_client import AsyncBrowser
+    from page_objects.async_transfer_page import run_sweep
     
-    driver.implicitly_wait(10)
-    driver.maximize_window()
+    driver_binary = request.getfixturevalue("driver_binary")
+    concurrency = request.config.getoption("--sweep-concurrency")
+    contexts = request.config.getoption("--user-contexts")
     
-    yield driver
+    async def run(cases, check):
+        async with AsyncBrowser(browser_name, headless, driver_binary) as browser:
+            return await run_sweep(browser, base_url, cases, check, concurrency, contexts=contexts)
     
-    driver.quit()
+    return lambda cases, check: asyncio.run(run(cases, check))
+
+@pytest.fixture(scope="session")
+def catalog_trie():
+    """Шаги кейсов каталога, уже пройденные в этой сессии"""
+    return StepTrie()
+
+@pytest.fixture
+def driver(request, engine, driver_pool):
+    """Выдача экземпляра WebDriver из пула"""
+    driver = driver_pool.acquire()
+    broken = False
+    
+    try:
+        if engine == "browser" and request.config.getoption("--user-contexts"):
+            # Изоляция теста - отдельный контекст, а не отдельный браузер
+            with user_context(driver):
+                yield driver
+        else:
+            yield driver
+    except Exception:
+        # Контекст не закрылся: браузер в неизвестном состоянии, его место в пуле освобождается
+        broken = True
+        raise
+    finally:
+        # После ошибки WebDriver браузер пересоздаётся, даже если reset() прошёл бы
+        broken = broken or getattr(request.node, "webdriver_failed", False)
+        driver_pool.release(driver, broken=broken)
+
+@pytest.fixture
+def page(request, driver, base_url):
+    """Страница переводов, открываемая по базовому URL воркера"""
+    fast_input = request.config.getoption("--fast-input") and request.node.get_closest_marker("keystrokes") is None
+    return TransferPage(
+        driver, base_url, fast_input=fast_input, soft_reset=request.config.getoption("--soft-reset")
+    )
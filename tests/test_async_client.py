@@ -0,0 +1,205 @@
+import asyncio
+import json
+
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchElementException, WebDriverException
+
+from drivers.async_client import HttpPool, _command
+
+
+def response(status, payload, headers=()):
+    """Ответ с телом фиксированной длины"""
+    body = json.dumps(payload).encode()
+    head = [f"HTTP/1.1 {status} OK", f"Content-Length: {len(body)}", *headers]
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+
+def chunked(payload, size=7):
+    """Ответ с телом, разбитым на куски (Transfer-Encoding: chunked)"""
+    body = json.dumps(payload).encode()
+    chunks = b"".join(
+        f"{len(body[i:i + size]):x};ext=1\r\n".encode() + body[i:i + size] + b"\r\n"
+        for i in range(0, len(body), size)
+    )
+    return b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n" + chunks + b"0\r\nX-Trailer: 1\r\n\r\n"
+
+
+class DriverStub:
+    """Сервер драйвера на loopback: отвечает заготовленными ответами по очереди.
+
+    Ответ - байты или (байты, закрыть соединение после ответа).
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.connections = 0
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self):
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/prefix"
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while request_line := await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                method, path, _ = request_line.decode().split()
+                self.requests.append((method, path, json.loads(body) if body else None))
+                reply = self.responses.pop(0)
+                data, close = reply if isinstance(reply, tuple) else (reply, False)
+                writer.write(data)
+                await writer.drain()
+                if close:
+                    break
+        finally:
+            writer.close()
+
+
+def run(scenario, *responses):
+    """Прогон scenario(pool, stub) против заглушки драйвера"""
+    async def main():
+        async with DriverStub(*responses) as stub:
+            pool = HttpPool(stub.url)
+            try:
+                return await scenario(pool, stub)
+            finally:
+                await pool.close()
+    return asyncio.run(main())
+
+
+class TestHttpPool:
+    """HTTP/1.1 клиент асинхронных сессий против сервера на loopback"""
+
+    @pytest.mark.smoke
+    def test_content_length_keep_alive(self):
+        """Тест: HTTP-клиент. Тела фиксированной длины, соединение переиспользуется"""
+        async def scenario(pool, stub):
+            first = await pool.request("POST", "/session", {"capabilities": {}})
+            second = await pool.request("GET", "/session/1/url")
+            return first, second, stub
+
+        first, second, stub = run(scenario, response(200, {"value": {"sessionId": "1"}}), response(200, {"value": "http://app/"}))
+
+        assert first == (200, {"value": {"sessionId": "1"}})
+        assert second == (200, {"value": "http://app/"})
+        assert stub.requests == [("POST", "/prefix/session", {"capabilities": {}}), ("GET", "/prefix/session/1/url", None)]
+        assert stub.connections == 1
+
+    @pytest.mark.smoke
+    def test_chunked_body(self):
+        """Тест: HTTP-клиент. Тело по кускам с расширениями и трейлером"""
+        payload = {"value": {"text": "Перевод " * 10}}
+
+        async def scenario(pool, stub):
+            return await pool.request("GET", "/status"), await pool.request("GET", "/status"), stub
+
+        first, second, stub = run(scenario, chunked(payload), chunked(payload))
+
+        assert first == second == (200, payload)
+        assert stub.connections == 1
+
+    @pytest.mark.smoke
+    def test_connection_close_is_not_reused(self):
+        """Тест: HTTP-клиент. После Connection: close запрос идёт по новому соединению"""
+        async def scenario(pool, stub):
+            await pool.request("GET", "/status")
+            await pool.request("GET", "/status")
+            return stub
+
+        stub = run(scenario, (response(200, {"value": 1}, ["Connection: close"]), True), response(200, {"value": 2}))
+
+        assert stub.connections == 2
+
+    @pytest.mark.smoke
+    def test_body_until_eof(self):
+        """Тест: HTTP-клиент. Тело без длины читается до закрытия соединения"""
+        async def scenario(pool, stub):
+            return await pool.request("GET", "/status"), await pool.request("GET", "/status"), stub
+
+        first, second, stub = run(
+            scenario,
+            (b'HTTP/1.1 200 OK\r\n\r\n{"value": 1}', True),
+            (b'HTTP/1.1 200 OK\r\n\r\n{"value": 2}', True),
+        )
+
+        assert (first, second) == ((200, {"value": 1}), (200, {"value": 2}))
+        assert stub.connections == 2
+
+    @pytest.mark.smoke
+    def test_stale_connection_retries_get(self):
+        """Тест: HTTP-клиент. GET по закрытому сервером простаивавшему соединению повторяется"""
+        async def scenario(pool, stub):
+            await pool.request("GET", "/status")
+            # Сервер закрыл соединение, не предупредив о нём заголовком
+            await asyncio.sleep(0.05)
+            return await pool.request("GET", "/session/1/url"), stub
+
+        result, stub = run(scenario, (response(200, {"value": 1}), True), response(200, {"value": "http://app/"}))
+
+        assert result == (200, {"value": "http://app/"})
+        assert [path for _, path, _ in stub.requests] == ["/prefix/status", "/prefix/session/1/url"]
+        assert stub.connections == 2
+
+    @pytest.mark.smoke
+    def test_stale_connection_does_not_retry_post(self):
+        """Тест: HTTP-клиент. POST по закрытому соединению не повторяется: клик мог уже выполниться"""
+        async def scenario(pool, stub):
+            await pool.request("GET", "/status")
+            await asyncio.sleep(0.05)
+            with pytest.raises(ConnectionResetError, match="POST /session/1/element/e/click"):
+                await pool.request("POST", "/session/1/element/e/click", {})
+            return stub
+
+        stub = run(scenario, (response(200, {"value": 1}), True), response(200, {"value": None}))
+
+        assert [method for method, _, _ in stub.requests] == ["GET"]
+        assert stub.connections == 1
+
+
+class TestCommand:
+    """Ответы драйвера на команды: значение или исключение Selenium"""
+
+    @pytest.mark.smoke
+    @pytest.mark.parametrize("status,payload,exception", [
+        (404, {"value": {"error": "no such element", "message": "#missing"}}, NoSuchElementException),
+        (404, {"value": {"error": "invalid session id", "message": "gone"}}, InvalidSessionIdException),
+        (500, {"value": {"error": "made up error", "message": "odd"}}, WebDriverException),
+        (502, {"value": "Bad Gateway"}, WebDriverException),
+    ])
+    def test_error_payload_raises(self, status, payload, exception):
+        """Тест: HTTP-клиент. Код ошибки W3C превращается в исключение Selenium"""
+        async def scenario(pool, stub):
+            with pytest.raises(exception) as raised:
+                await _command(pool, "GET", "/session/1/element")
+            return raised.value
+
+        error = run(scenario, response(status, payload))
+
+        assert type(error) is exception
+        if isinstance(payload["value"], dict):
+            assert payload["value"]["message"] in error.msg
+        else:
+            assert f"HTTP {status}" in error.msg
+
+    @pytest.mark.smoke
+    def test_value_is_returned(self):
+        """Тест: HTTP-клиент. Успешная команда возвращает поле value"""
+        async def scenario(pool, stub):
+            return await _command(pool, "GET", "/session/1/url")
+
+        assert run(scenario, response(200, {"value": "http://app/"})) == "http://app/"
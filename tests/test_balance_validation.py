@@ -1,13 +1,11 @@
 import pytest
-from page_objects.transfer_page import TransferPage
 
 class TestBalanceValidation:
     """Тесты валидации баланса и резерва"""
     
     @pytest.mark.smoke
-    def test_reserve_not_greater_than_balance(self, driver):
+    def test_reserve_not_greater_than_balance(self, page):
         """Тест: Сумма резерва НЕ больше суммы на счету"""
-        page = TransferPage(driver)
         page.open_page(balance=50000, reserved=30000)
         
         # Проверяем отображение корректных значений
@@ -18,9 +16,8 @@ class TestBalanceValidation:
         assert "30" in reserved_text or "30'000" in reserved_text
     
     @pytest.mark.critical
-    def test_reserve_greater_than_balance(self, driver):
+    def test_reserve_greater_than_balance(self, page):
         """Тест: Сумма резерва больше суммы на счету"""
-        page = TransferPage(driver)
         page.open_page(balance=50000, reserved=60000)
         
         # Проверяем, что появилось сообщение об ошибке
@@ -29,9 +26,8 @@ class TestBalanceValidation:
     
     @pytest.mark.regression
     @pytest.mark.parametrize("balance", [0, -10000])
-    def test_zero_negative_balance(self, driver, balance):
+    def test_zero_negative_balance(self, page, balance):
         """Тест: Нулевая и отрицательная сумма 'На счету'"""
-        page = TransferPage(driver)
         page.open_page(balance=balance, reserved=20000)
         
         # Проверяем, что появилось сообщение об ошибке
@@ -40,9 +36,8 @@ class TestBalanceValidation:
     
     @pytest.mark.regression
     @pytest.mark.parametrize("reserved", [0, -10000])
-    def test_zero_negative_reserved(self, driver, reserved):
+    def test_zero_negative_reserved(self, page, reserved):
         """Тест: Нулевая и отрицательная сумма 'Резерв'"""
-        page = TransferPage(driver)
         page.open_page(balance=20000, reserved=reserved)
         
         # Проверяем, что появилось сообщение об ошибке для отрицательных значений
@@ -55,12 +50,22 @@ class TestBalanceValidation:
         (0, 0),
         (-10000, -10000),
     ])
-    def test_zero_negative_both_values(self, driver, balance, reserved):
+    def test_zero_negative_both_values(self, page, balance, reserved):
         """Тест: Нулевое и отрицательное значение 'На счету' и 'Резерв'"""
-        page = TransferPage(driver)
         page.open_page(balance=balance, reserved=reserved)
         
         # Проверяем, что появилось сообщение об ошибке для отрицательных значений
         if balance < 0 or reserved < 0:
             error_message = page.get_error_message()
             assert len(error_message) > 0
+    
+    @pytest.mark.regression
+    def test_reopen_resets_form(self, page):
+        """Тест: Повторное открытие страницы показывает новый баланс и пустую форму"""
+        page.open_prefilled(balance=50000, reserved=30000, card="1212 2323 5666 5555")
+        page.open_page(balance=70000, reserved=10000)
+        
+        # Форма перевода из прошлого состояния не должна остаться
+        assert "70" in page.get_balance_text()
+        assert "10" in page.get_reserved_text()
+        assert not page.is_card_number_field_visible()
@@ -0,0 +1,332 @@
+import asyncio
+import base64
+import hashlib
+import json
+
+import pytest
+from selenium.common.exceptions import JavascriptException, NoSuchFrameException, TimeoutException, WebDriverException
+
+from drivers.bidi_client import WEBSOCKET_GUID, BidiConnection, ContextDriver, ContextElement, WebSocket, _mask
+
+_CONTINUATION, _TEXT, _CLOSE, _PING, _PONG = 0x0, 0x1, 0x8, 0x9, 0xA
+
+
+class Peer:
+    """Серверная сторона соединения WebSocket: кадры без маски, как у браузера"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def handshake(self):
+        key = None
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            if name.strip().lower() == "sec-websocket-key":
+                key = value.strip()
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        self.writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n"
+            "\r\n"
+        ).encode())
+
+    async def receive_frame(self):
+        """(fin, opcode, длина в заголовке, payload, маска)"""
+        first, second = await self.reader.readexactly(2)
+        length = second & 0x7F
+        marker = length
+        if length == 126:
+            length = int.from_bytes(await self.reader.readexactly(2), "big")
+        elif length == 127:
+            length = int.from_bytes(await self.reader.readexactly(8), "big")
+        mask = await self.reader.readexactly(4) if second & 0x80 else None
+        payload = await self.reader.readexactly(length)
+        return bool(first & 0x80), first & 0x0F, marker, payload if mask is None else _mask(payload, mask), mask
+
+    async def receive(self):
+        """Текст следующего кадра"""
+        return (await self.receive_frame())[3].decode()
+
+    def send_frame(self, opcode, payload, fin=True):
+        header = bytearray([(0x80 if fin else 0) | opcode])
+        if len(payload) < 126:
+            header.append(len(payload))
+        elif len(payload) < 1 << 16:
+            header.append(126)
+            header += len(payload).to_bytes(2, "big")
+        else:
+            header.append(127)
+            header += len(payload).to_bytes(8, "big")
+        self.writer.write(bytes(header) + payload)
+
+    def send(self, text):
+        self.send_frame(_TEXT, text.encode())
+
+
+def run(server, client):
+    """Прогон client(url) против server(peer) на loopback; результат client"""
+    async def main():
+        served = asyncio.get_running_loop().create_future()
+        done = asyncio.get_running_loop().create_future()
+
+        async def serve(reader, writer):
+            peer = Peer(reader, writer)
+            try:
+                await peer.handshake()
+                await server(peer)
+                await writer.drain()
+                served.set_result(None)
+                await done
+            except Exception as error:
+                served.set_exception(error)
+            finally:
+                writer.close()
+
+        listener = await asyncio.start_server(serve, "127.0.0.1", 0)
+        host, port = listener.sockets[0].getsockname()[:2]
+        try:
+            result = await client(f"ws://{host}:{port}/session/1")
+            # Проверки на стороне сервера (например, полученный pong) доходят до теста
+            await asyncio.wait_for(served, 5)
+            return result
+        finally:
+            done.set_result(None)
+            listener.close()
+            await listener.wait_closed()
+    return asyncio.run(main())
+
+
+class TestWebSocket:
+    """Кадры RFC 6455 против сервера на loopback"""
+
+    @pytest.mark.smoke
+    @pytest.mark.parametrize("size,marker", [(10, 10), (300, 126), (70000, 127)])
+    def test_payload_lengths_and_masking(self, size, marker):
+        """Тест: WebSocket. Длина 7, 16 и 64 бита в обе стороны, кадры клиента замаскированы"""
+        text = ("transfer " * size)[:size]
+        frames = []
+
+        async def server(peer):
+            frame = await peer.receive_frame()
+            frames.append(frame)
+            peer.send(frame[3].decode())
+
+        async def client(url):
+            socket = await WebSocket.connect(url)
+            await socket.send(text)
+            echo = await socket.receive()
+            await socket.close()
+            return echo
+
+        assert run(server, client) == text
+        fin, opcode, length_marker, payload, mask = frames[0]
+        assert (fin, opcode, payload.decode()) == (True, _TEXT, text)
+        assert length_marker == marker
+        assert mask is not None
+        assert _mask(_mask(payload, mask), mask) == payload
+
+    @pytest.mark.smoke
+    def test_fragmented_message_with_ping(self):
+        """Тест: WebSocket. Сообщение из нескольких кадров собирается, ping посреди него получает pong"""
+        pongs = []
+
+        async def server(peer):
+            peer.send_frame(_TEXT, '{"id": 1, '.encode(), fin=False)
+            peer.send_frame(_PING, b"alive")
+            peer.send_frame(_CONTINUATION, '"result": "пере'.encode(), fin=False)
+            peer.send_frame(_CONTINUATION, 'вод"}'.encode())
+            await peer.writer.drain()
+            pongs.append(await peer.receive_frame())
+
+        async def client(url):
+            socket = await WebSocket.connect(url)
+            return await socket.receive()
+
+        assert json.loads(run(server, client)) == {"id": 1, "result": "перевод"}
+        fin, opcode, _, payload, mask = pongs[0]
+        assert (opcode, payload) == (_PONG, b"alive")
+        assert mask is not None
+
+    @pytest.mark.smoke
+    def test_close_frame(self):
+        """Тест: WebSocket. Кадр close завершает чтение ошибкой соединения"""
+        async def server(peer):
+            peer.send_frame(_CLOSE, b"")
+
+        async def client(url):
+            socket = await WebSocket.connect(url)
+            with pytest.raises(ConnectionResetError):
+                await socket.receive()
+
+        run(server, client)
+
+    @pytest.mark.smoke
+    def test_rejected_handshake(self):
+        """Тест: WebSocket. Ответ без 101 Switching Protocols - ошибка WebDriver"""
+        async def reject(reader, writer):
+            await reader.readline()
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            writer.close()
+
+        async def main():
+            listener = await asyncio.start_server(reject, "127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                with pytest.raises(WebDriverException, match="404"):
+                    await WebSocket.connect(f"ws://127.0.0.1:{port}/session/1")
+            finally:
+                listener.close()
+                await listener.wait_closed()
+
+        asyncio.run(main())
+
+
+class TestBidiConnection:
+    """Команды BiDi с ответами по id"""
+
+    @pytest.mark.smoke
+    def test_replies_are_matched_by_id(self):
+        """Тест: BiDi. Ответы в обратном порядке и события доходят до своих команд"""
+        async def server(peer):
+            first = json.loads(await peer.receive())
+            second = json.loads(await peer.receive())
+            peer.send(json.dumps({"type": "event", "method": "log.entryAdded", "params": {}}))
+            peer.send(json.dumps({"type": "success", "id": second["id"], "result": {"n": 2}}))
+            peer.send(json.dumps({"type": "error", "id": first["id"], "error": "no such frame", "message": "gone"}))
+
+        async def client(url):
+            connection = await BidiConnection.connect(url)
+            try:
+                first = asyncio.ensure_future(connection.command("browsingContext.getTree", {}))
+                await asyncio.sleep(0)
+                second = await connection.command("browsingContext.getTree", {})
+                with pytest.raises(NoSuchFrameException, match="gone"):
+                    await first
+                return second
+            finally:
+                await connection.close()
+
+        assert run(server, client) == {"n": 2}
+
+    @pytest.mark.smoke
+    @pytest.mark.parametrize("failure", ["close", "bad json"])
+    def test_pending_command_fails_when_reader_dies(self, failure):
+        """Тест: BiDi. Ожидающая команда падает, как только читатель соединения остановился"""
+        async def server(peer):
+            await peer.receive()
+            if failure == "close":
+                peer.send_frame(_CLOSE, b"")
+            else:
+                peer.send("not json")
+
+        async def client(url):
+            connection = await BidiConnection.connect(url)
+            connection.timeout = 5
+            try:
+                with pytest.raises(WebDriverException, match="BiDi connection lost"):
+                    await connection.command("session.status", {})
+                # Следующие команды падают сразу, без отправки
+                with pytest.raises(WebDriverException, match="BiDi connection lost"):
+                    await connection.command("session.status", {})
+            finally:
+                await connection.close()
+
+        run(server, client)
+
+    @pytest.mark.smoke
+    def test_command_timeout(self):
+        """Тест: BiDi. Команда без ответа завершается TimeoutException через timeout"""
+        async def server(peer):
+            await peer.receive()
+
+        async def client(url):
+            connection = BidiConnection(await WebSocket.connect(url), timeout=0.1)
+            try:
+                with pytest.raises(TimeoutException, match="script.callFunction"):
+                    await connection.command("script.callFunction", {})
+                assert not connection._pending
+            finally:
+                await connection.close()
+
+        run(server, client)
+
+
+class RecordingConnection:
+    """Соединение BiDi, отвечающее заготовленным результатом и запоминающее параметры"""
+
+    def __init__(self, result):
+        self.result = result
+        self.params = None
+
+    async def command(self, method, params):
+        self.params = params
+        return self.result
+
+
+class TestRemoteValues:
+    """Аргументы и результаты script.callFunction"""
+
+    @pytest.mark.smoke
+    def test_arguments_are_serialized(self):
+        """Тест: BiDi. Элемент, списки, словари и примитивы передаются как значения BiDi"""
+        connection = RecordingConnection({"type": "success", "result": {"type": "undefined"}})
+        driver = ContextDriver(connection, "context-1", "user-1")
+        element = ContextElement(driver, "node-1")
+
+        result = asyncio.run(driver.execute_script("return 1;", element, [1, 2.5, "a"], {"k": None, "b": True}))
+
+        assert result is None
+        assert connection.params["target"] == {"context": "context-1"}
+        assert connection.params["arguments"] == [
+            {"sharedId": "node-1"},
+            {"type": "array", "value": [
+                {"type": "number", "value": 1},
+                {"type": "number", "value": 2.5},
+                {"type": "string", "value": "a"},
+            ]},
+            {"type": "object", "value": [
+                ["k", {"type": "null"}],
+                ["b", {"type": "boolean", "value": True}],
+            ]},
+        ]
+
+    @pytest.mark.smoke
+    def test_results_are_deserialized(self):
+        """Тест: BiDi. Узлы, массивы и объекты из результата становятся ContextElement, list и dict"""
+        connection = RecordingConnection({"type": "success", "result": {"type": "array", "value": [
+            {"type": "node", "sharedId": "node-7", "value": {"nodeType": 1}},
+            {"type": "number", "value": 3},
+            {"type": "object", "value": [
+                ["text", {"type": "string", "value": "1000"}],
+                ["missing", {"type": "null"}],
+                [{"type": "number", "value": 1}, {"type": "boolean", "value": False}],
+            ]},
+        ]}})
+        driver = ContextDriver(connection, "context-1", "user-1")
+
+        node, number, mapping = asyncio.run(driver.execute_script("return [];"))
+
+        assert node == ContextElement(driver, "node-7")
+        assert number == 3
+        assert mapping == {"text": "1000", "missing": None, 1: False}
+
+    @pytest.mark.smoke
+    def test_script_exception(self):
+        """Тест: BiDi. Исключение скрипта поднимается как JavascriptException"""
+        connection = RecordingConnection({"type": "exception", "exceptionDetails": {"text": "boom"}})
+        driver = ContextDriver(connection, "context-1", "user-1")
+
+        with pytest.raises(JavascriptException, match="boom"):
+            asyncio.run(driver.execute_script("throw new Error('boom');"))
+
+    @pytest.mark.smoke
+    def test_unsupported_argument(self):
+        """Тест: BiDi. Значение без представления в BiDi не отправляется"""
+        driver = ContextDriver(RecordingConnection({}), "context-1", "user-1")
+
+        with pytest.raises(TypeError, match="set"):
+            asyncio.run(driver.execute_script("return 1;", {1, 2}))
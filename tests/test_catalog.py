@@ -0,0 +1,46 @@
+import pytest
+from catalog.compiler import DEFAULT_SOURCES, load_catalog
+from catalog.runner import StepTrie, form_state, run_case
+
+def pytest_generate_tests(metafunc):
+    """Кейсы из test_cases.md и SECOND.md; индекс кешируется в .pytest_cache"""
+    if "catalog_case" not in metafunc.fixturenames:
+        return
+    cache = getattr(metafunc.config, "cache", None)
+    cases = load_catalog(DEFAULT_SOURCES, cache.mkdir("catalog") if cache is not None else None)
+    metafunc.parametrize("catalog_case", [
+        pytest.param(
+            case,
+            id=case.id,
+            marks=[pytest.mark.skip(reason=f"{case.title}: {case.unsupported}")] if case.unsupported else [],
+        )
+        for case in cases
+    ])
+
+class TestCatalog:
+    """Тест-кейсы из документов, выполняемые с общими префиксами шагов"""
+    
+    @pytest.mark.smoke
+    def test_catalog_compiles(self):
+        """Тест: Каталог. Документы разбираются, кейсы получают уникальные идентификаторы"""
+        cases = load_catalog(DEFAULT_SOURCES)
+        
+        assert len({case.id for case in cases}) == len(cases)
+        assert [case.id for case in cases if case.unsupported] == []
+    
+    @pytest.mark.smoke
+    def test_shared_prefix_is_restored(self):
+        """Тест: Каталог. Кейс продолжается с конца общего префикса, уже пройденного другим кейсом"""
+        cases = {case.id: case for case in load_catalog(DEFAULT_SOURCES)}
+        first, second = cases["test_cases-03-1"], cases["test_cases-03-2"]
+        trie = StepTrie()
+        trie.mark(first.steps)
+        
+        # Общие шаги: открытие страницы и выбор счёта; дальше - свой номер карты
+        assert trie.verified_depth(second.steps) == 2
+        assert form_state(second.steps[:2])["currency"] == "rub"
+    
+    @pytest.mark.regression
+    def test_scenario(self, page, catalog_case, catalog_trie):
+        """Тест: Кейс из каталога тест-кейсов"""
+        run_case(page, catalog_case, catalog_trie)
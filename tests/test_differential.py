@@ -0,0 +1,39 @@
+import pytest
+from oracle.differential import run_differential
+from oracle.transfer_rules import commission, expected_state
+
+class TestTransferRules:
+    """Дифференциальные тесты бизнес-правил перевода"""
+    
+    @pytest.mark.smoke
+    @pytest.mark.parametrize("amount,expected_commission", [
+        (1000, 100),
+        (2000, 200),
+        (4500, 450),
+        (10000, 1000),
+    ])
+    def test_model_commission(self, amount, expected_commission):
+        """Тест: Эталонная модель. Комиссия 10% совпадает с тест-кейсами"""
+        assert commission(amount) == expected_commission
+    
+    @pytest.mark.smoke
+    @pytest.mark.parametrize("card_number,amount,allowed", [
+        ("1212 2323 5666 5555", "1000", True),
+        ("1212 2323 5666 5555", "1000000", False),
+        ("1212 2323 5666 5555", "0", False),
+        ("1212 2323 5666 5555", "-1000", False),
+        ("1212 2323 5666 5555", "abc", False),
+        ("123456789012345", "1000", False),
+    ])
+    def test_model_transfer_allowed(self, card_number, amount, allowed):
+        """Тест: Эталонная модель. Доступность перевода совпадает с тест-кейсами"""
+        assert expected_state(30000, 20000, card_number, amount).transfer_allowed == allowed
+    
+    @pytest.mark.regression
+    def test_page_matches_model(self, page, oracle_cases):
+        """Тест: Страница ведёт себя так же, как эталонная модель, на случайных сценариях"""
+        mismatches = run_differential(page, oracle_cases)
+        
+        # Показываем первые расхождения, остальные только считаем
+        report = "\n".join(str(mismatch) for mismatch in mismatches[:20])
+        assert not mismatches, f"{len(mismatches)} mismatches with the reference model:\n{report}"
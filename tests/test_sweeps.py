@@ -0,0 +1,65 @@
+import pytest
+from oracle.transfer_rules import commission
+
+# Те же номера, что в test_transfer_validation.py::test_card_data_incorrect
+INCORRECT_CARD_NUMBERS = [
+    "123",  # < 16 цифр
+    "12345678901234567",  # > 16 цифр
+    "123456789012345",  # 15 цифр
+    "abcd efgh ijkl mnop",  # буквы
+    "!@#$ %^&* ()_+ ={}|",  # спецсимволы
+]
+
+# Суммы в пределах доступного остатка 30000 - 20000
+SWEEP_AMOUNTS = range(100, 10001, 100)
+
+class TestTransferSweeps:
+    """Переборы вводов в десятках сессий браузера из одного event loop"""
+    
+    @pytest.mark.regression
+    def test_card_data_incorrect_sweep(self, sweep):
+        """Тест: Рублевый перевод. Данные карты не корректны - все варианты сразу"""
+        async def check(page, card_number):
+            await page.open_page(balance=30000, reserved=20000)
+            await page.click_rubles_block()
+            await page.enter_card_number(card_number)
+            await page.assert_stays_absent(page.TRANSFER_AMOUNT_FIELD)
+        
+        failures = sweep(INCORRECT_CARD_NUMBERS, check)
+        
+        report = "\n".join(f"{card_number!r}: {error}" for card_number, error in failures)
+        assert not failures, f"{len(failures)} card numbers failed:\n{report}"
+    
+    @pytest.mark.regression
+    def test_commission_calculation_sweep(self, sweep):
+        """Тест: Рублевый перевод. Расчет комиссии на всём диапазоне сумм"""
+        async def check(page, amount):
+            await page.open_prefilled(balance=30000, reserved=20000, card="1212 2323 5666 5555", amount=amount)
+            commission_text = await page.get_commission_text()
+            assert commission_text.strip() == str(commission(amount)), commission_text
+        
+        failures = sweep(list(SWEEP_AMOUNTS), check)
+        
+        report = "\n".join(f"{amount}: {error}" for amount, error in failures[:20])
+        assert not failures, f"{len(failures)} amounts failed:\n{report}"
+    
+    @pytest.mark.regression
+    def test_user_contexts_do_not_share_storage(self, request, sweep):
+        """Тест: Кейсы в пользовательских контекстах одного браузера не видят данные друг друга"""
+        if not request.config.getoption("--user-contexts"):
+            pytest.skip("cases share storage only across reused sessions without --user-contexts")
+        
+        async def check(page, marker):
+            await page.open_page(balance=30000, reserved=20000)
+            seen = await page.driver.execute_script(
+                "const seen = localStorage.getItem('sweep-marker');"
+                "localStorage.setItem('sweep-marker', arguments[0]);"
+                "return seen;",
+                str(marker),
+            )
+            assert seen is None, f"storage of case {seen} leaked into case {marker}"
+        
+        failures = sweep(list(range(8)), check)
+        
+        report = "\n".join(f"{marker}: {error}" for marker, error in failures)
+        assert not failures, report
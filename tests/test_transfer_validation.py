@@ -1,13 +1,11 @@
 import pytest
-from page_objects.transfer_page import TransferPage
 
 class TestTransferValidation:
     """Тесты валидации переводов"""
     
     @pytest.mark.smoke
-    def test_card_data_absent(self, driver):
+    def test_card_data_absent(self, page):
         """Тест: Рублевый перевод. Данные карты отсутствуют"""
-        page = TransferPage(driver)
         page.open_page(balance=30000, reserved=20000)
         page.click_rubles_block()
         
@@ -18,9 +16,8 @@ class TestTransferValidation:
         assert not page.is_transfer_amount_field_visible()
     
     @pytest.mark.smoke
-    def test_card_data_correct(self, driver):
+    def test_card_data_correct(self, page):
         """Тест: Рублевый перевод. Данные карты корректны"""
-        page = TransferPage(driver)
         page.open_page(balance=30000, reserved=20000)
         page.click_rubles_block()
         page.enter_card_number("1212 2323 5666 5555")
@@ -42,6 +39,16 @@ class TestTransferValidation:
         # Проверяем, что появился диалог подтверждения
         assert page.check_and_accept_alert()
     
+    @pytest.mark.regression
+    @pytest.mark.keystrokes
+    def test_card_number_masking(self, page):
+        """Тест: Номер карты разбивается на группы по 4 цифры по мере ввода"""
+        page.open_page(balance=30000, reserved=20000)
+        page.click_rubles_block()
+        page.enter_card_number("1212232356665555")
+        
+        assert page.get_card_number_field_value() == "1212 2323 5666 5555"
+    
     @pytest.mark.regression
     @pytest.mark.parametrize("card_number", [
         "123",  # < 16 цифр
@@ -50,24 +57,19 @@ class TestTransferValidation:
         "abcd efgh ijkl mnop",  # буквы
         "!@#$ %^&* ()_+ ={}|",  # спецсимволы
     ])
-    def test_card_data_incorrect(self, driver, card_number):
+    def test_card_data_incorrect(self, page, card_number):
         """Тест: Рублевый перевод. Данные карты не корректны"""
-        page = TransferPage(driver)
         page.open_page(balance=30000, reserved=20000)
         page.click_rubles_block()
         page.enter_card_number(card_number)
         
-        # Проверяем, что блок суммы перевода НЕ отображается
-        assert not page.is_transfer_amount_field_visible()
+        # Проверяем, что блок суммы перевода НЕ отображается и не появляется позже
+        page.assert_stays_absent(page.TRANSFER_AMOUNT_FIELD)
     
     @pytest.mark.critical
-    def test_sufficient_funds(self, driver):
+    def test_sufficient_funds(self, page):
         """Тест: Рублевый перевод. Достаточно средств на счету"""
-        page = TransferPage(driver)
-        page.open_page(balance=30000, reserved=20000)
-        page.click_rubles_block()
-        page.enter_card_number("1212 2323 5666 5555")
-        page.enter_transfer_amount(1000)
+        page.open_prefilled(balance=30000, reserved=20000, card="1212 2323 5666 5555", amount=1000)
         
         # Проверяем, что кнопка перевода доступна
         assert page.is_transfer_button_enabled()
@@ -78,13 +80,9 @@ class TestTransferValidation:
         assert page.is_confirm_dialog_visible()
     
     @pytest.mark.critical
-    def test_insufficient_funds(self, driver):
+    def test_insufficient_funds(self, page):
         """Тест: Рублевый перевод. НЕ достаточно средств на счету"""
-        page = TransferPage(driver)
-        page.open_page(balance=30000, reserved=20000)
-        page.click_rubles_block()
-        page.enter_card_number("1212 2323 5666 5555")
-        page.enter_transfer_amount(1000000)  # Большая сумма
+        page.open_prefilled(balance=30000, reserved=20000, card="1212 2323 5666 5555", amount=1000000)  # Большая сумма
         
         # Проверяем, что кнопка перевода НЕ доступна
         assert not page.is_transfer_button_enabled()
@@ -93,25 +91,17 @@ class TestTransferValidation:
         assert page.is_insufficient_funds_message_visible()
     
     @pytest.mark.regression
-    def test_negative_transfer_amount(self, driver):
+    def test_negative_transfer_amount(self, page):
         """Тест: Рублевый перевод. Отрицательная сумма перевода"""
-        page = TransferPage(driver)
-        page.open_page(balance=30000, reserved=20000)
-        page.click_rubles_block()
-        page.enter_card_number("1212 2323 5666 5555")
-        page.enter_transfer_amount(-1000)
+        page.open_prefilled(balance=30000, reserved=20000, card="1212 2323 5666 5555", amount=-1000)
         
         # Проверяем, что кнопка перевода НЕ доступна
         assert not page.is_transfer_button_enabled()
     
     @pytest.mark.regression
-    def test_zero_transfer_amount(self, driver):
+    def test_zero_transfer_amount(self, page):
         """Тест: Рублевый перевод. Нулевая сумма перевода"""
-        page = TransferPage(driver)
-        page.open_page(balance=30000, reserved=20000)
-        page.click_rubles_block()
-        page.enter_card_number("1212 2323 5666 5555")
-        page.enter_transfer_amount(0)
+        page.open_prefilled(balance=30000, reserved=20000, card="1212 2323 5666 5555", amount=0)
         
         # Проверяем, что кнопка перевода НЕ доступна
         assert not page.is_transfer_button_enabled()
@@ -123,13 +113,9 @@ class TestTransferValidation:
         (4500, 450),
         (10000, 1000),
     ])
-    def test_commission_calculation(self, driver, amount, expected_commission):
+    def test_commission_calculation(self, page, amount, expected_commission):
         """Тест: Рублевый перевод. Расчет комиссии"""
-        page = TransferPage(driver)
-        page.open_page(balance=30000, reserved=20000)
-        page.click_rubles_block()
-        page.enter_card_number("1212 2323 5666 5555")
-        page.enter_transfer_amount(amount)
+        page.open_prefilled(balance=30000, reserved=20000, card="1212 2323 5666 5555", amount=amount)
         
         # Проверяем, что комиссия равна 10% от введенной суммы
         commission_text = page.get_commission_text()
@@ -142,12 +128,9 @@ class TestTransferValidation:
         "12.34.56",  # некорректный формат
         "",  # пустое значение
     ])
-    def test_transfer_amount_validation(self, driver, invalid_amount):
+    def test_transfer_amount_validation(self, page, invalid_amount):
         """Тест: Валидация поля 'Сумма перевода'"""
-        page = TransferPage(driver)
-        page.open_page(balance=30000, reserved=20000)
-        page.click_rubles_block()
-        page.enter_card_number("1212 2323 5666 5555")
+        page.open_prefilled(balance=30000, reserved=20000, card="1212 2323 5666 5555")
         page.enter_transfer_amount(invalid_amount)
         
         # Проверяем, что кнопка перевода не активна при некорректных данных